@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from .models import BracketMatch, BracketRound
+
+Stage = BracketRound.Stage
+
+
+@dataclass
+class Slot:
+    team_id: int = None
+    seed: int = None
+    dead: bool = False  # can never be filled, e.g. a missing seed or a bye's loser
+
+
+@dataclass(eq=False)
+class MatchNode:
+    stage: str
+    round_number: int
+    position: int
+    home: Slot = field(default_factory=Slot)
+    away: Slot = field(default_factory=Slot)
+    # (MatchNode, "home" | "away") the winner and loser move on to
+    winner_to: tuple = None
+    loser_to: tuple = None
+    is_bye: bool = False
+
+
+def seed_order(size):
+    """Standard placement for a power-of-two field: 1v8, 4v5, 2v7, 3v6, ..."""
+    order = [1]
+    while len(order) < size:
+        length = len(order) * 2
+        order = [seed for top in order for seed in (top, length + 1 - top)]
+    return order
+
+
+class BracketEngine:
+    """Build a full elimination bracket in memory and save it in bulk.
+
+    The field is padded to a power of two; seeds past the number of teams
+    are byes, so top seeds skip the first round. Double elimination adds a
+    losers bracket fed by every winners-bracket round and a grand final
+    between the two bracket champions.
+    """
+
+    def __init__(self, bracket, team_ids):
+        if len(team_ids) < 2:
+            raise ValidationError("A bracket needs at least two teams.")
+        self.bracket = bracket
+        self.team_ids = list(team_ids)  # best seed first
+        self.size = 1 << (len(self.team_ids) - 1).bit_length()
+        self.rounds = []  # [(stage, round_number, [MatchNode, ...])]
+
+    @classmethod
+    def for_bracket(cls, bracket):
+        """Seed the season's teams by their current standings"""
+        standings = bracket.season.standings()
+        return cls(bracket, [row["team_id"] for row in standings])
+
+    def _add_round(self, stage, round_number, count):
+        matches = [MatchNode(stage, round_number, position) for position in range(count)]
+        self.rounds.append((stage, round_number, matches))
+        return matches
+
+    def build(self):
+        winners = self._build_winners()
+        if self.bracket.elimination_type == "double":
+            self._build_double(winners)
+        self._resolve_byes()
+        return self
+
+    def _build_winners(self):
+        order = seed_order(self.size)
+        first = self._add_round(Stage.WINNERS, 1, self.size // 2)
+        for node in first:
+            for slot, seed in ((node.home, order[2 * node.position]), (node.away, order[2 * node.position + 1])):
+                slot.seed = seed
+                if seed <= len(self.team_ids):
+                    slot.team_id = self.team_ids[seed - 1]
+                else:
+                    slot.dead = True
+
+        rounds = [first]
+        while len(rounds[-1]) > 1:
+            previous = rounds[-1]
+            current = self._add_round(Stage.WINNERS, len(rounds) + 1, len(previous) // 2)
+            for node in previous:
+                node.winner_to = (current[node.position // 2], ("home", "away")[node.position % 2])
+            rounds.append(current)
+        return rounds
+
+    def _build_double(self, winners):
+        """Losers bracket and grand final fed by the winners-bracket rounds.
+
+        Losers round 1 pairs the first-round losers; every later winners
+        round drops its losers into an even losers round against the
+        survivors, and odd rounds halve the field. Drop order alternates so
+        teams do not meet again straight away.
+        """
+        losers = []
+        if len(winners) > 1:
+            current = self._add_round(Stage.LOSERS, 1, len(winners[0]) // 2)
+            for node in winners[0]:
+                node.loser_to = (current[node.position // 2], ("home", "away")[node.position % 2])
+            losers.append(current)
+
+            for drop_round, dropping in enumerate(winners[1:], start=1):
+                survivors = losers[-1]
+                if len(survivors) > len(dropping):
+                    # Halve the losers field before the next drop
+                    halved = self._add_round(Stage.LOSERS, len(losers) + 1, len(survivors) // 2)
+                    for node in survivors:
+                        node.winner_to = (halved[node.position // 2], ("home", "away")[node.position % 2])
+                    losers.append(halved)
+                    survivors = halved
+
+                current = self._add_round(Stage.LOSERS, len(losers) + 1, len(dropping))
+                for node in survivors:
+                    node.winner_to = (current[node.position], "home")
+                drops = dropping if drop_round % 2 else list(reversed(dropping))
+                for position, node in enumerate(drops):
+                    node.loser_to = (current[position], "away")
+                losers.append(current)
+
+        final = self._add_round(Stage.GRAND_FINAL, 1, 1)[0]
+        winners[-1][0].winner_to = (final, "home")
+        if losers:
+            losers[-1][0].winner_to = (final, "away")
+        else:
+            winners[-1][0].loser_to = (final, "away")
+
+    def _resolve_byes(self):
+        """Mark byes and push teams that advance unplayed into later rounds.
+
+        Rounds are built so that every match comes after the matches that
+        feed it, which lets a single ordered pass settle every bye.
+        """
+        for _stage, _round_number, matches in self.rounds:
+            for node in matches:
+                home, away = node.home, node.away
+                if not (home.dead or away.dead):
+                    continue
+                node.is_bye = True
+                advancing = away if home.dead else home
+                if node.winner_to:
+                    target, side = node.winner_to
+                    slot = getattr(target, side)
+                    slot.team_id, slot.seed, slot.dead = advancing.team_id, advancing.seed, advancing.dead
+                if node.loser_to:
+                    target, side = node.loser_to
+                    getattr(target, side).dead = True
+
+    @transaction.atomic
+    def save(self):
+        """Replace the bracket's rounds and matches with the built tree"""
+        bracket = self.bracket
+        bracket.rounds.all().delete()  # cascades to the old matches
+
+        rounds = BracketRound.objects.bulk_create(
+            BracketRound(bracket=bracket, stage=stage, round_number=round_number)
+            for stage, round_number, _matches in self.rounds
+        )
+        saved = {}
+        for round_, (_stage, _number, nodes) in zip(rounds, self.rounds):
+            for node in nodes:
+                saved[node] = BracketMatch(
+                    bracket=bracket,
+                    round=round_,
+                    position=node.position,
+                    home_team_id=node.home.team_id,
+                    away_team_id=node.away.team_id,
+                    home_seed=node.home.seed,
+                    away_seed=node.away.seed,
+                    is_bye=node.is_bye,
+                )
+        matches = BracketMatch.objects.bulk_create(saved.values(), batch_size=500)
+
+        # Link the saved matches now that they have primary keys
+        for node, match in saved.items():
+            if node.winner_to:
+                target, match.next_slot = node.winner_to
+                match.next_match = saved[target]
+            if node.loser_to:
+                target, match.loser_next_slot = node.loser_to
+                match.loser_next_match = saved[target]
+        BracketMatch.objects.bulk_update(
+            [match for node, match in saved.items() if node.winner_to or node.loser_to],
+            ["next_match", "next_slot", "loser_next_match", "loser_next_slot"],
+            batch_size=500,
+        )
+        bracket.save(update_fields=["updated_at"])
+        return matches
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brackets', '0004_alter_bracket_season'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='bracketmatch',
+            options={'ordering': ['position']},
+        ),
+        migrations.AlterModelOptions(
+            name='bracketround',
+            options={'ordering': ['id']},
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='away_seed',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='home_seed',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='is_bye',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bracketround',
+            name='stage',
+            field=models.CharField(choices=[('winners', 'Winners Bracket'), ('losers', 'Losers Bracket'), ('grand_final', 'Grand Final')], default='winners', max_length=20),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brackets', '0005_bracket_stage_and_seeding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='loser_next_match',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='loser_feeders', to='brackets.bracketmatch'),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='loser_next_slot',
+            field=models.CharField(blank=True, choices=[('home', 'Home'), ('away', 'Away')], max_length=4),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='next_match',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='feeders', to='brackets.bracketmatch'),
+        ),
+        migrations.AddField(
+            model_name='bracketmatch',
+            name='next_slot',
+            field=models.CharField(blank=True, choices=[('home', 'Home'), ('away', 'Away')], max_length=4),
+        ),
+    ]
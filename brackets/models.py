@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class Bracket(models.Model):
     ELIMINATION_TYPES = [
@@ -14,19 +15,112 @@ class Bracket(models.Model):
         return f"{self.sport} - {self.season} ({self.elimination_type})"
     
 class BracketRound(models.Model):
+    class Stage(models.TextChoices):
+        WINNERS = "winners", "Winners Bracket"
+        LOSERS = "losers", "Losers Bracket"
+        GRAND_FINAL = "grand_final", "Grand Final"
+
     bracket = models.ForeignKey(Bracket, on_delete=models.CASCADE, related_name='rounds')
+    stage = models.CharField(max_length=20, choices=Stage.choices, default=Stage.WINNERS)
     round_number = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        ordering = ['id']
+
     def __str__(self):
         return f"Round {self.round_number} of {self.bracket}"
     
+class BracketMatchManager(models.Manager):
+    def _move(self, team_id, match_id, side, through_bye):
+        """Put a team in a match's slot, passing straight through byes"""
+        moved = False
+        while match_id is not None:
+            moved |= bool(
+                self.filter(pk=match_id)
+                .exclude(**{f"{side}_team_id": team_id})
+                .update(**{f"{side}_team_id": team_id})
+            )
+            if not through_bye:
+                break
+            match_id, side, through_bye = self.filter(pk=match_id).values_list(
+                "next_match_id", "next_slot", "next_match__is_bye"
+            ).get()
+        return moved
+
+    def advance(self, game_id, result):
+        """Move a completed game's winner and loser into the matches they feed.
+
+        ``result`` is the game's Game.result_state() tuple. Each move is a
+        single UPDATE of the target slot and is a no-op when the slot already
+        holds the team, so replaying a result is cheap and a corrected score
+        moves the new winner instead.
+        """
+        from games.models import Game
+
+        status, _season_id, home_id, away_id, home_score, away_score = result
+        if status != Game.Status.COMPLETED:
+            return False
+        if home_score == away_score:
+            return False  # elimination games need a winner
+        match = (
+            self.filter(game_id=game_id)
+            .values(
+                "bracket_id",
+                "next_match_id",
+                "next_slot",
+                "next_match__is_bye",
+                "loser_next_match_id",
+                "loser_next_slot",
+                "loser_next_match__is_bye",
+            )
+            .first()
+        )
+        if match is None:
+            return False
+
+        winner, loser = home_id, away_id
+        if away_score > home_score:
+            winner, loser = loser, winner
+        moved = self._move(
+            winner, match["next_match_id"], match["next_slot"], match["next_match__is_bye"]
+        )
+        moved |= self._move(
+            loser,
+            match["loser_next_match_id"],
+            match["loser_next_slot"],
+            match["loser_next_match__is_bye"],
+        )
+        if moved:
+            Bracket.objects.filter(pk=match["bracket_id"]).update(updated_at=timezone.now())
+        return moved
+
+
 class BracketMatch(models.Model):
+    class Side(models.TextChoices):
+        HOME = "home", "Home"
+        AWAY = "away", "Away"
+
     bracket = models.ForeignKey(Bracket, on_delete=models.CASCADE)
     round = models.ForeignKey(BracketRound, on_delete=models.CASCADE, related_name='matches')
     home_team = models.ForeignKey('teams.Team', related_name='home_matches', null=True, blank=True, on_delete=models.SET_NULL)
     away_team = models.ForeignKey('teams.Team', related_name='away_matches', null=True, blank=True, on_delete=models.SET_NULL)
     game = models.OneToOneField('games.Game', null=True, blank=True, on_delete=models.SET_NULL)
+    position = models.PositiveIntegerField(default=0)  # top-to-bottom within the round
+    home_seed = models.PositiveIntegerField(null=True, blank=True)
+    away_seed = models.PositiveIntegerField(null=True, blank=True)
+    # A slot can never be filled, so the other team goes through unplayed
+    is_bye = models.BooleanField(default=False)
+    # Where the winner, and in double elimination the loser, plays next
+    next_match = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='feeders')
+    next_slot = models.CharField(max_length=4, choices=Side.choices, blank=True)
+    loser_next_match = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='loser_feeders')
+    loser_next_slot = models.CharField(max_length=4, choices=Side.choices, blank=True)
+
+    objects = BracketMatchManager()
+
+    class Meta:
+        ordering = ['position']
 
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} (Round {self.round.round_number})"    
@@ -10,14 +10,18 @@ class BracketMatchSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BracketMatch
-        fields = ['id', 'bracket', 'round', 'home_team', 'away_team', 'game']
+        fields = [
+            'id', 'bracket', 'round', 'position', 'home_team', 'away_team',
+            'home_seed', 'away_seed', 'is_bye', 'next_match', 'next_slot',
+            'loser_next_match', 'loser_next_slot', 'game',
+        ]
 
 class BracketRoundSerializer(serializers.ModelSerializer):
     matches = BracketMatchSerializer(many=True, read_only=True)
 
     class Meta:
         model = BracketRound
-        fields = ['id', 'bracket', 'round_number', 'created_at', 'matches']
+        fields = ['id', 'bracket', 'stage', 'round_number', 'created_at', 'matches']
 
 class BracketSerializer(serializers.ModelSerializer):
     rounds = BracketRoundSerializer(many=True, read_only=True)
@@ -1,3 +1,277 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from brackets.engine import BracketEngine, seed_order
+from brackets.models import Bracket, BracketMatch, BracketRound
+from brackets.tree import BracketTree
+from games.models import Game, PlayerStat
+from games.tests import create_game, create_season
+from teams.models import Team
+
+Stage = BracketRound.Stage
+
+
+def build(team_count, elimination_type="single"):
+    bracket = Bracket(elimination_type=elimination_type)
+    return BracketEngine(bracket, list(range(1, team_count + 1))).build()
+
+
+def matches(engine, stage=None):
+    return [
+        node
+        for round_stage, _number, nodes in engine.rounds
+        if stage is None or round_stage == stage
+        for node in nodes
+    ]
+
+
+class BracketEngineTests(SimpleTestCase):
+    def test_seed_order(self):
+        self.assertEqual(seed_order(2), [1, 2])
+        self.assertEqual(seed_order(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_needs_two_teams(self):
+        with self.assertRaises(ValidationError):
+            build(1)
+
+    def test_first_round_pairs_seeds(self):
+        first = build(8).rounds[0][2]
+        pairs = [(node.home.team_id, node.away.team_id) for node in first]
+        self.assertEqual(pairs, [(1, 8), (4, 5), (2, 7), (3, 6)])
+
+    def test_top_seeds_get_byes(self):
+        engine = build(6)
+        first, second = engine.rounds[0][2], engine.rounds[1][2]
+        self.assertEqual([node.is_bye for node in first], [True, False, True, False])
+        self.assertEqual((second[0].home.team_id, second[0].home.seed), (1, 1))
+        self.assertEqual((second[1].home.team_id, second[1].home.seed), (2, 2))
+        self.assertIsNone(second[0].away.team_id)
+
+    def test_single_elimination_match_count(self):
+        for teams in (2, 5, 8, 16):
+            engine = build(teams)
+            self.assertEqual(len(matches(engine)), engine.size - 1)
+
+    def test_double_elimination_structure(self):
+        for teams in (4, 6, 8, 16):
+            engine = build(teams, "double")
+            size = engine.size
+            self.assertEqual(len(matches(engine, Stage.WINNERS)), size - 1)
+            self.assertEqual(len(matches(engine, Stage.LOSERS)), size - 2)
+            final = matches(engine, Stage.GRAND_FINAL)
+            self.assertEqual(len(final), 1)
+            self.assertTrue(all(node.winner_to or node in final for node in matches(engine)))
+            self.assertTrue(all(node.loser_to for node in matches(engine, Stage.WINNERS)))
+
+    def test_bye_losers_never_fill_a_slot(self):
+        engine = build(6, "double")
+        for node in engine.rounds[0][2]:
+            if node.is_bye:
+                target, side = node.loser_to
+                self.assertTrue(getattr(target, side).dead)
+
+
+class BracketSaveTests(TestCase):
+    def setUp(self):
+        self.data = create_season(teams=4, players=0)
+        self.teams = self.data["teams"]
+        self.bracket = Bracket.objects.create(
+            season=self.data["season"], elimination_type="double"
+        )
+
+    def test_saved_bracket_links_matches(self):
+        BracketEngine(self.bracket, [team.pk for team in self.teams]).build().save()
+        match = BracketMatch.objects.get(
+            round__stage=Stage.WINNERS, round__round_number=1, position=0
+        )
+        self.assertEqual(BracketMatch.objects.filter(bracket=self.bracket).count(), 6)
+        self.assertEqual((match.home_seed, match.away_seed), (1, 4))
+        self.assertEqual(match.home_team, self.teams[0])
+        self.assertIsNotNone(match.next_match_id)
+        self.assertIsNotNone(match.loser_next_match_id)
+
+    def test_save_queries_do_not_grow_with_the_bracket(self):
+        teams = [team.pk for team in self.teams]
+        teams += [
+            Team.objects.create(name=f"Extra {n}", sport=self.data["sport"]).pk for n in range(4)
+        ]
+
+        def queries(team_ids):
+            bracket = Bracket.objects.create(
+                season=self.data["season"], elimination_type="double"
+            )
+            engine = BracketEngine(bracket, team_ids).build()
+            with CaptureQueriesContext(connection) as captured:
+                engine.save()
+            return len(captured)
+
+        self.assertEqual(queries(teams[:3]), queries(teams))
+
+
+class BracketAdvanceTests(TestCase):
+    def setUp(self):
+        self.data = create_season(teams=4, players=1)
+        self.teams = self.data["teams"]
+        self.bracket = Bracket.objects.create(
+            season=self.data["season"], elimination_type="double"
+        )
+        BracketEngine(self.bracket, [team.pk for team in self.teams]).build().save()
+        self.match = BracketMatch.objects.get(
+            round__stage=Stage.WINNERS, round__round_number=1, position=0
+        )
+
+    def play(self, home_score, away_score):
+        game = create_game(
+            self.data, home_team=self.match.home_team, away_team=self.match.away_team
+        )
+        self.match.game = game
+        self.match.save()
+        game.home_team_score, game.away_team_score = home_score, away_score
+        game.status = Game.Status.COMPLETED
+        game.save()
+        return game
+
+    def slot(self, match_id, side):
+        return getattr(BracketMatch.objects.get(pk=match_id), f"{side}_team")
+
+    def test_completed_game_advances_winner_and_loser(self):
+        self.play(1, 3)
+        match = self.match
+        self.assertEqual(self.slot(match.next_match_id, match.next_slot), self.teams[3])
+        self.assertEqual(
+            self.slot(match.loser_next_match_id, match.loser_next_slot), self.teams[0]
+        )
+
+    def test_score_correction_moves_the_new_winner(self):
+        game = self.play(1, 3)
+        game.home_team_score = 5
+        game.save()
+        match = self.match
+        self.assertEqual(self.slot(match.next_match_id, match.next_slot), self.teams[0])
+        self.assertEqual(
+            self.slot(match.loser_next_match_id, match.loser_next_slot), self.teams[3]
+        )
+
+    def test_tied_game_does_not_advance(self):
+        self.play(2, 2)
+        self.assertIsNone(self.slot(self.match.next_match_id, self.match.next_slot))
+
+    def test_stat_correction_moves_the_new_winner(self):
+        game = create_game(
+            self.data, home_team=self.match.home_team, away_team=self.match.away_team
+        )
+        self.match.game = game
+        self.match.save()
+        scorer = self.match.home_team.players.get()
+        stat = PlayerStat.objects.create(
+            game=game, player=scorer, stat_type=self.data["made2"], period=1
+        )
+        game.complete_game()
+        match = self.match
+        self.assertEqual(self.slot(match.next_match_id, match.next_slot), self.teams[0])
+
+        # The score is recomputed through Game.update_scores, not a save
+        with self.captureOnCommitCallbacks(execute=True):
+            stat.player = self.match.away_team.players.get()
+            stat.save()
+        self.assertEqual(self.slot(match.next_match_id, match.next_slot), self.teams[3])
+        self.assertEqual(
+            self.slot(match.loser_next_match_id, match.loser_next_slot), self.teams[0]
+        )
+
+
+class BracketConditionalGetTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        bracket = Bracket.objects.create(season=self.data["season"])
+        BracketMatch.objects.create(
+            bracket=bracket,
+            round=BracketRound.objects.create(bracket=bracket, round_number=1),
+            home_team=self.home,
+            away_team=self.away,
+            game=create_game(self.data, status=Game.Status.SCHEDULED),
+        )
+        self.url = f"/api/brackets/{bracket.pk}/"
+
+    def assertRevalidates(self, change):
+        tag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=tag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=tag).status_code, 200)
+
+    def test_bracket_follows_team_edits(self):
+        def rename():
+            self.away.name = "Renamed"
+            self.away.save()
+
+        self.assertRevalidates(rename)
+
+    def test_bracket_follows_records_won_elsewhere(self):
+        # The nested teams carry their overall records
+        self.assertRevalidates(
+            lambda: create_game(
+                self.data, status=Game.Status.COMPLETED, home_team_score=3, away_team_score=1
+            )
+        )
+
+
+class BracketTreeTests(TestCase):
+    def setUp(self):
+        BracketTree().cache.clear()
+        self.data = create_season(teams=4, players=0)
+        self.teams = self.data["teams"]
+        self.bracket = Bracket.objects.create(season=self.data["season"])
+        BracketEngine(self.bracket, [team.pk for team in self.teams]).build().save()
+        self.brackets = Bracket.objects.filter(season=self.data["season"])
+
+    def tree(self):
+        [tree] = BracketTree().for_brackets(self.brackets)
+        return tree
+
+    def first_match(self, tree):
+        return tree["rounds"][0]["matches"][0]
+
+    def test_tree_holds_rounds_matches_and_teams(self):
+        with self.assertNumQueries(4):
+            tree = self.tree()
+        self.assertEqual([len(round_["matches"]) for round_ in tree["rounds"]], [2, 1])
+        home = self.first_match(tree)["home"]
+        self.assertEqual(
+            (home["id"], home["name"], home["seed"]), (self.teams[0].pk, "Team 0", 1)
+        )
+
+    def test_trees_are_cached_under_the_version(self):
+        with mock.patch.object(BracketTree, "build", wraps=BracketTree.build) as build:
+            self.tree()
+            self.tree()
+            self.assertEqual(build.call_count, 1)
+
+    def test_team_edits_move_the_version(self):
+        self.tree()
+        team = self.teams[0]
+        team.name = "Renamed"
+        team.save()
+        self.assertEqual(self.first_match(self.tree())["home"]["name"], "Renamed")
+
+    def test_scores_move_the_version(self):
+        self.tree()
+        match = BracketMatch.objects.get(pk=self.first_match(self.tree())["id"])
+        match.game = create_game(
+            self.data, home_team=match.home_team, away_team=match.away_team, home_team_score=7
+        )
+        match.save()
+        self.assertEqual(self.first_match(self.tree())["home"]["score"], 7)
+
+    def test_season_endpoint_revalidates_on_team_edits(self):
+        url = f"/api/brackets/for_season/{self.data['season'].pk}/"
+        tag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=tag).status_code, 304)
+        team = self.teams[3]
+        team.name = "Renamed"
+        team.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=tag).status_code, 200)
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max, Sum
+from teams.models import Team
+from .models import Bracket, BracketMatch, BracketRound
+
+MATCH_FIELDS = (
+    "id",
+    "round_id",
+    "position",
+    "is_bye",
+    "next_match_id",
+    "next_slot",
+    "loser_next_match_id",
+    "loser_next_slot",
+    "home_seed",
+    "home_team_id",
+    "home_team__name",
+    "home_team__logo",
+    "away_seed",
+    "away_team_id",
+    "away_team__name",
+    "away_team__logo",
+    "game_id",
+    "game__status",
+    "game__home_team_score",
+    "game__away_team_score",
+)
+
+
+def _timestamp(value):
+    return value.timestamp() if value else 0
+
+
+class BracketTree:
+    """Compact bracket trees for public tournament pages.
+
+    A tree holds rounds and matches with only each team's id, name, logo,
+    seed and score, loaded in three queries however large the bracket.
+    Trees are cached under the bracket's version, which moves with the
+    bracket's updated_at, the embedded games and the slotted teams, so
+    live scores and team names or logos are never served stale.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "BRACKETS_CACHE", "default")]
+        self.timeout = getattr(settings, "BRACKETS_CACHE_TIMEOUT", 86400)
+
+    @staticmethod
+    def versions(brackets):
+        """{bracket_id: version} for a Bracket queryset, in one query"""
+        rows = (
+            brackets.order_by()
+            .values("pk", "updated_at")
+            .annotate(
+                games=Count("bracketmatch__game"),
+                game_events=Sum("bracketmatch__game__event_version"),
+                game_updated_at=Max("bracketmatch__game__updated_at"),
+                home_updated_at=Max("bracketmatch__home_team__updated_at"),
+                away_updated_at=Max("bracketmatch__away_team__updated_at"),
+            )
+        )
+        return {
+            row["pk"]: (
+                f"{_timestamp(row['updated_at'])}:{row['games']}:"
+                f"{row['game_events'] or 0}:{_timestamp(row['game_updated_at'])}:"
+                f"{_timestamp(row['home_updated_at'])}:{_timestamp(row['away_updated_at'])}"
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    def key(bracket_id, version):
+        return f"brackets:tree:{bracket_id}:{version}"
+
+    def for_brackets(self, brackets):
+        """Trees for a Bracket queryset, ordered by bracket id"""
+        versions = self.versions(brackets)
+        keys = {pk: self.key(pk, version) for pk, version in versions.items()}
+        cached = self.cache.get_many(keys.values()) if keys else {}
+        trees = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = [pk for pk in versions if pk not in trees]
+        if missing:
+            built = self.build(missing)
+            self.cache.set_many(
+                {keys[pk]: tree for pk, tree in built.items()}, self.timeout
+            )
+            trees.update(built)
+        return [trees[pk] for pk in sorted(trees)]
+
+    @staticmethod
+    def _side(match, side):
+        team_id = match[f"{side}_team_id"]
+        if team_id is None:
+            return None
+        logo = match[f"{side}_team__logo"]
+        return {
+            "id": team_id,
+            "name": match[f"{side}_team__name"],
+            "logo": Team._meta.get_field("logo").storage.url(logo) if logo else None,
+            "seed": match[f"{side}_seed"],
+            "score": match[f"game__{side}_team_score"],
+        }
+
+    @classmethod
+    def build(cls, bracket_ids):
+        """{bracket_id: tree} straight from the database"""
+        trees = {
+            bracket["id"]: {
+                "id": bracket["id"],
+                "season": bracket["season_id"],
+                "elimination_type": bracket["elimination_type"],
+                "updated_at": bracket["updated_at"],
+                "rounds": [],
+            }
+            for bracket in Bracket.objects.filter(pk__in=bracket_ids).values(
+                "id", "season_id", "elimination_type", "updated_at"
+            )
+        }
+        rounds = {}
+        for round_ in BracketRound.objects.filter(bracket_id__in=bracket_ids).values(
+            "id", "bracket_id", "stage", "round_number"
+        ):
+            rounds[round_["id"]] = node = {
+                "id": round_["id"],
+                "stage": round_["stage"],
+                "round_number": round_["round_number"],
+                "matches": [],
+            }
+            trees[round_["bracket_id"]]["rounds"].append(node)
+
+        matches = BracketMatch.objects.filter(bracket_id__in=bracket_ids).values(*MATCH_FIELDS)
+        for match in matches.order_by("position"):
+            rounds[match["round_id"]]["matches"].append({
+                "id": match["id"],
+                "position": match["position"],
+                "is_bye": match["is_bye"],
+                "home": cls._side(match, "home"),
+                "away": cls._side(match, "away"),
+                "game": match["game_id"] and {
+                    "id": match["game_id"],
+                    "status": match["game__status"],
+                },
+                "next_match": match["next_match_id"],
+                "next_slot": match["next_slot"],
+                "loser_next_match": match["loser_next_match_id"],
+                "loser_next_slot": match["loser_next_slot"],
+            })
+        return trees
@@ -1,15 +1,55 @@
+import hashlib
+from django.db.models import FilteredRelation, Q
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import status
-from .models import Bracket, BracketRound, BracketMatch
+from .models import Bracket
+from .engine import BracketEngine
+from .tree import BracketTree
 from .serializers import BracketSerializer
 from teams.models import Team
+from sports_management.conditional import etag
 
 class BracketViewSet(viewsets.ModelViewSet):
     queryset = Bracket.objects.all()
     serializer_class = BracketSerializer
 
+    def _bracket_etag(self, request, pk=None):
+        """Covers the tree and the games' nested teams with their overall records"""
+        versions = BracketTree.versions(Bracket.objects.filter(pk=pk))
+        version = next(iter(versions.values()), None)
+        if not version:
+            return None
+        teams = (
+            Team.objects.filter(
+                Q(home_games__bracketmatch__bracket_id=pk)
+                | Q(away_games__bracketmatch__bracket_id=pk)
+            )
+            .annotate(
+                overall=FilteredRelation("records", condition=Q(records__season__isnull=True))
+            )
+            .order_by("pk")
+            .distinct()
+            .values_list("pk", "updated_at", "overall__wins", "overall__losses")
+        )
+        state = ";".join(
+            f"{team_id}-{updated_at.timestamp()}-{wins or 0}-{losses or 0}"
+            for team_id, updated_at, wins, losses in teams
+        )
+        digest = hashlib.md5(state.encode(), usedforsecurity=False).hexdigest()
+        return f"bracket:{pk}:{version}:{digest}"
+
+    def _season_brackets_etag(self, request, season_id=None):
+        versions = BracketTree.versions(Bracket.objects.filter(season_id=season_id))
+        return f"brackets:{season_id}:" + ";".join(
+            f"{pk}-{version}" for pk, version in sorted(versions.items())
+        )
+
+    @etag(_bracket_etag)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=['post'])
     def generate(self, request, pk=None):
         """Generate a bracket for a league."""
@@ -33,63 +73,11 @@ class BracketViewSet(viewsets.ModelViewSet):
         return Response({"message": "Bracket generated successfully."}, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['get'], url_path=r'for_season/(?P<season_id>\d+)')
+    @etag(_season_brackets_etag)
     def for_season(self, request, season_id=None):
-        """Get brackets for a specific season with rounds and matches"""
-        brackets = Bracket.objects.filter(season_id=season_id).prefetch_related(
-            'rounds__matches'  # Prefetch rounds and their matches
-        )
-        serializer = self.get_serializer(brackets, many=True)
-        return Response(serializer.data)
+        """Compact bracket trees for a season, with rounds, matches and scores"""
+        return Response(BracketTree().for_brackets(Bracket.objects.filter(season_id=season_id)))
 
     def _generate_bracket(self, bracket):
-        """Logic to generate the bracket based on the elimination type."""
-        if bracket.elimination_type == 'single':
-            self._generate_single_elimination(bracket)
-        elif bracket.elimination_type == 'double':
-            self._generate_double_elimination(bracket)
-        else:
-            return Response({"error": "Unsupported elimination type."}, status=status.HTTP_400_BAD_REQUEST)
-
-    def _generate_single_elimination(self, bracket):
-        teams = list(bracket.season.league.teams.all())
-        if not teams:
-            return Response({"error": "No teams found for the league."}, status=status.HTTP_400_BAD_REQUEST)
-
-        round_number = 1
-        while len(teams) > 1:
-            round_ = BracketRound.objects.create(bracket=bracket, round_number=round_number)
-            match_number = 1
-            for i in range(0, len(teams), 2):
-                home = teams[i]
-                away = teams[i + 1] if i + 1 < len(teams) else None
-                BracketMatch.objects.create(
-                    bracket=bracket,
-                    round=round_,
-                    home_team=home,
-                    away_team=away,
-                )
-                match_number += 1
-            teams = [match.home_team for match in round_.bracketmatch_set.all() if match.home_team]  # advancing teams
-            round_number += 1
-
-    def _generate_double_elimination(self, bracket):
-        teams = list(bracket.season.league.teams.all())
-        if not teams:
-            return Response({"error": "No teams found for the league."}, status=status.HTTP_400_BAD_REQUEST)
-
-        round_number = 1
-        while len(teams) > 1:
-            round_ = BracketRound.objects.create(bracket=bracket, round_number=round_number)
-            match_number = 1
-            for i in range(0, len(teams), 2):
-                home = teams[i]
-                away = teams[i + 1] if i + 1 < len(teams) else None
-                BracketMatch.objects.create(
-                    bracket=bracket,
-                    round=round_,
-                    home_team=home,
-                    away_team=away,
-                )
-                match_number += 1
-            teams = [match.home_team for match in round_.bracketmatch_set.all() if match.home_team]  # advancing teams
-            round_number += 1
+        """Build the full tree for the bracket's elimination type and save it"""
+        BracketEngine.for_bracket(bracket).build().save()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class BaseBroadcaster:
+    """Fan-out of live game events to subscribed clients"""
+
+    def publish(self, game_id, event):
+        raise NotImplementedError
+
+    async def subscribe(self, game_id, heartbeat=15):
+        """Yield events for a game, or None after ``heartbeat`` idle seconds.
+
+        The first item is always None, yielded once the subscription is
+        live, so callers can take a snapshot without missing events.
+        """
+        raise NotImplementedError
+        yield
+
+
+class InProcessBroadcaster(BaseBroadcaster):
+    """Deliver events to subscribers served by this process only.
+
+    Fine for a single ASGI worker; use a shared backend such as
+    RedisBroadcaster when running several.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, game_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(game_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            queue.get_nowait()  # a slow client loses the oldest event
+        queue.put_nowait(event)
+
+    async def subscribe(self, game_id, heartbeat=15):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.max_queue))
+        with self._lock:
+            self._subscribers[game_id].add(subscriber)
+        try:
+            yield None
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers[game_id].discard(subscriber)
+                if not self._subscribers[game_id]:
+                    del self._subscribers[game_id]
+
+
+class RedisBroadcaster(BaseBroadcaster):
+    """Deliver events across workers through Redis pub/sub"""
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="games:live"):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroadcaster requires the redis package")
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _channel(self, game_id):
+        return f"{self.prefix}:{game_id}"
+
+    def publish(self, game_id, event):
+        self._client.publish(self._channel(game_id), json.dumps(event, default=str))
+
+    async def subscribe(self, game_id, heartbeat=15):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._channel(game_id))
+        try:
+            yield None
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=heartbeat
+                )
+                yield json.loads(message["data"]) if message else None
+        finally:
+            await pubsub.unsubscribe()
+            await client.aclose()
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        config = getattr(
+            settings,
+            "GAMES_LIVE_BACKEND",
+            {"BACKEND": "games.live.InProcessBroadcaster"},
+        )
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                backend = import_string(config["BACKEND"])
+                _broadcaster = backend(**config.get("OPTIONS", {}))
+    return _broadcaster
+
+
+def publish_game_event(game_id, event_type, **data):
+    """Log a compact delta and publish it once the surrounding transaction commits.
+
+    The event is appended to the game's GameEvent log first, so the
+    published copy carries its ``seq`` and clients can catch up from it.
+    """
+    from games.models import GameEvent
+
+    event = GameEvent.objects.append(game_id, event_type, data).as_payload()
+    transaction.on_commit(lambda: get_broadcaster().publish(game_id, event))
+
+
+def score_payload(game):
+    return {
+        "home_team_score": game.home_team_score,
+        "away_team_score": game.away_team_score,
+    }
+
+
+def stat_payload(stat):
+    return {
+        "id": stat.pk,
+        "player": stat.player_id,
+        "team": stat.player.team_id,
+        "stat_type": stat.stat_type_id,
+        "abbreviation": stat.stat_type.abbreviation,
+        "point_value": stat.stat_type.point_value,
+        "period": stat.period,
+    }
+
+
+def substitution_payload(substitution):
+    return {
+        "id": substitution.pk,
+        "team": substitution.substitute_in.team_id,
+        "substitute_in": substitution.substitute_in_id,
+        "substitute_out": substitution.substitute_out_id,
+        "period": substitution.period,
+    }
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from games.services import ResultLedger
+
+
+class Command(BaseCommand):
+    help = "Check or recompute team records, standings, player season totals and game logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report rows that differ from a recompute",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            records, standings, player_stats, game_logs = ResultLedger.check()
+            for team_id, season_id in records:
+                self.stdout.write(f"Team record out of date: team {team_id}, season {season_id}")
+            for season_id, team_id in standings:
+                self.stdout.write(f"Standing out of date: season {season_id}, team {team_id}")
+            for season_id, player_id, stat_type_id in player_stats:
+                self.stdout.write(
+                    f"Player total out of date: season {season_id}, player {player_id}, "
+                    f"stat {stat_type_id}"
+                )
+            for player_id, game_id in game_logs:
+                self.stdout.write(f"Game log out of date: player {player_id}, game {game_id}")
+            if records or standings or player_stats or game_logs:
+                raise CommandError(
+                    f"{len(records)} team records, {len(standings)} standings, "
+                    f"{len(player_stats)} player totals and {len(game_logs)} game logs "
+                    "are out of date"
+                )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Team records, standings, player totals and game logs are consistent"
+                )
+            )
+            return
+
+        records, standings, player_stats, game_logs = ResultLedger.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {records} team records, {standings} standings, "
+                f"{player_stats} player totals and {game_logs} game logs"
+            )
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-17 19:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_stat_lines(apps, schema_editor):
+    PlayerStat = apps.get_model("games", "PlayerStat")
+    PlayerGameStatLine = apps.get_model("games", "PlayerGameStatLine")
+    rows = PlayerStat.objects.values(
+        "game_id", "player_id", "player__team_id", "period", "stat_type_id"
+    ).annotate(total=Count("id"))
+    PlayerGameStatLine.objects.bulk_create(
+        (
+            PlayerGameStatLine(
+                game_id=row["game_id"],
+                player_id=row["player_id"],
+                team_id=row["player__team_id"],
+                period=row["period"],
+                stat_type_id=row["stat_type_id"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0020_alter_game_date_alter_game_league_and_more'),
+        ('sports', '0022_sport_win_threshold_alter_sport_max_period'),
+        ('teams', '0020_player_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGameStatLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.PositiveIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stat_lines', to='games.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teams.player')),
+                ('stat_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports.sportstattype')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', 'team'], name='games_playe_game_id_cb0641_idx')],
+                'unique_together': {('game', 'player', 'period', 'stat_type')},
+            },
+        ),
+        migrations.RunPython(backfill_stat_lines, migrations.RunPython.noop),
+    ]
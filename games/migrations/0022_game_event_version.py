@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0021_playergamestatline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='event_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
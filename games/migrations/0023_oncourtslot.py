@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_on_court_slots(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    StartingLineup = apps.get_model("games", "StartingLineup")
+    Substitution = apps.get_model("games", "Substitution")
+    OnCourtSlot = apps.get_model("games", "OnCourtSlot")
+
+    slots = []
+    for game in Game.objects.filter(starting_lineup__isnull=False).distinct():
+        on_court = {
+            player_id: (team_id, position_id)
+            for player_id, team_id, position_id in StartingLineup.objects.filter(
+                game=game, is_starting=True
+            ).values_list("player_id", "team_id", "position_id")
+        }
+        for sub_in, sub_out in (
+            Substitution.objects.filter(game=game, period__lte=game.current_period)
+            .order_by("timestamp", "pk")
+            .values_list("substitute_in_id", "substitute_out_id")
+        ):
+            if sub_out in on_court:
+                on_court[sub_in] = on_court.pop(sub_out)
+        slots.extend(
+            OnCourtSlot(game=game, player_id=player_id, team_id=team_id, position_id=position_id)
+            for player_id, (team_id, position_id) in on_court.items()
+        )
+    OnCourtSlot.objects.bulk_create(slots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0022_game_event_version'),
+        ('sports', '0022_sport_win_threshold_alter_sport_max_period'),
+        ('teams', '0020_player_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnCourtSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='on_court', to='games.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teams.player')),
+                ('position', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='sports.position')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', 'team'], name='games_oncou_game_id_06c7e3_idx')],
+                'unique_together': {('game', 'player')},
+            },
+        ),
+        migrations.RunPython(backfill_on_court_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:17
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0023_oncourtslot'),
+        ('leagues', '0015_league_tiebreakers'),
+        ('sports', '0022_sport_win_threshold_alter_sport_max_period'),
+        ('teams', '0021_teamrecord'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('date', 'created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='game_sort_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(models.F('season'), models.OrderBy(django.db.models.functions.comparison.Coalesce('date', 'created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='game_season_sort_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerstat',
+            index=models.Index(fields=['-timestamp', '-id'], name='games_playe_timesta_a42852_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerstat',
+            index=models.Index(fields=['game', '-timestamp', '-id'], name='games_playe_game_id_db73fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerstat',
+            index=models.Index(fields=['player', '-timestamp', '-id'], name='games_playe_player__b5330f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='substitution',
+            index=models.Index(fields=['-timestamp', '-id'], name='games_subst_timesta_1a7b3d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='substitution',
+            index=models.Index(fields=['game', '-timestamp', '-id'], name='games_subst_game_id_881128_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_player_season_stats(apps, schema_editor):
+    PlayerGameStatLine = apps.get_model("games", "PlayerGameStatLine")
+    PlayerSeasonStat = apps.get_model("games", "PlayerSeasonStat")
+
+    rows = {}
+    lines = (
+        PlayerGameStatLine.objects.filter(game__status="completed", game__season__isnull=False)
+        .values_list("game__season_id", "player_id", "stat_type_id", "game_id")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+    )
+    for season_id, player_id, stat_type_id, _game_id, total in lines.iterator():
+        row = rows.setdefault(
+            (season_id, player_id, stat_type_id),
+            PlayerSeasonStat(season_id=season_id, player_id=player_id, stat_type_id=stat_type_id),
+        )
+        row.total += total
+        row.games += 1
+
+    PlayerSeasonStat.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0024_keyset_pagination_indexes'),
+        ('leagues', '0015_league_tiebreakers'),
+        ('sports', '0022_sport_win_threshold_alter_sport_max_period'),
+        ('teams', '0021_teamrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='teams.player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='leagues.season')),
+                ('stat_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports.sportstattype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'stat_type', '-total'], name='games_playe_season__105487_idx')],
+                'unique_together': {('season', 'player', 'stat_type')},
+            },
+        ),
+        migrations.RunPython(backfill_player_season_stats, migrations.RunPython.noop),
+    ]
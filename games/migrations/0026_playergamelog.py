@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0025_playerseasonstat'),
+        ('leagues', '0015_league_tiebreakers'),
+        ('teams', '0021_teamrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGameLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateTimeField()),
+                ('points', models.IntegerField(default=0)),
+                ('stats', models.JSONField(default=dict)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_logs', to='games.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_logs', to='teams.player')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='leagues.season')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['player', '-date', '-id'], name='games_playe_player__d56f16_idx'), models.Index(fields=['player', 'season'], name='games_playe_player__3a5b2b_idx')],
+                'unique_together': {('player', 'game')},
+            },
+        ),
+    ]
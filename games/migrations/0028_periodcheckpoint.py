@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0027_gameevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.PositiveIntegerField()),
+                ('players', models.JSONField(default=list)),
+                ('teams', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='games.game')),
+            ],
+            options={
+                'unique_together': {('game', 'period')},
+            },
+        ),
+    ]
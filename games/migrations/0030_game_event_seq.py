@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:48
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_event_seq(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    GameEvent = apps.get_model("games", "GameEvent")
+
+    last_seq = (
+        GameEvent.objects.filter(game_id=OuterRef("pk"))
+        .values("game_id")
+        .annotate(last=Max("seq"))
+        .values("last")
+    )
+    Game.objects.filter(pk__in=GameEvent.objects.values("game_id")).update(event_seq=Subquery(last_seq))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0029_gamesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='event_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_event_seq, migrations.RunPython.noop),
+    ]
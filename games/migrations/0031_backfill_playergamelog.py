@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-17 21:45
+
+from django.db import migrations
+
+
+def backfill_player_game_logs(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    if not Game.objects.filter(status="completed").exists():
+        return
+
+    # Points and base stats come from each sport's StatPlan, so build the
+    # logs the way rebuild_results does rather than repeating the rules here
+    from games.models import PlayerGameLog
+
+    PlayerGameLog.objects.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0030_game_event_seq'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_player_game_logs, migrations.RunPython.noop),
+    ]
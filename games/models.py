@@ -1,9 +1,32 @@
-from django.db import models
+import json
+import zlib
+from collections import Counter
+from django.db import models, transaction
 from sports.models import Sport, SportStatType, Position
-from django.db.models import Sum
+from django.db.models import Count, Sum, F, Q, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from leagues.models import League, Season
+from games.live import publish_game_event, score_payload
+
+
+class GameQuerySet(models.QuerySet):
+    def with_lineup_counts(self):
+        """Annotate home_lineup_count/away_lineup_count starters per side"""
+        return self.annotate(
+            home_lineup_count=Count(
+                "starting_lineup", filter=Q(starting_lineup__team=F("home_team"))
+            ),
+            away_lineup_count=Count(
+                "starting_lineup", filter=Q(starting_lineup__team=F("away_team"))
+            ),
+        )
+
+    def with_sort_date(self):
+        """Annotate sort_date, the date or, for undated games, created_at"""
+        return self.annotate(sort_date=Coalesce("date", "created_at"))
 
 
 class Game(models.Model):
@@ -34,12 +57,18 @@ class Game(models.Model):
     current_period = models.PositiveIntegerField(
         default=1
     )  # For tracking quarters/sets
+    # Bumped on every stat, substitution and period change
+    event_version = models.PositiveBigIntegerField(default=0)
+    # Seq of the game's last GameEvent; events are numbered 1, 2, 3...
+    event_seq = models.PositiveBigIntegerField(default=0)
     started_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     duration = models.DurationField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GameQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=["date"]),
@@ -47,9 +76,56 @@ class Game(models.Model):
             models.Index(fields=["home_team", "away_team"]),
             models.Index(fields=["started_at"]),
             models.Index(fields=["ended_at"]),
+            # Keyset pagination and its season filter, see with_sort_date
+            models.Index(
+                Coalesce("date", "created_at").desc(), F("id").desc(), name="game_sort_date_idx"
+            ),
+            models.Index(
+                F("season"),
+                Coalesce("date", "created_at").desc(),
+                F("id").desc(),
+                name="game_season_sort_date_idx",
+            ),
         ]
         ordering = ["-date"]
 
+    # Fields that decide a completed game's contribution to records/standings
+    RESULT_FIELDS = (
+        "status",
+        "season_id",
+        "home_team_id",
+        "away_team_id",
+        "home_team_score",
+        "away_team_score",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_result = instance.result_state()
+        return instance
+
+    def result_state(self):
+        return tuple(self.__dict__.get(field) for field in self.RESULT_FIELDS)
+
+    @classmethod
+    def stored_result(cls, pk):
+        """Result state of the row, locked until the end of the transaction"""
+        return (
+            cls.objects.select_for_update()
+            .filter(pk=pk)
+            .values_list(*cls.RESULT_FIELDS)
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        # Lock the row and take the stored result as ResultLedger's starting
+        # point, so concurrent saves can't both apply the same change
+        with transaction.atomic():
+            if not self._state.adding:
+                self._loaded_result = self.stored_result(self.pk)
+            super().save(*args, **kwargs)
+
     def clean(self):
         if self.home_team == self.away_team:
             raise ValidationError("Home and away teams cannot be the same")
@@ -60,6 +136,11 @@ class Game(models.Model):
         return f"{self.date.strftime('%Y-%m-%d')}: {self.home_team} vs {self.away_team}"
 
     def update_scores(self):
+        """Recompute both scores from every PlayerStat of the game.
+
+        Scores are maintained incrementally by apply_score_delta as stats are
+        written; this full recompute is only kept as a repair path.
+        """
         # Single query for home team
         home_score = (
             PlayerStat.objects.filter(
@@ -80,11 +161,79 @@ class Game(models.Model):
             or 0
         )
 
-        # Atomic update
-        Game.objects.filter(pk=self.pk).update(
-            home_team_score=home_score, away_team_score=away_score
-        )
-        self.refresh_from_db()
+        # Atomic update; a completed game's result is moved under the row lock
+        with transaction.atomic():
+            stored = self.stored_result(self.pk)
+            completed = stored is not None and stored[0] == self.Status.COMPLETED
+            if completed:
+                self._loaded_result = stored
+            Game.objects.filter(pk=self.pk).update(
+                home_team_score=home_score,
+                away_team_score=away_score,
+                event_version=F("event_version") + 1,
+            )
+            self.home_team_score = home_score
+            self.away_team_score = away_score
+            self.event_version += 1
+            if completed:
+                from games.services import ResultLedger
+
+                ResultLedger.record(self)
+
+    def score_field(self, team_id):
+        """Name of the score column belonging to team_id, or None"""
+        if team_id == self.home_team_id:
+            return "home_team_score"
+        if team_id == self.away_team_id:
+            return "away_team_score"
+        return None
+
+    def apply_score_delta(self, team_id, points):
+        """Atomically add a signed point delta to the given team's score"""
+        self.apply_score_deltas({team_id: points})
+
+    def apply_score_deltas(self, deltas):
+        """Apply {team_id: signed points} to both scores in one UPDATE.
+
+        A score change is a game event, so event_version is bumped as well;
+        nothing is written when no score moves. The instance is left with
+        the stored scores, including concurrent changes.
+        """
+        changes = {}
+        for team_id, points in deltas.items():
+            field = self.score_field(team_id)
+            if field is not None and points:
+                changes[field] = changes.get(field, 0) + points
+        if not any(changes.values()):
+            return
+
+        with transaction.atomic():
+            Game.objects.filter(pk=self.pk).update(
+                event_version=F("event_version") + 1,
+                **{
+                    field: Greatest(F(field) + points, Value(0))
+                    for field, points in changes.items()
+                },
+            )
+            # Read the scores back under the row lock the UPDATE holds; the
+            # in-memory ones may predate other scorers' deltas
+            (
+                self.home_team_score,
+                self.away_team_score,
+                self.event_version,
+            ) = Game.objects.filter(pk=self.pk).values_list(
+                "home_team_score", "away_team_score", "event_version"
+            ).get()
+
+    @classmethod
+    def event_version_of(cls, game_id):
+        """Current event version of a game without loading it, or None"""
+        return cls.objects.filter(pk=game_id).values_list("event_version", flat=True).first()
+
+    def bump_event_version(self):
+        """Mark that the game's stats, lineups or period changed"""
+        Game.objects.filter(pk=self.pk).update(event_version=F("event_version") + 1)
+        self.event_version += 1
 
     def start_game(self):
         """Start game with validation of existing lineup"""
@@ -96,6 +245,7 @@ class Game(models.Model):
         self.status = self.Status.IN_PROGRESS
         self.started_at = timezone.now()
         self.save()
+        publish_game_event(self.pk, "status", status=self.status)
 
     def complete_game(self):
         if self.status != self.Status.IN_PROGRESS:
@@ -107,15 +257,33 @@ class Game(models.Model):
         if self.started_at:
             self.duration = self.ended_at - self.started_at
 
-        self.save(update_fields=["status", "ended_at", "duration", "updated_at"])
+        # Team records, standings, the box-score snapshot and bracket
+        # advancement follow from the post_save signals in the same transaction
+        with transaction.atomic():
+            self.save(update_fields=["status", "ended_at", "duration", "updated_at"])
+        publish_game_event(
+            self.pk, "status", status=self.status, **score_payload(self)
+        )
 
     def next_period(self):
         if self.status != self.Status.IN_PROGRESS:
             raise ValueError(f"Cannot proceed to next period in {self.status} status")
         
-        self.current_period += 1
-        self.save(update_fields=["current_period"])
-        
+        # Stats of the closed periods are final; freeze them under the game
+        # row lock so live summaries only aggregate the new period
+        with transaction.atomic():
+            current = (
+                Game.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list("current_period", flat=True)
+                .get()
+            )
+            self.current_period = current + 1
+            self.save(update_fields=["current_period"])
+            PeriodCheckpoint.objects.close(self.pk, self.current_period)
+        self.bump_event_version()
+        publish_game_event(self.pk, "period", current_period=self.current_period)
+
     
     def validate_starting_lineup(self):
         """Validate lineup requirements"""
@@ -154,32 +322,17 @@ class Game(models.Model):
         if errors:
             raise ValidationError(" ".join(errors))
 
+    def lineup_counts(self):
+        """(home, away) starter counts, from annotations when present"""
+        if hasattr(self, "home_lineup_count") and hasattr(self, "away_lineup_count"):
+            return self.home_lineup_count, self.away_lineup_count
+        counts = dict(
+            self.starting_lineup.values_list("team_id").annotate(total=Count("pk"))
+        )
+        return counts.get(self.home_team_id, 0), counts.get(self.away_team_id, 0)
+
     def get_current_players(self, team):
-        starters = self.starting_lineup.filter(
-            team=team, 
-            is_starting=True
-        ).select_related('player', 'position')
-        
-        current_lineups = {sp.player_id: sp for sp in starters}
-        
-        # Get substitutions in chronological order (oldest first)
-        substitutions = self.substitutions.filter(
-            substitute_in__team=team,
-            period__lte=self.current_period
-        ).order_by("timestamp")
-        
-        for sub in substitutions:
-            if sub.substitute_out_id in current_lineups:
-                current_lineups[sub.substitute_in_id] = StartingLineup(
-                    player=sub.substitute_in,
-                    team=team,
-                    position=current_lineups[sub.substitute_out_id].position,
-                    game=self,
-                    is_starting=False
-                )
-                del current_lineups[sub.substitute_out_id]
-        
-        return list(current_lineups.values())
+        return self.on_court.filter(team=team).select_related("player__user", "position")
 
     @property
     def winner(self):
@@ -213,6 +366,10 @@ class PlayerStat(models.Model):
         indexes = [
             models.Index(fields=["game", "player"]),
             models.Index(fields=["stat_type"]),
+            # Keyset pagination, unfiltered and by game or player
+            models.Index(fields=["-timestamp", "-id"]),
+            models.Index(fields=["game", "-timestamp", "-id"]),
+            models.Index(fields=["player", "-timestamp", "-id"]),
         ]
         ordering = ["-timestamp"]
 
@@ -227,6 +384,444 @@ class PlayerStat(models.Model):
             raise ValidationError("Stat type doesn't match game sport")
 
 
+class PlayerGameStatLineManager(models.Manager):
+    def apply(self, game_id, counts):
+        """Add signed deltas keyed by (player_id, team_id, period, stat_type_id)"""
+        with transaction.atomic():
+            # Locking the game orders this write against next_period freezing
+            # the periods it closes
+            current = (
+                Game.objects.select_for_update()
+                .filter(pk=game_id)
+                .values_list("current_period", flat=True)
+                .first()
+            )
+            closed = {key[2] for key in counts if current is None or key[2] < current}
+            if closed:
+                PeriodCheckpoint.objects.invalidate(game_id, closed)
+            self._apply(game_id, counts)
+
+    def _apply(self, game_id, counts):
+        missing = {}
+        for key, delta in counts.items():
+            if delta and not self._line(game_id, key).update(count=F("count") + delta):
+                if delta > 0:
+                    missing[key] = delta
+        if not missing:
+            return
+
+        # First events for these keys; create the rows, then apply the deltas
+        # so a concurrent writer creating the same row is not lost
+        self.bulk_create(
+            [
+                self.model(
+                    game_id=game_id,
+                    player_id=player_id,
+                    team_id=team_id,
+                    period=period,
+                    stat_type_id=stat_type_id,
+                )
+                for player_id, team_id, period, stat_type_id in missing
+            ],
+            ignore_conflicts=True,
+        )
+        for key, delta in missing.items():
+            self._line(game_id, key).update(count=F("count") + delta)
+
+    def _line(self, game_id, key):
+        player_id, _team_id, period, stat_type_id = key
+        return self.filter(
+            game_id=game_id,
+            player_id=player_id,
+            period=period,
+            stat_type_id=stat_type_id,
+        )
+
+    def rebuild(self, game_id):
+        """Recreate a game's lines from its raw PlayerStat rows"""
+        PeriodCheckpoint.objects.invalidate(game_id)
+        self.filter(game_id=game_id).delete()
+        rows = (
+            PlayerStat.objects.filter(game_id=game_id)
+            .values("player_id", "player__team_id", "period", "stat_type_id")
+            .annotate(total=Count("id"))
+        )
+        self.bulk_create(
+            self.model(
+                game_id=game_id,
+                player_id=row["player_id"],
+                team_id=row["player__team_id"],
+                period=row["period"],
+                stat_type_id=row["stat_type_id"],
+                count=row["total"],
+            )
+            for row in rows
+        )
+
+
+class PlayerGameStatLine(models.Model):
+    """Running per-period box-score count, maintained alongside PlayerStat"""
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="stat_lines")
+    player = models.ForeignKey("teams.Player", on_delete=models.CASCADE)
+    team = models.ForeignKey("teams.Team", on_delete=models.CASCADE, null=True)
+    period = models.PositiveIntegerField()
+    stat_type = models.ForeignKey(SportStatType, on_delete=models.CASCADE)
+    count = models.IntegerField(default=0)
+
+    objects = PlayerGameStatLineManager()
+
+    class Meta:
+        unique_together = ("game", "player", "period", "stat_type")
+        indexes = [
+            models.Index(fields=["game", "team"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} {self.stat_type} x{self.count} (Period {self.period})"
+
+
+class PeriodCheckpointManager(models.Manager):
+    def freeze(self, game_id, periods):
+        """Snapshot the stat lines of closed periods; {period: checkpoint}"""
+        players = {period: [] for period in periods}
+        teams = {period: Counter() for period in periods}
+        lines = PlayerGameStatLine.objects.filter(
+            game_id=game_id, period__in=players
+        ).values_list("player_id", "team_id", "period", "stat_type_id", "count")
+        for player_id, team_id, period, stat_type_id, count in lines:
+            players[period].append([player_id, team_id, stat_type_id, count])
+            teams[period][(team_id, stat_type_id)] += count
+
+        checkpoints = [
+            self.model(
+                game_id=game_id,
+                period=period,
+                players=players[period],
+                teams=[[*key, total] for key, total in teams[period].items()],
+            )
+            for period in players
+        ]
+        self.invalidate(game_id, players)
+        self.bulk_create(checkpoints)
+        return {checkpoint.period: checkpoint for checkpoint in checkpoints}
+
+    def close(self, game_id, current_period):
+        """Freeze every period before current_period that has no checkpoint.
+
+        Called by Game.next_period under the game row lock, which stat line
+        writes also take, so no write lands between reading and storing.
+        """
+        frozen = set(self.filter(game_id=game_id).values_list("period", flat=True))
+        missing = [p for p in range(1, current_period) if p not in frozen]
+        return self.freeze(game_id, missing) if missing else {}
+
+    def closed(self, game):
+        """{period: checkpoint} for the periods before the current one.
+
+        Summaries read the periods missing here, such as those invalidated
+        by a late edit, from their stat lines.
+        """
+        if game.current_period <= 1:
+            return {}
+        return {
+            checkpoint.period: checkpoint
+            for checkpoint in self.filter(game=game, period__lt=game.current_period)
+        }
+
+    def invalidate(self, game_id, periods=None):
+        checkpoints = self.filter(game_id=game_id)
+        if periods is not None:
+            checkpoints = checkpoints.filter(period__in=periods)
+        checkpoints.delete()
+
+
+class PeriodCheckpoint(models.Model):
+    """Frozen stat-line totals of a period that has been closed.
+
+    ``players`` holds [player_id, team_id, stat_type_id, count] rows and
+    ``teams`` holds [team_id, stat_type_id, total] rows. Any change to the
+    period's stat lines drops the checkpoint; it is frozen again when the
+    game next moves to a new period.
+    """
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="checkpoints")
+    period = models.PositiveIntegerField()
+    players = models.JSONField(default=list)
+    teams = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = PeriodCheckpointManager()
+
+    class Meta:
+        unique_together = ("game", "period")
+
+    def __str__(self):
+        return f"Game {self.game_id} period {self.period} checkpoint"
+
+    def player_rows(self, team_ids, stat_type_ids):
+        """(player_id, period, stat_type_id, count) for players of team_ids"""
+        return [
+            (player_id, self.period, stat_type_id, count)
+            for player_id, team_id, stat_type_id, count in self.players
+            if team_id in team_ids and stat_type_id in stat_type_ids
+        ]
+
+    def team_rows(self, stat_type_ids):
+        """(team_id, period, stat_type_id, total)"""
+        return [
+            (team_id, self.period, stat_type_id, total)
+            for team_id, stat_type_id, total in self.teams
+            if stat_type_id in stat_type_ids
+        ]
+
+
+def _counted_season(state):
+    """Season a result state counts towards in the player rollup, or None"""
+    if state is None or state[0] != Game.Status.COMPLETED:
+        return None
+    return state[1]
+
+
+class PlayerSeasonStatManager(models.Manager):
+    def game_counts(self, game_id, keys=None):
+        """{(player_id, stat_type_id): count} over one game's stat lines,
+        optionally only for the (player_id, stat_type_id) pairs in keys"""
+        lines = PlayerGameStatLine.objects.filter(game_id=game_id)
+        if keys is not None:
+            lines = lines.filter(
+                player_id__in={player_id for player_id, _ in keys},
+                stat_type_id__in={stat_type_id for _, stat_type_id in keys},
+            )
+        rows = (
+            lines.values_list("player_id", "stat_type_id")
+            .annotate(total=Sum("count"))
+            .filter(total__gt=0)
+        )
+        return {(player_id, stat_type_id): total for player_id, stat_type_id, total in rows}
+
+    def apply(self, season_id, counts, sign=1):
+        """Add, or with sign=-1 take away, one game's counts in a season"""
+        self._apply(season_id, {key: (sign * count, sign) for key, count in counts.items()})
+
+    def adjust(self, season_id, game_id, changes):
+        """Follow single stats added to or removed from a completed game.
+
+        ``changes`` maps (player_id, stat_type_id) to the change in the
+        game's count, already applied to its stat lines. Only those pairs
+        are read back, so an edit costs a fixed number of queries however
+        long the season is.
+        """
+        changes = {key: change for key, change in changes.items() if change}
+        if not changes:
+            return
+        counts = self.game_counts(game_id, changes)
+        deltas = {}
+        for key, change in changes.items():
+            after = counts.get(key, 0)
+            deltas[key] = (change, (after > 0) - (after - change > 0))
+        self._apply(season_id, deltas)
+
+    def _apply(self, season_id, deltas):
+        """Add {(player_id, stat_type_id): (total, games)} deltas to a season.
+
+        The season's affected rows are locked and written back with one
+        bulk_update, so completing a game costs a fixed number of queries
+        however many players and stats it had.
+        """
+        if not deltas:
+            return
+        with transaction.atomic():
+            rows = {
+                (row.player_id, row.stat_type_id): row
+                for row in self.select_for_update().filter(
+                    season_id=season_id,
+                    player_id__in={player_id for player_id, _ in deltas},
+                    stat_type_id__in={stat_type_id for _, stat_type_id in deltas},
+                )
+            }
+            changed, missing = [], []
+            for (player_id, stat_type_id), (total, games) in deltas.items():
+                row = rows.get((player_id, stat_type_id))
+                if row is not None:
+                    row.total += total
+                    row.games += games
+                    changed.append(row)
+                elif total > 0:
+                    missing.append(
+                        self.model(
+                            season_id=season_id,
+                            player_id=player_id,
+                            stat_type_id=stat_type_id,
+                            total=total,
+                            games=games,
+                        )
+                    )
+            self.bulk_update(changed, ["total", "games"], batch_size=500)
+            self.bulk_create(missing, batch_size=500)
+
+    def move_game(self, game_id, previous, current):
+        """Follow a game into or out of its season's completed results"""
+        before, after = _counted_season(previous), _counted_season(current)
+        if before == after:
+            return
+        counts = self.game_counts(game_id)
+        if before is not None:
+            self.apply(before, counts, sign=-1)
+        if after is not None:
+            self.apply(after, counts)
+
+    def expected(self, season_id=None):
+        """{(season_id, player_id, stat_type_id): (total, games)} from the stat lines"""
+        lines = PlayerGameStatLine.objects.filter(
+            game__status=Game.Status.COMPLETED, game__season__isnull=False
+        )
+        if season_id is not None:
+            lines = lines.filter(game__season_id=season_id)
+        rows = (
+            lines.values_list("game__season_id", "player_id", "stat_type_id", "game_id")
+            .annotate(total=Sum("count"))
+            .filter(total__gt=0)
+        )
+        totals = {}
+        for season, player_id, stat_type_id, _game_id, total in rows.iterator():
+            row = totals.setdefault((season, player_id, stat_type_id), [0, 0])
+            row[0] += total
+            row[1] += 1
+        return {key: tuple(value) for key, value in totals.items()}
+
+    def rebuild(self, season_id=None):
+        """Recompute the rollup, for one season or every season"""
+        totals = self.expected(season_id)
+        with transaction.atomic():
+            rows = self.all() if season_id is None else self.filter(season_id=season_id)
+            rows.delete()
+            self.bulk_create(
+                (
+                    self.model(
+                        season_id=season,
+                        player_id=player_id,
+                        stat_type_id=stat_type_id,
+                        total=total,
+                        games=games,
+                    )
+                    for (season, player_id, stat_type_id), (total, games) in totals.items()
+                ),
+                batch_size=1000,
+            )
+        return len(totals)
+
+
+class PlayerSeasonStat(models.Model):
+    """Season total of one stat for one player over completed games"""
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="player_stats")
+    player = models.ForeignKey("teams.Player", on_delete=models.CASCADE, related_name="season_stats")
+    stat_type = models.ForeignKey(SportStatType, on_delete=models.CASCADE)
+    total = models.IntegerField(default=0)
+    games = models.PositiveIntegerField(default=0)  # completed games with the stat
+
+    objects = PlayerSeasonStatManager()
+
+    class Meta:
+        unique_together = ("season", "player", "stat_type")
+        indexes = [
+            # Leaderboards: ORDER BY total DESC LIMIT n within a season's stat
+            models.Index(fields=["season", "stat_type", "-total"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} {self.stat_type} {self.total} in {self.season}"
+
+
+class PlayerGameLogManager(models.Manager):
+    def expected(self, games):
+        """{(player_id, game_id): unsaved log} for the completed games in ``games``"""
+        from games.services import StatPlan
+
+        rows = (
+            PlayerGameStatLine.objects.filter(
+                game__in=games.filter(status=Game.Status.COMPLETED)
+            )
+            .values_list(
+                "game_id", "player_id", "team_id", "stat_type_id", "game__sport_id", "game__season_id"
+            )
+            .annotate(date=Coalesce("game__date", "game__created_at"), total=Sum("count"))
+            .filter(total__gt=0)
+        )
+        logs, sports = {}, {}
+        for game_id, player_id, team_id, stat_type_id, sport_id, season_id, date, total in rows.iterator():
+            log = logs.get((player_id, game_id))
+            if log is None:
+                log = logs[(player_id, game_id)] = self.model(
+                    player_id=player_id,
+                    game_id=game_id,
+                    team_id=team_id,
+                    season_id=season_id,
+                    date=date,
+                    stats={},
+                )
+                sports[(player_id, game_id)] = sport_id
+            key = str(stat_type_id)
+            log.stats[key] = log.stats.get(key, 0) + total
+
+        for key, sport_id in sports.items():
+            log, plan = logs[key], StatPlan.for_sport(sport_id)
+            log.stats = {
+                stat_id: count
+                for stat_id, count in log.stats.items()
+                if stat_id in plan.base_keys
+            }
+            counts = plan.base_counts(log.stats)
+            log.points = plan.points(counts, plan.evaluate(counts))
+        return logs
+
+    def rebuild(self, games=None):
+        """Recreate the logs of a Game queryset, or of every game"""
+        games = Game.objects.all() if games is None else games
+        logs = self.expected(games)
+        with transaction.atomic():
+            self.filter(game__in=games).delete()
+            self.bulk_create(logs.values(), batch_size=1000)
+        return len(logs)
+
+    def move_game(self, game_id, previous, current):
+        """Write, drop or re-season a game's logs as its result changes"""
+        was_completed = previous is not None and previous[0] == Game.Status.COMPLETED
+        is_completed = current is not None and current[0] == Game.Status.COMPLETED
+        if is_completed and not was_completed:
+            self.rebuild(Game.objects.filter(pk=game_id))
+        elif was_completed and not is_completed:
+            self.filter(game_id=game_id).delete()
+        elif is_completed and previous[1] != current[1]:
+            self.filter(game_id=game_id).update(season_id=current[1])
+
+
+class PlayerGameLog(models.Model):
+    """One player's totals for one completed game"""
+
+    player = models.ForeignKey("teams.Player", on_delete=models.CASCADE, related_name="game_logs")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="player_logs")
+    team = models.ForeignKey("teams.Team", on_delete=models.CASCADE, null=True)
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, null=True)
+    date = models.DateTimeField()  # the game's date, or created_at if undated
+    points = models.IntegerField(default=0)
+    stats = models.JSONField(default=dict)  # base stat counts keyed by stat type id
+
+    objects = PlayerGameLogManager()
+
+    class Meta:
+        unique_together = ("player", "game")
+        indexes = [
+            # Keyset pagination of a player's game log
+            models.Index(fields=["player", "-date", "-id"]),
+            models.Index(fields=["player", "season"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} in {self.game}: {self.points} pts"
+
+
 class Substitution(models.Model):
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="substitutions")
     substitute_in = models.ForeignKey("teams.Player", on_delete=models.CASCADE, related_name="substitutions_in")
@@ -238,6 +833,9 @@ class Substitution(models.Model):
         indexes = [
             models.Index(fields=["game", "period"]),
             models.Index(fields=["substitute_in", "substitute_out"]),
+            # Keyset pagination, unfiltered and by game
+            models.Index(fields=["-timestamp", "-id"]),
+            models.Index(fields=["game", "-timestamp", "-id"]),
         ]
 
     def clean(self):
@@ -254,6 +852,93 @@ class Substitution(models.Model):
         return f"{self.substitute_out} ↔ {self.substitute_in} (Period {self.period})"
 
 
+class GameEventManager(models.Manager):
+    def append(self, game_id, kind, data):
+        """Add an event at the game's next sequence number.
+
+        Game.event_seq counts the game's events, so seqs have no gaps and a
+        client missing one knows it lost an event. Bumping it locks the game
+        row until commit, so concurrent writers get distinct numbers. The
+        event also bumps event_version, which other changes share.
+        """
+        with transaction.atomic():
+            Game.objects.filter(pk=game_id).update(
+                event_seq=F("event_seq") + 1, event_version=F("event_version") + 1
+            )
+            seq = Game.objects.filter(pk=game_id).values_list("event_seq", flat=True).get()
+            return self.create(game_id=game_id, seq=seq, kind=kind, data=data)
+
+    def since(self, game_id, seq=0):
+        return self.filter(game_id=game_id, seq__gt=seq).order_by("seq")
+
+
+class GameEvent(models.Model):
+    """Append-only play-by-play entry; seq orders the events of a game"""
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="events")
+    seq = models.PositiveBigIntegerField()
+    kind = models.CharField(max_length=30)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = GameEventManager()
+
+    class Meta:
+        unique_together = ("game", "seq")
+        ordering = ["seq"]
+
+    def __str__(self):
+        return f"{self.kind} #{self.seq} in {self.game_id}"
+
+    def as_payload(self):
+        return {"seq": self.seq, "type": self.kind, "game": self.game_id, **self.data}
+
+
+class GameSnapshotManager(models.Manager):
+    def store(self, game_id, payload):
+        return self.update_or_create(
+            game_id=game_id,
+            defaults={
+                "version": self.model.VERSION,
+                "data": zlib.compress(json.dumps(payload, cls=DjangoJSONEncoder).encode()),
+            },
+        )[0]
+
+    def current(self):
+        """Snapshots in the current payload format"""
+        return self.filter(version=self.model.VERSION)
+
+
+class GameSnapshot(models.Model):
+    """Box score of a completed game, stored as zlib-compressed JSON.
+
+    Bump VERSION when the payload changes shape; older snapshots are then
+    ignored and taken again on their next read.
+    """
+
+    VERSION = 1
+
+    game = models.OneToOneField(
+        Game, on_delete=models.CASCADE, primary_key=True, related_name="snapshot"
+    )
+    version = models.PositiveSmallIntegerField()
+    data = models.BinaryField()
+    taken_at = models.DateTimeField(auto_now=True)
+
+    objects = GameSnapshotManager()
+
+    def __str__(self):
+        return f"Game {self.game_id} snapshot v{self.version}"
+
+    @property
+    def is_current(self):
+        return self.version == self.VERSION
+
+    @property
+    def payload(self):
+        return json.loads(zlib.decompress(self.data))
+
+
 class StartingLineup(models.Model):
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="starting_lineup")
     player = models.ForeignKey("teams.Player", on_delete=models.CASCADE)
@@ -266,3 +951,61 @@ class StartingLineup(models.Model):
 
     def __str__(self):
         return f"{self.player} ({self.team}) - {'Starter' if self.is_starting else 'Bench'}"
+
+
+class OnCourtSlotManager(models.Manager):
+    def substitute(self, substitution):
+        """Hand the outgoing player's slot to the incoming player"""
+        return self.filter(
+            game_id=substitution.game_id, player_id=substitution.substitute_out_id
+        ).update(player_id=substitution.substitute_in_id)
+
+    def rebuild(self, game, team_id=None):
+        """Replay the starting lineup and substitutions into the slots"""
+        starters = StartingLineup.objects.filter(game=game, is_starting=True)
+        substitutions = Substitution.objects.filter(
+            game=game, period__lte=game.current_period
+        ).order_by("timestamp", "pk")
+        slots = self.filter(game=game)
+        if team_id is not None:
+            starters = starters.filter(team_id=team_id)
+            substitutions = substitutions.filter(substitute_in__team_id=team_id)
+            slots = slots.filter(team_id=team_id)
+
+        on_court = {
+            player_id: (team, position_id)
+            for player_id, team, position_id in starters.values_list(
+                "player_id", "team_id", "position_id"
+            )
+        }
+        for sub_in, sub_out in substitutions.values_list(
+            "substitute_in_id", "substitute_out_id"
+        ):
+            if sub_out in on_court:
+                on_court[sub_in] = on_court.pop(sub_out)
+
+        slots.delete()
+        self.bulk_create(
+            self.model(game=game, player_id=player_id, team_id=team, position_id=position_id)
+            for player_id, (team, position_id) in on_court.items()
+        )
+
+
+class OnCourtSlot(models.Model):
+    """A player currently on court, maintained from lineups and substitutions"""
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="on_court")
+    team = models.ForeignKey("teams.Team", on_delete=models.CASCADE)
+    player = models.ForeignKey("teams.Player", on_delete=models.CASCADE)
+    position = models.ForeignKey(Position, on_delete=models.SET_NULL, null=True)
+
+    objects = OnCourtSlotManager()
+
+    class Meta:
+        unique_together = ("game", "player")
+        indexes = [
+            models.Index(fields=["game", "team"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} ({self.team}) on court"
@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import Game, PlayerStat, StartingLineup, Substitution
+from .models import Game, OnCourtSlot, PlayerGameLog, PlayerStat, StartingLineup, Substitution
 from teams.serializers import TeamSerializer, PlayerInfoSerializer
 from teams.models import Team, Player
 from sports.models import SportStatType, Position
 from sports.serializers import PositionSerializer
+from .services import RosterState, StatPlan
 from django.core.exceptions import ValidationError
 
 
@@ -17,6 +18,56 @@ class PlayerStatRecordSerializer(serializers.ModelSerializer):
         fields = ["game", "player", "stat_type"]
 
 
+class PlayerStatEventSerializer(serializers.Serializer):
+    player = serializers.IntegerField()
+    stat_type = serializers.IntegerField()
+    period = serializers.IntegerField(required=False, min_value=1)
+
+
+class PlayerStatBatchSerializer(serializers.Serializer):
+    game = serializers.PrimaryKeyRelatedField(queryset=Game.objects.all())
+    events = PlayerStatEventSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        """Check every event against one roster and one stat-type lookup"""
+        game = data["game"]
+        roster = {
+            player.pk: player
+            for player in Player.objects.filter(
+                team_id__in=[game.home_team_id, game.away_team_id]
+            ).select_related("user")
+        }
+        stat_types = {
+            stat_type.pk: stat_type
+            for stat_type in SportStatType.objects.filter(sport_id=game.sport_id)
+        }
+
+        events, errors = [], {}
+        for index, event in enumerate(data["events"]):
+            player = roster.get(event["player"])
+            stat_type = stat_types.get(event["stat_type"])
+            # None records into the current period, resolved under the game lock
+            period = event.get("period")
+
+            if player is None:
+                errors[index] = "Player is not part of this game"
+            elif stat_type is None:
+                errors[index] = "Stat type doesn't match game sport"
+            elif period is not None and period > game.current_period:
+                errors[index] = "Cannot record stats for future periods"
+            else:
+                events.append(
+                    {"player": player, "stat_type": stat_type, "period": period}
+                )
+
+        if errors:
+            raise serializers.ValidationError({"events": errors})
+
+        data["events"] = events
+        data["stat_types"] = stat_types
+        return data
+
+
 class PlayerStatSerializer(serializers.ModelSerializer):
     player_name = serializers.CharField(source="player.user.get_full_name", read_only=True)
     team = serializers.SerializerMethodField()
@@ -37,7 +88,7 @@ class PlayerStatSerializer(serializers.ModelSerializer):
         ]
 
     def get_team(self, obj):
-        return obj.player.team.id
+        return obj.player.team_id
 
     def get_stat_details(self, obj):
         return {
@@ -48,7 +99,12 @@ class PlayerStatSerializer(serializers.ModelSerializer):
 
 
 class RecordableStatSerializer(serializers.ModelSerializer):
-    current_period = serializers.IntegerField()
+    """Scorer buttons, serialized from a sport's StatPlan base stats.
+
+    Expects ``plan`` and ``current_period`` in the context.
+    """
+
+    current_period = serializers.SerializerMethodField()
     button_type = serializers.SerializerMethodField()
     paired_stat_id = serializers.SerializerMethodField()  # Renamed for clarity
     paired_stat_abbrev = serializers.SerializerMethodField()
@@ -66,26 +122,22 @@ class RecordableStatSerializer(serializers.ModelSerializer):
             "paired_stat_abbrev",
         ]
 
+    def get_current_period(self, obj):
+        return self.context["current_period"]
+
     def get_button_type(self, obj):
         if obj.is_negative:
             return "negative"
-        if obj.related_stat:
+        if obj.related_stat_id is not None:
             return "miss"
         return "made" if obj.point_value > 0 else "info"
 
     def get_paired_stat_id(self, obj):
-        if obj.related_stat:
-            return obj.related_stat.id
-        # For missed stats, find if any stat points to this one as related
-        counterpart = SportStatType.objects.filter(related_stat=obj).first()
+        counterpart = self.context["plan"].pairs.get(obj.id)
         return counterpart.id if counterpart else None
 
     def get_paired_stat_abbrev(self, obj):
-        counterpart = (
-            obj.related_stat
-            if obj.related_stat
-            else SportStatType.objects.filter(related_stat=obj).first()
-        )
+        counterpart = self.context["plan"].pairs.get(obj.id)
         return counterpart.abbreviation if counterpart else None
 
 
@@ -142,11 +194,11 @@ class GameSerializer(serializers.ModelSerializer):
         return obj.winner.id if obj.winner else None    
 
     def get_lineup_status(self, obj):
+        home_count, away_count = obj.lineup_counts()
+        required = obj.sport.max_players_on_field
         return {
-            "home_ready": obj.starting_lineup.filter(team=obj.home_team).count()
-            >= obj.sport.max_players_on_field,
-            "away_ready": obj.starting_lineup.filter(team=obj.away_team).count()
-            >= obj.sport.max_players_on_field,
+            "home_ready": home_count >= required,
+            "away_ready": away_count >= required,
         }
 
     def validate(self, data):
@@ -272,12 +324,20 @@ class SubstitutionSerializer(serializers.ModelSerializer):
         if data["period"] > game.current_period:
             raise serializers.ValidationError("Cannot substitute in future period")
 
+        # Both players must belong to the same team in this game
+        if sub_in.team_id != sub_out.team_id:
+            raise serializers.ValidationError("Players must be from the same team")
+
+        roster = RosterState(game)
+        if not roster.in_game(sub_out):
+            raise serializers.ValidationError("Players are not in this game")
+
         # Check if substitute_out is active
-        if not sub_out.is_active_in_game(game):
+        if not roster.is_active(sub_out):
             raise serializers.ValidationError("Substitute out player is not active")
 
         # Check if substitute_in is inactive
-        if sub_in.is_active_in_game(game):
+        if roster.is_active(sub_in):
             raise serializers.ValidationError("Substitute in player is already active")
 
         return data
@@ -290,12 +350,12 @@ class CurrentPlayerSerializer(serializers.ModelSerializer):
     last_name = serializers.CharField(source="player.user.last_name")
     jersey_number = serializers.IntegerField(source="player.jersey_number")
     position = PositionSerializer()
-    team = serializers.IntegerField(source="player.team.id")
+    team = serializers.IntegerField(source="team_id")
     short_name = serializers.SerializerMethodField()
     team_side = serializers.SerializerMethodField()
 
     class Meta:
-        model = StartingLineup
+        model = OnCourtSlot
         fields = [
             "id",
             "profile",
@@ -312,8 +372,7 @@ class CurrentPlayerSerializer(serializers.ModelSerializer):
         return f"{obj.player.user.first_name} {obj.player.user.last_name[0]}."
     
     def get_team_side(self, obj):
-        game = obj.game
-        return "home_team" if obj.team == game.home_team else "away_team"
+        return "home_team" if obj.team_id == obj.game.home_team_id else "away_team"
 
 
 class GameCurrentPlayersSerializer(serializers.ModelSerializer):
@@ -325,15 +384,84 @@ class GameCurrentPlayersSerializer(serializers.ModelSerializer):
         model = Game
         fields = ["id", "current_period", "home_players", "away_players"]
 
+    def _slots(self, obj):
+        """Both teams' on-court slots, loaded in a single query"""
+        if not hasattr(obj, "_current_slots"):
+            obj._current_slots = list(
+                obj.on_court.select_related("player__user", "position").order_by("pk")
+            )
+        return obj._current_slots
+
     def get_home_players(self, obj):
-        players = obj.get_current_players(obj.home_team)
+        players = [slot for slot in self._slots(obj) if slot.team_id == obj.home_team_id]
         return CurrentPlayerSerializer(players, many=True, context=self.context).data
 
     def get_away_players(self, obj):
-        players = obj.get_current_players(obj.away_team)
+        players = [slot for slot in self._slots(obj) if slot.team_id == obj.away_team_id]
         return CurrentPlayerSerializer(players, many=True, context=self.context).data
 
 
+class PlayerGameLogSerializer(serializers.ModelSerializer):
+    game = serializers.IntegerField(source="game_id")
+    team = serializers.IntegerField(source="team_id")
+    season = serializers.IntegerField(source="season_id")
+    home = serializers.SerializerMethodField()
+    opponent = serializers.SerializerMethodField()
+    team_score = serializers.SerializerMethodField()
+    opponent_score = serializers.SerializerMethodField()
+    result = serializers.SerializerMethodField()
+    base_stats = serializers.SerializerMethodField()
+    calculated_stats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlayerGameLog
+        fields = [
+            "game",
+            "date",
+            "season",
+            "team",
+            "home",
+            "opponent",
+            "team_score",
+            "opponent_score",
+            "result",
+            "points",
+            "base_stats",
+            "calculated_stats",
+        ]
+
+    def get_home(self, obj):
+        return obj.team_id == obj.game.home_team_id
+
+    def get_opponent(self, obj):
+        opponent = obj.game.away_team if self.get_home(obj) else obj.game.home_team
+        return {"id": opponent.id, "name": opponent.name}
+
+    def get_team_score(self, obj):
+        game = obj.game
+        return game.home_team_score if self.get_home(obj) else game.away_team_score
+
+    def get_opponent_score(self, obj):
+        game = obj.game
+        return game.away_team_score if self.get_home(obj) else game.home_team_score
+
+    def get_result(self, obj):
+        scored, conceded = self.get_team_score(obj), self.get_opponent_score(obj)
+        return "W" if scored > conceded else "L" if scored < conceded else "T"
+
+    def _box(self, obj):
+        if not hasattr(obj, "_box"):
+            plan = StatPlan.for_sport(obj.game.sport_id)
+            obj._box = plan.box(plan.base_counts(obj.stats))
+        return obj._box
+
+    def get_base_stats(self, obj):
+        return self._box(obj)[0]
+
+    def get_calculated_stats(self, obj):
+        return self._box(obj)[1]
+
+
 class StartingLineupSerializer(serializers.ModelSerializer):
     player_name = serializers.CharField(
         source="player.user.get_full_name", read_only=True
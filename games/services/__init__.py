@@ -1 +1,13 @@
-from .stats import PlayerStatsSummaryService, RecordingService, TeamStatsSummaryService
\ No newline at end of file
+from .stat_plan import StatPlan
+from .cache import SummaryCache
+from .results import ResultLedger
+from .roster import RosterState
+from .leaders import SeasonLeaders
+from .career import PlayerCareerService
+from .snapshots import GameArchive
+from .stats import (
+    BatchRecordingService,
+    PlayerStatsSummaryService,
+    RecordingService,
+    TeamStatsSummaryService,
+)
@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the vectorized engine
+    np = None
+
+
+class BoxScoreEngine:
+    """Evaluate a StatPlan for each player or team, one dict at a time"""
+
+    def __init__(self, plan, periods):
+        self.plan = plan
+        self.periods = list(periods)
+
+    def summarize(self, keys, rows):
+        """Box score per key.
+
+        ``rows`` yields (key, period, stat_type_id, count); rows for unknown
+        keys, periods or non-base stat types are ignored.
+        """
+        counts = {
+            key: {p: dict.fromkeys(self.plan.base_abbrevs, 0) for p in self.periods}
+            for key in keys
+        }
+        for key, period, stat_type_id, count in rows:
+            node = self.plan.by_id.get(stat_type_id)
+            if key in counts and period in counts[key] and node and node.is_base:
+                counts[key][period][node.abbreviation] += count
+
+        return {key: self.plan.summarize(periods) for key, periods in counts.items()}
+
+
+class VectorizedBoxScoreEngine(BoxScoreEngine):
+    """Evaluate a StatPlan over every player/team and period at once.
+
+    Counts are loaded into an int32 array shaped (keys, periods, base stats).
+    Sum composites are one matrix product against the plan's composite
+    membership matrix, percentages are masked divisions and points are a
+    dot product with the point-value vector. Output matches BoxScoreEngine.
+    """
+
+    def __init__(self, plan, periods):
+        if np is None:
+            raise ImproperlyConfigured(
+                "The vectorized box-score engine requires numpy to be installed"
+            )
+        super().__init__(plan, periods)
+
+        base_index = {abbr: i for i, abbr in enumerate(plan.base_abbrevs)}
+        sum_index = {
+            node.abbreviation: i for i, node in enumerate(plan.sum_composites)
+        }
+        self.stat_index = {
+            node.id: base_index[node.abbreviation] for node in plan.base
+        }
+
+        # Membership of base stats in each sum composite, with nested sums
+        # expanded (plan.order lists components before their composites)
+        self.membership = np.zeros((len(base_index), len(sum_index)), dtype=np.int32)
+        for node in plan.order:
+            if node.abbreviation not in sum_index:
+                continue
+            column = sum_index[node.abbreviation]
+            for component in plan.sum_inputs[node.abbreviation]:
+                if component in base_index:
+                    self.membership[base_index[component], column] += 1
+                elif component in sum_index:
+                    self.membership[:, column] += self.membership[
+                        :, sum_index[component]
+                    ]
+
+        # Percentage inputs as columns of the (base + sum) value matrix
+        value_index = {
+            **base_index,
+            **{abbr: len(base_index) + i for abbr, i in sum_index.items()},
+        }
+        self.pct_made = []
+        self.pct_att = []
+        self.pct_misses = []
+        self.pct_columns = []
+        for i, node in enumerate(plan.pct_composites):
+            inputs = plan.pct_inputs.get(node.abbreviation)
+            if not inputs or inputs[0] not in value_index or inputs[1] not in value_index:
+                continue
+            made, att, misses = inputs
+            self.pct_columns.append(i)
+            self.pct_made.append(value_index[made])
+            self.pct_att.append(value_index[att])
+            self.pct_misses.append(misses)
+        self.pct_misses = np.array(self.pct_misses, dtype=bool)
+
+        calc_abbrevs = [node.abbreviation for node in plan.sum_composites]
+        calc_abbrevs += [node.abbreviation for node in plan.pct_composites]
+        all_abbrevs = plan.base_abbrevs + calc_abbrevs
+        point_values = dict(plan.scoring)
+        self.point_vector = np.array(
+            [point_values.get(abbr, 0) for abbr in all_abbrevs], dtype=np.float64
+        )
+        self.integral_points = all(
+            abbr not in plan.pct_abbrevs for abbr, _ in plan.scoring
+        )
+
+        visible = [abbr not in plan.counter_abbrevs for abbr in all_abbrevs]
+        self.base_keys = [
+            (i, abbr)
+            for i, abbr in enumerate(plan.base_abbrevs)
+            if visible[i]
+        ]
+        offset = len(plan.base_abbrevs)
+        self.calc_keys = [
+            (i, abbr, abbr in plan.pct_abbrevs)
+            for i, abbr in enumerate(calc_abbrevs)
+            if visible[offset + i]
+        ]
+
+    def _evaluate(self, counts):
+        """Return (calculated, points) for a (..., base stats) count array"""
+        sums = counts @ self.membership
+        pcts = np.zeros(counts.shape[:-1] + (len(self.plan.pct_composites),))
+        if self.pct_columns:
+            values = np.concatenate([counts, sums], axis=-1).astype(np.float64)
+            made = values[..., self.pct_made]
+            att = values[..., self.pct_att] + np.where(self.pct_misses, made, 0)
+            ratio = np.divide(made, att, out=np.zeros_like(made), where=att > 0) * 100
+            pcts[..., self.pct_columns] = ratio
+        calculated = np.concatenate([sums.astype(np.float64), pcts], axis=-1)
+        everything = np.concatenate([counts.astype(np.float64), calculated], axis=-1)
+        return calculated, everything @ self.point_vector
+
+    def _stats(self, counts, calculated):
+        base = {abbr: counts[i] for i, abbr in self.base_keys}
+        calc = {
+            abbr: round(calculated[i], 1) if is_pct else int(calculated[i])
+            for i, abbr, is_pct in self.calc_keys
+        }
+        return base, calc
+
+    def summarize(self, keys, rows):
+        keys = list(keys)
+        key_index = {key: i for i, key in enumerate(keys)}
+        period_index = {period: i for i, period in enumerate(self.periods)}
+
+        counts = np.zeros(
+            (len(keys), len(self.periods), len(self.plan.base_abbrevs)), dtype=np.int32
+        )
+        k_idx, p_idx, s_idx, values = [], [], [], []
+        for key, period, stat_type_id, count in rows:
+            if key in key_index and period in period_index and stat_type_id in self.stat_index:
+                k_idx.append(key_index[key])
+                p_idx.append(period_index[period])
+                s_idx.append(self.stat_index[stat_type_id])
+                values.append(count)
+        if values:
+            np.add.at(counts, (k_idx, p_idx, s_idx), values)
+
+        calculated, points = self._evaluate(counts)
+        totals = counts.sum(axis=1)
+        total_calculated, _ = self._evaluate(totals)
+        if self.integral_points:
+            points = np.rint(points).astype(np.int64)
+
+        counts, calculated, points = counts.tolist(), calculated.tolist(), points.tolist()
+        totals, total_calculated = totals.tolist(), total_calculated.tolist()
+
+        summaries = {}
+        for k, key in enumerate(keys):
+            periods_out = []
+            for p, period in enumerate(self.periods):
+                base, calc = self._stats(counts[k][p], calculated[k][p])
+                periods_out.append(
+                    {
+                        "period": period,
+                        "base_stats": base,
+                        "calculated_stats": calc,
+                        "points": points[k][p],
+                    }
+                )
+            total_base, total_calc = self._stats(totals[k], total_calculated[k])
+            summaries[key] = {
+                "periods": periods_out,
+                "total_points": sum(p["points"] for p in periods_out),
+                "total_stats": {
+                    "base_stats": total_base,
+                    "calculated_stats": total_calc,
+                },
+            }
+        return summaries
+
+
+ENGINES = {
+    "python": BoxScoreEngine,
+    "numpy": VectorizedBoxScoreEngine,
+}
+
+
+def get_box_score_engine(plan, periods):
+    name = getattr(settings, "GAMES_SUMMARY_ENGINE", "python")
+    try:
+        engine = ENGINES[name]
+    except KeyError:
+        raise ImproperlyConfigured(f"Unknown GAMES_SUMMARY_ENGINE {name!r}")
+    return engine(plan, periods)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import caches
+from games.models import Game
+
+
+class SummaryCache:
+    """Computed game summaries keyed by (game, event version, team filter).
+
+    A new stat, substitution or period bumps Game.event_version, so stale
+    entries are never read again and simply age out of the cache. Summaries
+    of completed games are kept without expiry.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "GAMES_SUMMARY_CACHE", "default")]
+
+    @staticmethod
+    def key(kind, game, team_filter=None):
+        return f"games:summary:{kind}:{game.pk}:{game.event_version}:{team_filter or 'all'}"
+
+    def get_or_compute(self, kind, game, compute, team_filter=None):
+        key = self.key(kind, game, team_filter)
+        data = self.cache.get(key)
+        if data is None:
+            data = compute()
+            timeout = (
+                None
+                if game.status == Game.Status.COMPLETED
+                else getattr(settings, "GAMES_SUMMARY_CACHE_TIMEOUT", 300)
+            )
+            self.cache.set(key, data, timeout)
+        return data
@@ -0,0 +1,110 @@
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast
+from games.models import PlayerGameLog, PlayerSeasonStat
+from .stat_plan import StatPlan
+
+
+class PlayerCareerService:
+    """Season-by-season and career lines for one player.
+
+    Games, points and per-game averages are SQL aggregates over the
+    player's PlayerGameLog rows, and stat totals come from the
+    PlayerSeasonStat rollup, so the cost does not grow with the number of
+    games played. Career lines cover league seasons; games outside a
+    season only show up in the game log.
+    """
+
+    def __init__(self, player):
+        self.player = player
+
+    def _logs(self):
+        return PlayerGameLog.objects.filter(player=self.player, season__isnull=False)
+
+    def _line(self, plan, games, total_points, points_per_game, stats):
+        """``stats`` yields (stat_type_id, total, per_game)"""
+        totals, per_game = {}, {}
+        for stat_type_id, total, average in stats:
+            node = plan.by_id.get(stat_type_id)
+            if node is not None and node.is_base:
+                totals[stat_type_id] = total
+                per_game[node.abbreviation] = round(average or 0, 1)
+        base, calculated = plan.box(plan.base_counts(totals))
+        return {
+            "games": games,
+            "points": total_points or 0,
+            "points_per_game": round(points_per_game or 0, 1),
+            "base_stats": base,
+            "per_game": {abbr: per_game[abbr] for abbr in base if abbr in per_game},
+            "calculated_stats": calculated,
+        }
+
+    def seasons(self):
+        seasons = list(
+            self._logs()
+            .values(
+                "season_id",
+                "season__year",
+                "season__league_id",
+                "season__league__name",
+                "season__league__sport_id",
+            )
+            .annotate(
+                games=Count("id"), total_points=Sum("points"), points_per_game=Avg("points")
+            )
+            .order_by("season__year", "season_id")
+        )
+        season_games = (
+            self._logs()
+            .filter(season_id=OuterRef("season_id"))
+            .values("season_id")
+            .annotate(games=Count("id"))
+            .values("games")
+        )
+        stats = {}
+        for season_id, stat_type_id, total, per_game in (
+            PlayerSeasonStat.objects.filter(player=self.player)
+            .annotate(per_game=Cast(F("total"), FloatField()) / Subquery(season_games))
+            .values_list("season_id", "stat_type_id", "total", "per_game")
+        ):
+            stats.setdefault(season_id, []).append((stat_type_id, total, per_game))
+
+        return [
+            {
+                "season_id": season["season_id"],
+                "year": season["season__year"],
+                "league_id": season["season__league_id"],
+                "league_name": season["season__league__name"],
+                **self._line(
+                    StatPlan.for_sport(season["season__league__sport_id"]),
+                    season["games"],
+                    season["total_points"],
+                    season["points_per_game"],
+                    stats.get(season["season_id"], ()),
+                ),
+            }
+            for season in seasons
+        ]
+
+    def career(self):
+        totals = self._logs().aggregate(
+            games=Count("id"), total_points=Sum("points"), points_per_game=Avg("points")
+        )
+        stats = ()
+        if totals["games"]:
+            stats = (
+                PlayerSeasonStat.objects.filter(player=self.player)
+                .values("stat_type_id")
+                .annotate(
+                    career_total=Sum("total"),
+                    per_game=Cast(Sum("total"), FloatField()) / Value(totals["games"]),
+                )
+                .values_list("stat_type_id", "career_total", "per_game")
+            )
+        return self._line(StatPlan.for_sport(self.player.sport_id), **totals, stats=stats)
+
+    def get_summary(self):
+        return {
+            "player_id": self.player.pk,
+            "seasons": self.seasons(),
+            "career": self.career(),
+        }
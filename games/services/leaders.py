@@ -0,0 +1,193 @@
+from collections import Counter
+from django.conf import settings
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+from rest_framework.exceptions import ValidationError
+from games.models import PlayerGameLog, PlayerSeasonStat
+from .stat_plan import StatPlan
+
+POINTS = "points"
+PLAYER_FIELDS = (
+    "player_id",
+    "player__user__first_name",
+    "player__user__last_name",
+    "player__team_id",
+    "player__team__name",
+)
+
+
+def _positive_int(value, name, default):
+    if value in (None, ""):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise ValidationError({name: "Must be a positive integer"})
+    return value
+
+
+class SeasonLeaders:
+    """Season leaderboards read from the PlayerSeasonStat rollup.
+
+    A base stat is one indexed ORDER BY total DESC LIMIT n. Sum composites
+    and points weight their base stats per player in one grouped query;
+    percentage composites divide made by attempts the same way and only
+    rank players with at least ``min_attempts`` attempts. Games played
+    count the player's PlayerGameLog rows in the season.
+    """
+
+    def __init__(self, season, limit=None, min_attempts=None):
+        self.season = season
+        self.plan = StatPlan.for_sport(season.league.sport_id)
+        self.limit = _positive_int(limit, "limit", 10)
+        self.min_attempts = _positive_int(
+            min_attempts, "min_attempts", getattr(settings, "GAMES_LEADERS_MIN_ATTEMPTS", 10)
+        )
+        self.by_abbrev = {
+            node.abbreviation: node for node in self.plan.stats if node.abbreviation
+        }
+
+    def stats(self):
+        """Abbreviations with a leaderboard, points first"""
+        visible = [
+            node.abbreviation
+            for node in self.plan.stats
+            if node.abbreviation and node.abbreviation not in self.plan.counter_abbrevs
+        ]
+        return ([POINTS] if self.plan.scoring else []) + visible
+
+    def all(self):
+        return {abbr: self.leaders(abbr) for abbr in self.stats()}
+
+    def leaders(self, abbr):
+        if abbr == POINTS:
+            return self._weighted(self._points_weights())
+        node = self.by_abbrev.get(abbr)
+        if node is None:
+            raise ValidationError({"stat": f"Unknown stat {abbr!r}"})
+        if node.is_base:
+            return self._base(node)
+        if abbr in self.plan.pct_inputs:
+            return self._percentage(*self.plan.pct_inputs[abbr])
+        if abbr in self.plan.sum_inputs:
+            return self._weighted(self._weights(abbr))
+        return []
+
+    def _weights(self, abbr):
+        """{base stat id: multiplier} that adds up to a counting stat"""
+        node = self.by_abbrev.get(abbr)
+        if node is None:
+            return Counter()
+        if node.is_base:
+            return Counter({node.id: 1})
+        weights = Counter()
+        for component in self.plan.sum_inputs.get(abbr, ()):
+            weights.update(self._weights(component))
+        return weights
+
+    def _points_weights(self):
+        weights = Counter()
+        for abbr, value in self.plan.scoring:
+            if abbr not in self.plan.pct_abbrevs:
+                for stat_id, count in self._weights(abbr).items():
+                    weights[stat_id] += count * value
+        return weights
+
+    def _rows(self):
+        return PlayerSeasonStat.objects.filter(season=self.season)
+
+    def _games_played(self):
+        games = (
+            PlayerGameLog.objects.filter(season=self.season, player_id=OuterRef("player_id"))
+            .values("player_id")
+            .annotate(games=Count("id"))
+            .values("games")
+        )
+        return Coalesce(Subquery(games, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def _weighted_sum(weights):
+        return Sum(
+            Case(
+                *(When(stat_type_id=stat_id, then=F("total") * weight)
+                  for stat_id, weight in weights.items()),
+                default=0,
+                output_field=IntegerField(),
+            )
+        )
+
+    def _base(self, node):
+        rows = (
+            self._rows()
+            .filter(stat_type_id=node.id, total__gt=0)
+            .order_by("-total", "player_id")
+            .values(*PLAYER_FIELDS, value=F("total"), games_played=self._games_played())
+        )
+        return self._ranked(rows[: self.limit])
+
+    def _weighted(self, weights):
+        if not weights:
+            return []
+        rows = (
+            self._rows()
+            .filter(stat_type_id__in=weights)
+            .values(*PLAYER_FIELDS)
+            .annotate(value=self._weighted_sum(weights), games_played=self._games_played())
+            .filter(value__gt=0)
+            .order_by("-value", "player_id")
+        )
+        return self._ranked(rows[: self.limit])
+
+    def _percentage(self, made, attempts, attempts_are_misses):
+        made_weights = self._weights(made)
+        attempt_weights = self._weights(attempts)
+        if attempts_are_misses:
+            attempt_weights.update(made_weights)
+        if not made_weights or not attempt_weights:
+            return []
+        rows = (
+            self._rows()
+            .filter(stat_type_id__in=made_weights | attempt_weights)
+            .values(*PLAYER_FIELDS)
+            .annotate(
+                made=self._weighted_sum(made_weights),
+                attempts=self._weighted_sum(attempt_weights),
+                games_played=self._games_played(),
+            )
+            .filter(attempts__gte=self.min_attempts)
+            .annotate(value=Cast(F("made"), FloatField()) * 100 / F("attempts"))
+            .order_by("-value", "-attempts", "player_id")
+        )
+        return self._ranked(rows[: self.limit], percentage=True)
+
+    @staticmethod
+    def _ranked(rows, percentage=False):
+        leaders, rank, previous = [], 0, None
+        for position, row in enumerate(rows, start=1):
+            if row["value"] != previous:
+                rank, previous = position, row["value"]
+            leader = {
+                "rank": rank,
+                "player_id": row["player_id"],
+                "player_name": f"{row['player__user__first_name']} {row['player__user__last_name']}".strip(),
+                "team_id": row["player__team_id"],
+                "team_name": row["player__team__name"],
+                "games": row["games_played"],
+                "value": round(row["value"], 1) if percentage else row["value"],
+            }
+            if percentage:
+                leader.update(made=row["made"], attempts=row["attempts"])
+            leaders.append(leader)
+        return leaders
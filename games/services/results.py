@@ -0,0 +1,213 @@
+from collections import defaultdict
+from django.db import transaction
+from brackets.models import BracketMatch
+from games.models import Game, PlayerGameLog, PlayerSeasonStat
+from leagues.models import Season, SeasonStanding
+from teams.models import TeamRecord
+from .snapshots import GameArchive
+
+STANDING_FIELDS = SeasonStanding.objects.FIELDS
+
+
+def _diff(expected, stored):
+    return sorted(
+        (key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)),
+        key=str,
+    )
+
+
+class ResultLedger:
+    """Keep team records, season standings, player season totals, game
+    logs, box-score snapshots and bracket slots in step with game results.
+
+    A result is a Game.result_state() tuple. Any change is applied as the
+    old result's contribution taken away and the new one added, so
+    completing, correcting, moving or deleting a game share one path.
+    """
+
+    @staticmethod
+    def outcomes(state):
+        """Yield (team_id, season_id, scored, conceded) for a completed result"""
+        if state is None or state[0] != Game.Status.COMPLETED:
+            return
+        _status, season_id, home_id, away_id, home_score, away_score = state
+        yield home_id, season_id, home_score, away_score
+        yield away_id, season_id, away_score, home_score
+
+    @classmethod
+    def contributions(cls, state, sign=1, into=None):
+        """Add a result's deltas to ``into`` as (records, standings).
+
+        Records are keyed by (team_id, season_id) with season_id None for
+        the overall record and hold (wins, losses, ties); standings are
+        keyed by (season_id, team_id) in SeasonStanding FIELDS order.
+        """
+        if into is None:
+            into = (
+                defaultdict(lambda: [0, 0, 0]),
+                defaultdict(lambda: [0] * len(STANDING_FIELDS)),
+            )
+        records, standings = into
+        for team_id, season_id, scored, conceded in cls.outcomes(state):
+            outcome = (scored > conceded, scored < conceded, scored == conceded)
+            keys = [(team_id, None)]
+            if season_id is not None:
+                keys.append((team_id, season_id))
+                standing = (1, *outcome, scored, conceded)
+                row = standings[(season_id, team_id)]
+                for i, count in enumerate(standing):
+                    row[i] += sign * count
+            for key in keys:
+                for i, count in enumerate(outcome):
+                    records[key][i] += sign * count
+        return into
+
+    @classmethod
+    def apply(cls, previous, current):
+        completed = [
+            state
+            for state in (previous, current)
+            if state is not None and state[0] == Game.Status.COMPLETED
+        ]
+        if not completed or previous == current:
+            return
+
+        records, standings = cls.contributions(previous, sign=-1)
+        cls.contributions(current, into=(records, standings))
+        with transaction.atomic():
+            TeamRecord.objects.apply({key: tuple(delta) for key, delta in records.items()})
+            SeasonStanding.objects.apply(
+                {key: tuple(delta) for key, delta in standings.items()}
+            )
+            seasons = {state[1] for state in completed if state[1] is not None}
+            if seasons:
+                Season.bump_standings_version(pk__in=seasons)
+
+    @classmethod
+    def record(cls, game):
+        """Apply the change since the game's result was loaded or last recorded.
+
+        The current result is read back from the locked row; Game.save and
+        update_scores take the lock before writing and load the previous
+        result from the row, so concurrent writers apply each change once.
+        """
+        with transaction.atomic():
+            previous = getattr(game, "_loaded_result", None)
+            current = Game.stored_result(game.pk) or game.result_state()
+            cls.apply(previous, current)
+            PlayerSeasonStat.objects.move_game(game.pk, previous, current)
+            PlayerGameLog.objects.move_game(game.pk, previous, current)
+            GameArchive.move_game(game, previous, current)
+            if current != previous:
+                BracketMatch.objects.advance(game.pk, current)
+        game._loaded_result = current
+
+    @classmethod
+    def remove(cls, game):
+        cls.apply(cls.loaded(game), None)
+
+    @classmethod
+    def remove_players(cls, game):
+        """Take a game out of the player totals before its stat lines go"""
+        PlayerSeasonStat.objects.move_game(game.pk, cls.loaded(game), None)
+
+    @staticmethod
+    def loaded(game):
+        return getattr(game, "_loaded_result", None) or game.result_state()
+
+    @classmethod
+    def expected(cls):
+        """(records, standings) recomputed from every completed game"""
+        into = None
+        games = Game.objects.filter(status=Game.Status.COMPLETED)
+        for state in games.values_list(*Game.RESULT_FIELDS).iterator():
+            into = cls.contributions(state, into=into)
+        if into is None:
+            return {}, {}
+        records, standings = into
+        return (
+            {key: tuple(value) for key, value in records.items() if any(value)},
+            {key: tuple(value) for key, value in standings.items() if any(value)},
+        )
+
+    @classmethod
+    def check(cls):
+        """Keys whose stored record, standing, player total or game log differs
+        from a recompute"""
+        records, standings = cls.expected()
+        stored_records = {
+            (team_id, season_id): (wins, losses, ties)
+            for team_id, season_id, wins, losses, ties in TeamRecord.objects.values_list(
+                "team_id", "season_id", "wins", "losses", "ties"
+            )
+            if wins or losses or ties
+        }
+        stored_standings = {
+            (season_id, team_id): tuple(values)
+            for season_id, team_id, *values in SeasonStanding.objects.values_list(
+                "season_id", "team_id", *STANDING_FIELDS
+            )
+            if any(values)
+        }
+        player_stats = PlayerSeasonStat.objects.expected()
+        stored_player_stats = {
+            (season_id, player_id, stat_type_id): (total, games)
+            for season_id, player_id, stat_type_id, total, games in (
+                PlayerSeasonStat.objects.values_list(
+                    "season_id", "player_id", "stat_type_id", "total", "games"
+                )
+            )
+            if total or games
+        }
+        game_logs = {
+            key: (log.team_id, log.season_id, log.points, log.stats)
+            for key, log in PlayerGameLog.objects.expected(Game.objects.all()).items()
+        }
+        stored_game_logs = {
+            (player_id, game_id): tuple(values)
+            for player_id, game_id, *values in PlayerGameLog.objects.values_list(
+                "player_id", "game_id", "team_id", "season_id", "points", "stats"
+            )
+        }
+        return (
+            _diff(records, stored_records),
+            _diff(standings, stored_standings),
+            _diff(player_stats, stored_player_stats),
+            _diff(game_logs, stored_game_logs),
+        )
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every team record, standing, player total and game log"""
+        records, standings = cls.expected()
+        with transaction.atomic():
+            TeamRecord.objects.all().delete()
+            TeamRecord.objects.bulk_create(
+                (
+                    TeamRecord(
+                        team_id=team_id,
+                        season_id=season_id,
+                        wins=wins,
+                        losses=losses,
+                        ties=ties,
+                    )
+                    for (team_id, season_id), (wins, losses, ties) in records.items()
+                ),
+                batch_size=1000,
+            )
+            SeasonStanding.objects.all().delete()
+            SeasonStanding.objects.bulk_create(
+                (
+                    SeasonStanding(
+                        season_id=season_id,
+                        team_id=team_id,
+                        **dict(zip(STANDING_FIELDS, values)),
+                    )
+                    for (season_id, team_id), values in standings.items()
+                ),
+                batch_size=1000,
+            )
+            player_stats = PlayerSeasonStat.objects.rebuild()
+            game_logs = PlayerGameLog.objects.rebuild()
+            Season.bump_standings_version()
+        return len(records), len(standings), player_stats, game_logs
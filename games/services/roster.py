@@ -0,0 +1,33 @@
+from games.models import OnCourtSlot
+
+
+class RosterState:
+    """Who is on court for both teams of a game, read in one query.
+
+    Backed by the OnCourtSlot rows kept up to date by the lineup and
+    substitution signals, so players subbed out and back in any number of
+    times need no replay.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.on_court = dict(
+            self.slots(game).values_list("player_id", "team_id")
+        )
+
+    @staticmethod
+    def slots(game):
+        return OnCourtSlot.objects.filter(game=game)
+
+    def in_game(self, player):
+        return player.team_id in (self.game.home_team_id, self.game.away_team_id)
+
+    def is_active(self, player):
+        return player.pk in self.on_court
+
+    def active_ids(self, team_id=None):
+        return {
+            player_id
+            for player_id, team in self.on_court.items()
+            if team_id is None or team == team_id
+        }
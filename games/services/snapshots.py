@@ -0,0 +1,115 @@
+from games.models import Game, GameSnapshot, StartingLineup
+from .stats import PlayerStatsSummaryService, TeamStatsSummaryService
+
+
+def _completed(state):
+    return state is not None and state[0] == Game.Status.COMPLETED
+
+
+class GameArchive:
+    """Box-score snapshots of completed games.
+
+    A snapshot holds the final score, both stat summaries and the starting
+    lineups. It is taken when a game is completed and again when a
+    correction changes its stats or result, so reading a finished game is
+    a single row fetch instead of the summary and lineup queries.
+    """
+
+    @staticmethod
+    def lineups(game):
+        sides = {"home": [], "away": []}
+        rows = StartingLineup.objects.filter(game=game).values(
+            "player_id",
+            "player__user__first_name",
+            "player__user__last_name",
+            "team_id",
+            "team__name",
+            "position_id",
+        )
+        for row in rows:
+            side = "home" if row["team_id"] == game.home_team_id else "away"
+            sides[side].append({
+                "player": row["player_id"],
+                "player_name": f"{row['player__user__first_name']} {row['player__user__last_name']}".strip(),
+                "team": row["team_id"],
+                "team_name": row["team__name"],
+                "position": row["position_id"],
+                "team_side": side,
+            })
+        return {
+            "home_starting_lineup": sides["home"],
+            "away_starting_lineup": sides["away"],
+        }
+
+    @classmethod
+    def build(cls, game):
+        game = Game.objects.select_related("home_team", "away_team").get(pk=game.pk)
+        winner = game.winner
+        return {
+            "game": {
+                "id": game.pk,
+                "sport": game.sport_id,
+                "league": game.league_id,
+                "season": game.season_id,
+                "date": game.date,
+                "location": game.location,
+                "status": game.status,
+                "home_team": {"id": game.home_team_id, "name": game.home_team.name},
+                "away_team": {"id": game.away_team_id, "name": game.away_team.name},
+                "home_team_score": game.home_team_score,
+                "away_team_score": game.away_team_score,
+                "winner": winner.pk if winner else None,
+                "periods": game.current_period,
+                "started_at": game.started_at,
+                "ended_at": game.ended_at,
+                "duration": game.duration,
+            },
+            "team_stats": TeamStatsSummaryService(game.pk).get_summary(),
+            "player_stats": PlayerStatsSummaryService(game.pk).get_summary(),
+            "lineups": cls.lineups(game),
+        }
+
+    @classmethod
+    def take(cls, game):
+        return GameSnapshot.objects.store(game.pk, cls.build(game))
+
+    @classmethod
+    def move_game(cls, game, previous, current):
+        """Take, retake or drop a game's snapshot after a result change"""
+        if previous == current:
+            return
+        if _completed(current):
+            cls.take(game)
+        elif _completed(previous):
+            GameSnapshot.objects.filter(game_id=game.pk).delete()
+
+    @staticmethod
+    def stored(game_id):
+        """Payload of a game's current snapshot, or None"""
+        snapshot = GameSnapshot.objects.current().filter(game_id=game_id).first()
+        return snapshot.payload if snapshot else None
+
+    @classmethod
+    def payload(cls, game):
+        """Payload of a completed game, taken now if missing or outdated.
+
+        Games completed before snapshots existed get theirs on first read;
+        load games with select_related("snapshot") to read it in the same row.
+        """
+        if game.status != Game.Status.COMPLETED:
+            return None
+        try:
+            snapshot = game.snapshot
+        except GameSnapshot.DoesNotExist:
+            snapshot = None
+        if snapshot is None or not snapshot.is_current:
+            snapshot = cls.take(game)
+        return snapshot.payload
+
+    @staticmethod
+    def player_stats(payload, team_filter=None):
+        """The snapshot's player summary, narrowed like PlayerStatsSummaryService"""
+        team = payload["game"].get(team_filter) if team_filter in ("home_team", "away_team") else None
+        if team is None:
+            return payload["player_stats"]
+        return [player for player in payload["player_stats"] if player["team_id"] == team["id"]]
@@ -0,0 +1,297 @@
+import threading
+import uuid
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from sports.models import SportStatType
+
+
+@dataclass(frozen=True)
+class StatNode:
+    id: int
+    name: str
+    abbreviation: str
+    point_value: int
+    is_counter: bool
+    is_negative: bool
+    calculation_type: str
+    related_stat_id: int
+    components: tuple = ()
+
+    @property
+    def is_base(self):
+        return not self.components
+
+
+class StatPlan:
+    """Compiled evaluation plan for one sport's stat types.
+
+    Base stats are plain event counts. Sum composites add up their base and
+    sum components; percentage composites divide a made component by an
+    attempt (``*AT``) or miss (``*MS``) component. Composites are kept in
+    dependency order so nested composites always see their inputs, and
+    everything is resolved once so evaluating a box score costs no queries.
+
+    Compiled plans are kept per process under a version token held in the
+    GAMES_STAT_PLAN_CACHE cache; invalidating a sport replaces its token, so
+    every process sharing that cache recompiles on its next lookup.
+    """
+
+    _plans = {}
+    _lock = threading.Lock()
+
+    def __init__(self, sport_id, nodes):
+        self.sport_id = sport_id
+        self.stats = list(nodes)
+        self.by_id = {node.id: node for node in self.stats}
+        # Stats without an abbreviation can't be named as components
+        by_abbrev = {node.abbreviation: node for node in self.stats if node.abbreviation}
+
+        self.base = [node for node in self.stats if node.is_base]
+        self.base_ids = [node.id for node in self.base]
+        self.base_keys = {str(stat_id) for stat_id in self.base_ids}
+        self.base_abbrevs = [node.abbreviation for node in self.base]
+        self.sum_composites = self._composites(SportStatType.CALULATION_TYPE.SUM)
+        self.pct_composites = self._composites(SportStatType.CALULATION_TYPE.PERCENTAGE)
+        self.calc_abbrevs = [
+            node.abbreviation for node in self.sum_composites + self.pct_composites
+        ]
+        self.pct_abbrevs = {node.abbreviation for node in self.pct_composites}
+        self.counter_abbrevs = {
+            node.abbreviation for node in self.stats if node.is_counter
+        }
+        self.scoring = [
+            (node.abbreviation, node.point_value)
+            for node in self.stats
+            if node.point_value
+        ]
+
+        # Sum composites only add up counts; percentages are not additive
+        self.sum_inputs = {
+            node.abbreviation: [
+                c
+                for c in node.components
+                if c in by_abbrev
+                and by_abbrev[c].calculation_type != SportStatType.CALULATION_TYPE.PERCENTAGE
+            ]
+            for node in self.sum_composites
+        }
+        self.pct_inputs = {}
+        for node in self.pct_composites:
+            inputs = self._resolve_pct(node)
+            if inputs:
+                self.pct_inputs[node.abbreviation] = inputs
+
+        self.order = self._toposort(by_abbrev)
+        self.pairs = self._pair()
+
+    def _composites(self, calculation_type):
+        return [
+            node
+            for node in self.stats
+            if node.components
+            and node.abbreviation
+            and node.calculation_type == calculation_type
+        ]
+
+    def _pair(self):
+        """Map each stat id to its made/miss counterpart.
+
+        A stat pairs with its related stat or, failing that, with the
+        lowest-id stat that names it as related.
+        """
+        referrers = {}
+        for node in self.stats:
+            if node.related_stat_id is not None:
+                referrers.setdefault(node.related_stat_id, node)
+        pairs = {}
+        for node in self.stats:
+            if node.related_stat_id is not None:
+                pair = self.by_id.get(node.related_stat_id)
+            else:
+                pair = referrers.get(node.id)
+            if pair is not None:
+                pairs[node.id] = pair
+        return pairs
+
+    @staticmethod
+    def _resolve_pct(node):
+        """Return (made, attempts, attempts_are_misses) or None"""
+        if len(node.components) != 2:
+            return None
+        made = next((c for c in node.components if c and c.endswith("MA")), None)
+        att = next(
+            (c for c in node.components if c and c.endswith(("AT", "MS"))), None
+        )
+        if not made or not att:
+            return None
+        return made, att, att.endswith("MS")
+
+    def _toposort(self, by_abbrev):
+        """Order calculated stats so every composite follows its components"""
+        calculated = {
+            node.abbreviation for node in self.sum_composites + self.pct_composites
+        }
+        order, state = [], {}
+
+        def visit(abbr):
+            if state.get(abbr):
+                return  # done, or a cycle we refuse to follow
+            state[abbr] = "visiting"
+            node = by_abbrev[abbr]
+            for component in node.components:
+                if component in calculated:
+                    visit(component)
+            state[abbr] = "done"
+            order.append(node)
+
+        for abbr in self.calc_abbrevs:
+            visit(abbr)
+        return order
+
+    @classmethod
+    def compile(cls, sport_id):
+        stats = SportStatType.objects.filter(sport_id=sport_id).order_by("pk")
+        through = SportStatType.composite_stats.through
+        links = through.objects.filter(
+            from_sportstattype__sport_id=sport_id
+        ).order_by("pk")
+
+        rows = list(stats.values())
+        abbrevs = {row["id"]: row["abbreviation"] for row in rows}
+        components = {}
+        for from_id, to_id in links.values_list(
+            "from_sportstattype_id", "to_sportstattype_id"
+        ):
+            components.setdefault(from_id, []).append(abbrevs.get(to_id))
+
+        nodes = [
+            StatNode(
+                id=row["id"],
+                name=row["name"],
+                abbreviation=row["abbreviation"],
+                point_value=row["point_value"],
+                is_counter=row["is_counter"],
+                is_negative=row["is_negative"],
+                calculation_type=row["calculation_type"],
+                related_stat_id=row["related_stat_id"],
+                components=tuple(components.get(row["id"], ())),
+            )
+            for row in rows
+        ]
+        return cls(sport_id, nodes)
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, "GAMES_STAT_PLAN_CACHE", "default")]
+
+    @staticmethod
+    def _version_key(sport_id):
+        return f"games:stat_plan:{sport_id or 'all'}"
+
+    @classmethod
+    def version(cls, sport_id):
+        """Shared (all sports, this sport) version tokens"""
+        keys = [cls._version_key(None), cls._version_key(sport_id)]
+        tokens = cls._cache().get_many(keys)
+        return tuple(tokens.get(key) for key in keys)
+
+    @classmethod
+    def for_sport(cls, sport_id):
+        version = cls.version(sport_id)
+        cached = cls._plans.get(sport_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        plan = cls.compile(sport_id)
+        with cls._lock:
+            cls._plans[sport_id] = (version, plan)
+        return plan
+
+    @classmethod
+    def invalidate(cls, sport_id=None):
+        with cls._lock:
+            if sport_id is None:
+                cls._plans.clear()
+            else:
+                cls._plans.pop(sport_id, None)
+        # Other processes must not recompile before the change is visible
+        key = cls._version_key(sport_id)
+        transaction.on_commit(lambda: cls._cache().set(key, uuid.uuid4().hex, None))
+
+    def base_counts(self, by_id):
+        """{base abbreviation: count} from counts keyed by stat type id"""
+        counts = dict.fromkeys(self.base_abbrevs, 0)
+        for stat_id, count in by_id.items():
+            node = self.by_id.get(int(stat_id))
+            if node is not None and node.is_base:
+                counts[node.abbreviation] += count
+        return counts
+
+    def evaluate(self, counts):
+        """Calculated stats for a {base abbreviation: count} mapping"""
+        values = dict(counts)
+        for node in self.order:
+            abbr = node.abbreviation
+            if abbr in self.sum_inputs:
+                values[abbr] = sum(values.get(c, 0) for c in self.sum_inputs[abbr])
+            elif abbr in self.pct_inputs:
+                made_abbr, att_abbr, misses = self.pct_inputs[abbr]
+                made = values.get(made_abbr, 0)
+                att = values.get(att_abbr, 0) + (made if misses else 0)
+                values[abbr] = round((made / att) * 100, 1) if att else 0.0
+            else:
+                values[abbr] = 0.0
+        return {abbr: values[abbr] for abbr in self.calc_abbrevs}
+
+    def points(self, counts, calculated):
+        return sum(
+            (counts.get(abbr, 0) + calculated.get(abbr, 0)) * value
+            for abbr, value in self.scoring
+        )
+
+    def _visible(self, counts, calculated):
+        base = {k: v for k, v in counts.items() if k not in self.counter_abbrevs}
+        calc = {
+            k: v if k in self.pct_abbrevs else int(v)
+            for k, v in calculated.items()
+            if k not in self.counter_abbrevs
+        }
+        return base, calc
+
+    def box(self, counts):
+        """(base stats, calculated stats) shown for a {base abbreviation: count} dict"""
+        return self._visible(counts, self.evaluate(counts))
+
+    def summarize(self, periods):
+        """Box score for one player or team.
+
+        ``periods`` maps period number to a {base abbreviation: count} dict.
+        Totals are evaluated on the summed counts, so percentages come from
+        the combined made/attempt values rather than an average of periods.
+        """
+        periods_out = []
+        totals = dict.fromkeys(self.base_abbrevs, 0)
+        for period, counts in periods.items():
+            calculated = self.evaluate(counts)
+            base, calc = self._visible(counts, calculated)
+            periods_out.append(
+                {
+                    "period": period,
+                    "base_stats": base,
+                    "calculated_stats": calc,
+                    "points": self.points(counts, calculated),
+                }
+            )
+            for abbr, count in counts.items():
+                totals[abbr] += count
+
+        total_base, total_calc = self._visible(totals, self.evaluate(totals))
+        return {
+            "periods": periods_out,
+            "total_points": sum(p["points"] for p in periods_out),
+            "total_stats": {
+                "base_stats": total_base,
+                "calculated_stats": total_calc,
+            },
+        }
@@ -1,9 +1,299 @@
-from django.db.models.signals import post_save, post_delete
+import threading
+from collections import Counter
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
-from .models import PlayerStat
+from .models import (
+    OnCourtSlot,
+    PlayerGameLog,
+    PlayerSeasonStat,
+    PlayerStat,
+    PlayerGameStatLine,
+    StartingLineup,
+    Substitution,
+)
+from games.live import publish_game_event, score_payload, stat_payload, substitution_payload
 from games.models import Game
-    
+from games.services import GameArchive, ResultLedger, StatPlan
+from sports.models import SportStatType
+
+# Fields whose change moves points between teams
+SCORING_FIELDS = {"game", "player", "stat_type"}
+# Fields that decide which box-score line a stat counts towards
+LINE_FIELDS = SCORING_FIELDS | {"period"}
+
+
+def _stat_points(stat):
+    point_value = stat.stat_type.point_value
+    return point_value if point_value > 0 else 0
+
+
+def _line_key(stat):
+    return (stat.player_id, stat.player.team_id, stat.period, stat.stat_type_id)
+
+
+# Games taken along by the delete currently running in this thread
+_deleting = threading.local()
+
+
+def _deleting_game(game_id, origin):
+    """Whether the delete started from origin takes the game, and so its
+    slots and totals, along"""
+    return getattr(_deleting, "origin", None) is origin and game_id in getattr(
+        _deleting, "games", ()
+    )
+
+
+# Completed games whose stats changed in the current transaction
+_pending = threading.local()
+
+
+def _refresh_on_commit(game_id):
+    """Refresh a completed game's score, logs and snapshot once, after commit"""
+    if not hasattr(_pending, "games"):
+        _pending.games = set()
+    _pending.games.add(game_id)
+    transaction.on_commit(_refresh_pending_games)
+
+
+def _refresh_pending_games():
+    game_ids = _pending.__dict__.pop("games", None)
+    if not game_ids:
+        return  # already refreshed by an earlier callback of this commit
+    # Deleted or reopened games drop out here
+    games = Game.objects.filter(pk__in=game_ids, status=Game.Status.COMPLETED)
+    with transaction.atomic():
+        PlayerGameLog.objects.rebuild(games)
+        for game in games:
+            # A changed score goes through ResultLedger, which retakes the snapshot
+            previous = game.result_state()
+            game.update_scores()
+            if game.result_state() == previous:
+                GameArchive.take(game)
+
+
+def _season_changes(changes, game_id, status, season_id, player_id, stat_type_id, sign):
+    """Count a stat in or out of the season totals if its game counts there"""
+    if status == Game.Status.COMPLETED and season_id is not None:
+        changes.setdefault((game_id, season_id), Counter())[(player_id, stat_type_id)] += sign
+
+
+def _apply_season_changes(changes):
+    for (game_id, season_id), counts in changes.items():
+        PlayerSeasonStat.objects.adjust(season_id, game_id, counts)
+
+
+@receiver(pre_save, sender=PlayerStat)
+def load_stored_stat(sender, instance, update_fields=None, **kwargs):
+    # An edit may move the stat off its old game, player or stat type
+    instance._stored_stat = None
+    if not instance._state.adding and (
+        update_fields is None or SCORING_FIELDS & set(update_fields)
+    ):
+        instance._stored_stat = (
+            PlayerStat.objects.filter(pk=instance.pk)
+            .values_list(
+                "game_id", "game__status", "game__season_id", "player_id", "stat_type_id"
+            )
+            .first()
+        )
+
+
+@receiver(post_save, sender=PlayerStat)
+def apply_stat_line(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        PlayerGameStatLine.objects.apply(instance.game_id, {_line_key(instance): 1})
+    elif update_fields is None or LINE_FIELDS & set(update_fields):
+        PlayerGameStatLine.objects.rebuild(instance.game_id)
+        stored = getattr(instance, "_stored_stat", None)
+        if stored and stored[0] != instance.game_id:
+            PlayerGameStatLine.objects.rebuild(stored[0])
+
+
+@receiver(post_delete, sender=PlayerStat)
+def revert_stat_line(sender, instance, **kwargs):
+    PlayerGameStatLine.objects.apply(instance.game_id, {_line_key(instance): -1})
+
+
+@receiver(post_save, sender=PlayerStat)
+def apply_stat_score(sender, instance, created, update_fields=None, **kwargs):
+    game = instance.game
+    if game.status != Game.Status.IN_PROGRESS:
+        game.bump_event_version()
+    elif created:
+        points = _stat_points(instance)
+        if points:
+            game.apply_score_delta(instance.player.team_id, points)
+        else:
+            game.bump_event_version()
+    elif update_fields is None or SCORING_FIELDS & set(update_fields):
+        # An edited stat may have changed team or value; fall back to repair
+        game.update_scores()
+    else:
+        game.bump_event_version()
+
+
+@receiver(post_delete, sender=PlayerStat)
+def revert_stat_score(sender, instance, **kwargs):
+    game = instance.game
+    points = _stat_points(instance)
+    if game.status == Game.Status.IN_PROGRESS and points:
+        game.apply_score_delta(instance.player.team_id, -points)
+    else:
+        game.bump_event_version()
+
+
+@receiver(post_save, sender=PlayerStat)
+def apply_stat_season_total(sender, instance, created, **kwargs):
+    # Stats edited after completion; the game's own moves go through ResultLedger
+    stored = None if created else getattr(instance, "_stored_stat", None)
+    if not created and not stored:
+        return
+    game, changes = instance.game, {}
+    _season_changes(
+        changes, game.pk, game.status, game.season_id, instance.player_id, instance.stat_type_id, 1
+    )
+    if stored:
+        _season_changes(changes, *stored, -1)
+    _apply_season_changes(changes)
+
+
+@receiver(post_delete, sender=PlayerStat)
+def revert_stat_season_total(sender, instance, origin=None, **kwargs):
+    if _deleting_game(instance.game_id, origin):
+        return  # ResultLedger takes the whole game out
+    game, changes = instance.game, {}
+    _season_changes(
+        changes, game.pk, game.status, game.season_id, instance.player_id, instance.stat_type_id, -1
+    )
+    _apply_season_changes(changes)
+
+
 @receiver([post_save, post_delete], sender=PlayerStat)
-def update_game_score(sender, instance, **kwargs):
-    if instance.game.status == Game.Status.IN_PROGRESS:
-        instance.game.update_scores()
\ No newline at end of file
+def refresh_completed_stats(sender, instance, origin=None, **kwargs):
+    # Stats edited after completion; the game's own moves go through ResultLedger
+    if _deleting_game(instance.game_id, origin):
+        return
+    game = instance.game
+    if game.status == Game.Status.COMPLETED:
+        _refresh_on_commit(game.pk)
+
+
+@receiver(post_save, sender=PlayerStat)
+def publish_stat(sender, instance, created, **kwargs):
+    # Sent last, once the lines and the score have moved
+    publish_game_event(
+        instance.game_id,
+        "stat" if created else "stat_changed",
+        stats=[stat_payload(instance)],
+        score=score_payload(instance.game),
+    )
+
+
+@receiver(post_delete, sender=PlayerStat)
+def publish_stat_removed(sender, instance, origin=None, **kwargs):
+    if not _deleting_game(instance.game_id, origin):
+        publish_game_event(
+            instance.game_id,
+            "stat_removed",
+            stats=[stat_payload(instance)],
+            score=score_payload(instance.game),
+        )
+
+
+@receiver([post_save, post_delete], sender=Substitution)
+def bump_substitution_version(sender, instance, **kwargs):
+    instance.game.bump_event_version()
+
+
+@receiver(post_save, sender=Substitution)
+def move_on_court_slot(sender, instance, created, **kwargs):
+    if created:
+        OnCourtSlot.objects.substitute(instance)
+    else:
+        OnCourtSlot.objects.rebuild(instance.game, instance.substitute_in.team_id)
+
+
+@receiver(post_delete, sender=Substitution)
+def restore_on_court_slots(sender, instance, origin=None, **kwargs):
+    if not _deleting_game(instance.game_id, origin):
+        OnCourtSlot.objects.rebuild(instance.game, instance.substitute_in.team_id)
+
+
+@receiver(post_save, sender=Substitution)
+def publish_substitution(sender, instance, created, **kwargs):
+    publish_game_event(
+        instance.game_id,
+        "substitution" if created else "substitution_changed",
+        substitution=substitution_payload(instance),
+    )
+
+
+@receiver(post_delete, sender=Substitution)
+def publish_substitution_undone(sender, instance, origin=None, **kwargs):
+    if not _deleting_game(instance.game_id, origin):
+        publish_game_event(
+            instance.game_id,
+            "substitution_undone",
+            substitution=substitution_payload(instance),
+        )
+
+
+@receiver(post_save, sender=StartingLineup)
+def add_starting_slot(sender, instance, created, **kwargs):
+    game = instance.game
+    if created and instance.is_starting and game.status == Game.Status.SCHEDULED:
+        OnCourtSlot.objects.create(
+            game=game,
+            team_id=instance.team_id,
+            player_id=instance.player_id,
+            position_id=instance.position_id,
+        )
+    else:
+        OnCourtSlot.objects.rebuild(game, instance.team_id)
+
+
+@receiver(post_delete, sender=StartingLineup)
+def remove_starting_slot(sender, instance, origin=None, **kwargs):
+    if _deleting_game(instance.game_id, origin):
+        return
+    game = instance.game
+    if game.status == Game.Status.SCHEDULED:
+        OnCourtSlot.objects.filter(game=game, player_id=instance.player_id).delete()
+    else:
+        OnCourtSlot.objects.rebuild(game, instance.team_id)
+
+
+@receiver(post_save, sender=Game)
+def record_game_result(sender, instance, **kwargs):
+    ResultLedger.record(instance)
+
+
+@receiver(pre_delete, sender=Game)
+def mark_deleting_game(sender, instance, origin=None, **kwargs):
+    # pre_delete is sent for every game before any row goes, so the
+    # post_delete receivers of its dependents can tell
+    if getattr(_deleting, "origin", None) is not origin:
+        _deleting.origin, _deleting.games = origin, set()
+    _deleting.games.add(instance.pk)
+
+
+@receiver(pre_delete, sender=Game)
+def remove_game_players(sender, instance, **kwargs):
+    ResultLedger.remove_players(instance)
+
+
+@receiver(post_delete, sender=Game)
+def remove_game_result(sender, instance, **kwargs):
+    ResultLedger.remove(instance)
+
+
+@receiver([post_save, post_delete], sender=SportStatType)
+def invalidate_stat_plan(sender, instance, **kwargs):
+    StatPlan.invalidate(instance.sport_id)
+
+
+@receiver(m2m_changed, sender=SportStatType.composite_stats.through)
+def invalidate_stat_plan_composites(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        StatPlan.invalidate(instance.sport_id)
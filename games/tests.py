@@ -1,3 +1,1267 @@
-from django.test import TestCase
+import asyncio
+import io
+import random
+from unittest import mock, skipIf
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from games.live import InProcessBroadcaster
+from games.models import (
+    Game,
+    GameEvent,
+    GameSnapshot,
+    OnCourtSlot,
+    PeriodCheckpoint,
+    PlayerGameStatLine,
+    PlayerSeasonStat,
+    PlayerStat,
+    StartingLineup,
+    Substitution,
+)
+from games.serializers import PlayerStatBatchSerializer, SubstitutionSerializer
+from games.services import (
+    BatchRecordingService,
+    GameArchive,
+    PlayerStatsSummaryService,
+    RecordingService,
+    ResultLedger,
+    SeasonLeaders,
+    StatPlan,
+    SummaryCache,
+    TeamStatsSummaryService,
+)
+from games.services.box_score import (
+    BoxScoreEngine,
+    VectorizedBoxScoreEngine,
+    get_box_score_engine,
+    np,
+)
+from leagues.models import League, Season, SeasonStanding
+from sports.models import Sport, SportStatType
+from teams.models import Player, Team, TeamRecord
+from users.models import User
+
+CLEAN = ([], [], [], [])
+
+
+def create_season(teams=2, players=2):
+    """A basketball season with its league, teams, players and stat types"""
+    sport = Sport.objects.create(
+        name="Basketball", max_players_per_team=12, max_players_on_field=5, has_period=True, max_period=4
+    )
+    stat = lambda **kwargs: SportStatType.objects.create(sport=sport, **kwargs)
+    made2 = stat(name="2PT Made", abbreviation="2PTMA", point_value=2)
+    miss2 = stat(name="2PT Miss", abbreviation="2PTMS", related_stat=made2)
+    made3 = stat(name="3PT Made", abbreviation="3PTMA", point_value=3)
+    miss3 = stat(name="3PT Miss", abbreviation="3PTMS", related_stat=made3)
+    rebound = stat(name="Rebound", abbreviation="REB")
+    fg_made = stat(name="FG Made", abbreviation="FGMA", calculation_type="sum")
+    fg_made.composite_stats.set([made2, made3])
+    fg_miss = stat(name="FG Miss", abbreviation="FGMS", calculation_type="sum")
+    fg_miss.composite_stats.set([miss2, miss3])
+    fg_pct = stat(name="FG Pct", abbreviation="FG_PC", calculation_type="percentage")
+    fg_pct.composite_stats.set([fg_made, fg_miss])
+
+    league = League.objects.create(name="League", sport=sport)
+    season = Season.objects.create(
+        league=league, year=2025, start_date="2025-01-01", end_date="2025-12-31"
+    )
+    team_list = []
+    for t in range(teams):
+        team = Team.objects.create(name=f"Team {t}", sport=sport)
+        league.teams.add(team)
+        team_list.append(team)
+        for j in range(players):
+            user = User.objects.create_player(
+                email=f"p{t}{j}@example.com", password="x", first_name=f"P{t}", last_name=f"N{j}"
+            )
+            Player.objects.create(user=user, team=team, jersey_number=j, sport=sport)
+    return {
+        "sport": sport,
+        "league": league,
+        "season": season,
+        "teams": team_list,
+        "base": [made2, miss2, made3, miss3, rebound],
+        "made2": made2,
+        "rebound": rebound,
+    }
+
+
+def create_game(data, **kwargs):
+    kwargs.setdefault("home_team", data["teams"][0])
+    kwargs.setdefault("away_team", data["teams"][1])
+    kwargs.setdefault("status", Game.Status.IN_PROGRESS)
+    return Game.objects.create(
+        sport=data["sport"], league=data["league"], season=data["season"], **kwargs
+    )
+
+
+def record_of(team, season=None):
+    return TeamRecord.objects.filter(team=team, season=season).values_list(
+        "wins", "losses", "ties"
+    ).first() or (0, 0, 0)
+
+
+def standing_of(team, season):
+    return SeasonStanding.objects.filter(team=team, season=season).values_list(
+        *SeasonStanding.objects.FIELDS
+    ).first() or (0,) * len(SeasonStanding.objects.FIELDS)
+
+
+class ScoreDeltaTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        self.game = create_game(self.data)
+        self.scorer = self.home.players.first()
+
+    def record(self, stat_type=None, player=None):
+        return PlayerStat.objects.create(
+            game=self.game,
+            player=player or self.scorer,
+            stat_type=stat_type or self.data["made2"],
+            period=1,
+        )
+
+    def scores(self):
+        return Game.objects.filter(pk=self.game.pk).values_list(
+            "home_team_score", "away_team_score"
+        ).get()
+
+    def test_recording_a_stat_adds_its_points(self):
+        self.record()
+        self.record(player=self.away.players.first())
+        self.record()
+        self.assertEqual(self.scores(), (4, 2))
+
+    def test_recording_does_not_aggregate_the_game(self):
+        self.record()
+        with CaptureQueriesContext(connection) as queries:
+            self.record()
+        self.assertFalse(any("SUM(" in query["sql"] for query in queries))
+        self.assertEqual(self.scores(), (4, 0))
+
+    def test_deleting_a_stat_takes_its_points_back(self):
+        stat = self.record()
+        self.record()
+        stat.delete()
+        self.assertEqual(self.scores(), (2, 0))
+
+    def test_non_scoring_stats_leave_the_score_alone(self):
+        self.record(self.data["rebound"]).delete()
+        self.assertEqual(self.scores(), (0, 0))
+
+    def test_moving_a_stat_to_the_other_team_recomputes(self):
+        stat = self.record()
+        stat.player = self.away.players.first()
+        stat.save()
+        self.assertEqual(self.scores(), (0, 2))
+
+    def test_scores_never_go_negative(self):
+        stat = self.record()
+        Game.objects.filter(pk=self.game.pk).update(home_team_score=0)
+        stat.delete()
+        self.assertEqual(self.scores(), (0, 0))
+
+
+def lines_of(game):
+    return sorted(
+        PlayerGameStatLine.objects.filter(game=game, count__gt=0).values_list(
+            "player_id", "team_id", "period", "stat_type_id", "count"
+        )
+    )
+
+
+class StatLineTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.scorer = self.data["teams"][0].players.first()
+
+    def record(self, period=1):
+        return PlayerStat.objects.create(
+            game=self.game, player=self.scorer, stat_type=self.data["made2"], period=period
+        )
+
+    def assertMatchesRebuild(self):
+        lines = lines_of(self.game)
+        PlayerGameStatLine.objects.rebuild(self.game.pk)
+        self.assertEqual(lines, lines_of(self.game))
+
+    def test_lines_count_recorded_stats(self):
+        self.record()
+        self.record()
+        stat = self.record(period=2)
+        made2 = self.data["made2"].pk
+        team = self.scorer.team_id
+        self.assertEqual(
+            lines_of(self.game),
+            [(self.scorer.pk, team, 1, made2, 2), (self.scorer.pk, team, 2, made2, 1)],
+        )
+        stat.delete()
+        self.assertEqual(lines_of(self.game), [(self.scorer.pk, team, 1, made2, 2)])
+        self.assertMatchesRebuild()
+
+    def test_editing_a_stat_moves_its_line(self):
+        stat = self.record()
+        stat.period = 3
+        stat.save()
+        self.assertEqual([line[2] for line in lines_of(self.game)], [3])
+        self.assertMatchesRebuild()
+
+    def test_summary_reads_the_lines(self):
+        self.record()
+        self.record(period=2)
+        self.game.current_period = 2
+        self.game.save(update_fields=["current_period"])
+        summary = {
+            row["jersey_number"]: row
+            for row in PlayerStatsSummaryService(self.game.pk, "home_team").get_summary()
+        }
+        self.assertEqual(summary[self.scorer.jersey_number]["total_points"], 4)
+
+
+class StatPlanTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.sport_id = self.data["sport"].pk
+
+    def test_composites_are_evaluated_in_dependency_order(self):
+        plan = StatPlan.for_sport(self.sport_id)
+        base, calculated = plan.box({"2PTMA": 3, "2PTMS": 1, "3PTMA": 1, "3PTMS": 3})
+        self.assertEqual(base["2PTMA"], 3)
+        self.assertEqual(calculated["FGMA"], 4)
+        self.assertEqual(calculated["FGMS"], 4)
+        self.assertEqual(calculated["FG_PC"], 50.0)
+
+    def test_plans_are_reused_until_a_stat_type_changes(self):
+        plan = StatPlan.for_sport(self.sport_id)
+        self.assertIs(StatPlan.for_sport(self.sport_id), plan)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SportStatType.objects.create(sport=self.data["sport"], name="Steal", abbreviation="STL")
+        plan = StatPlan.for_sport(self.sport_id)
+        self.assertIn("STL", plan.base_abbrevs)
+
+    def test_other_processes_recompile_after_invalidation(self):
+        StatPlan.for_sport(self.sport_id)
+        stale = StatPlan._plans[self.sport_id]
+        with self.captureOnCommitCallbacks(execute=True):
+            StatPlan.invalidate(self.sport_id)
+        # A process that still holds the old plan sees the new version token
+        StatPlan._plans[self.sport_id] = stale
+        self.assertIsNot(StatPlan.for_sport(self.sport_id), stale[1])
+
+
+@skipIf(np is None, "numpy is not installed")
+class BoxScoreEngineTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.plan = StatPlan.for_sport(self.data["sport"].pk)
+
+    def summaries(self, keys, rows, periods=range(1, 5)):
+        python = BoxScoreEngine(self.plan, periods).summarize(keys, rows)
+        vectorized = VectorizedBoxScoreEngine(self.plan, periods).summarize(keys, rows)
+        return python, vectorized
+
+    def test_engines_agree_on_random_games(self):
+        rng = random.Random(7)
+        base_ids = [stat.pk for stat in self.data["base"]]
+        keys = list(range(1, 13))
+        rows = [
+            (rng.choice(keys), rng.randint(1, 4), rng.choice(base_ids), rng.randint(1, 5))
+            for _ in range(300)
+        ]
+        python, vectorized = self.summaries(keys, rows)
+        self.assertEqual(python, vectorized)
+
+    def test_engines_agree_on_empty_and_ignored_rows(self):
+        made2 = self.data["made2"].pk
+        fg_pct = SportStatType.objects.get(sport=self.data["sport"], abbreviation="FG_PC").pk
+        rows = [
+            (1, 1, made2, 2),
+            (1, 9, made2, 1),  # unknown period
+            (99, 1, made2, 1),  # unknown key
+            (2, 2, fg_pct, 4),  # not a base stat
+        ]
+        python, vectorized = self.summaries([1, 2], rows)
+        self.assertEqual(python, vectorized)
+        self.assertEqual(python[1]["total_points"], 4)
+        self.assertEqual(python[2]["total_points"], 0)
+
+
+class BoxScoreEngineSettingTests(TestCase):
+    def test_python_engine_is_the_default(self):
+        plan = StatPlan(None, [])
+        self.assertIs(type(get_box_score_engine(plan, range(1, 5))), BoxScoreEngine)
+
+    @override_settings(GAMES_SUMMARY_ENGINE="numpy")
+    @skipIf(np is None, "numpy is not installed")
+    def test_numpy_engine_is_opt_in(self):
+        plan = StatPlan(None, [])
+        engine = get_box_score_engine(plan, range(1, 5))
+        self.assertIsInstance(engine, VectorizedBoxScoreEngine)
+
+
+class BatchRecordingTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        self.game = create_game(self.data, current_period=2)
+        self.scorer = self.home.players.first()
+
+    def record_batch(self, *events):
+        serializer = PlayerStatBatchSerializer(
+            data={
+                "game": self.game.pk,
+                "events": [
+                    {"player": player.pk, "stat_type": stat_type.pk, **extra}
+                    for player, stat_type, extra in events
+                ],
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        service = BatchRecordingService(serializer.validated_data)
+        service.validate()
+        return service.record()
+
+    def test_batch_applies_scores_and_lines_once(self):
+        made2, made3 = self.data["made2"], self.data["base"][2]
+        stats = self.record_batch(
+            (self.scorer, made2, {}),
+            (self.scorer, made3, {"period": 1}),
+            (self.away.players.first(), made2, {}),
+        )
+        self.assertEqual([stat.period for stat in stats], [2, 1, 2])
+
+        game = Game.objects.get(pk=self.game.pk)
+        self.assertEqual((game.home_team_score, game.away_team_score), (5, 2))
+        lines = lines_of(game)
+        PlayerGameStatLine.objects.rebuild(game.pk)
+        self.assertEqual(lines, lines_of(game))
+        game.update_scores()
+        self.assertEqual((game.home_team_score, game.away_team_score), (5, 2))
+
+    def test_counter_stats_create_their_counterpart_once(self):
+        block = SportStatType.objects.create(
+            sport=self.data["sport"], name="Block", abbreviation="BLK"
+        )
+        blocked = SportStatType.objects.create(
+            sport=self.data["sport"],
+            name="Blocked",
+            abbreviation="BLKD",
+            is_counter=True,
+            related_stat=block,
+        )
+        self.record_batch((self.scorer, blocked, {}), (self.scorer, blocked, {}))
+        self.assertEqual(PlayerStat.objects.filter(game=self.game, stat_type=block).count(), 1)
+
+        # A counterpart recorded by the batch itself is not duplicated
+        self.record_batch((self.scorer, blocked, {"period": 1}), (self.scorer, block, {"period": 1}))
+        self.assertEqual(
+            PlayerStat.objects.filter(game=self.game, stat_type=block, period=1).count(), 1
+        )
+
+    def test_invalid_events_reject_the_whole_batch(self):
+        outsider = Player.objects.create(
+            user=User.objects.create_player(email="x@example.com", password="x"),
+            team=Team.objects.create(name="Other", sport=self.data["sport"]),
+            jersey_number=9,
+            sport=self.data["sport"],
+        )
+        with self.assertRaises(ValidationError) as raised:
+            self.record_batch(
+                (self.scorer, self.data["made2"], {}),
+                (outsider, self.data["made2"], {}),
+                (self.scorer, self.data["made2"], {"period": 3}),
+            )
+        self.assertEqual(set(raised.exception.detail["events"]), {1, 2})
+        self.assertFalse(PlayerStat.objects.filter(game=self.game).exists())
+
+    def test_batch_needs_a_game_in_progress(self):
+        Game.objects.filter(pk=self.game.pk).update(status=Game.Status.SCHEDULED)
+        with self.assertRaises(ValidationError):
+            self.record_batch((self.scorer, self.data["made2"], {}))
+
+
+class LiveUpdateTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.scorer = self.data["teams"][0].players.first()
+        self.coach = User.objects.create_coach(email="coach@example.com", password="x")
+
+    def record(self, game):
+        """Record through a game instance loaded before the other writes"""
+        service = RecordingService(
+            {"game": game, "player": self.scorer, "stat_type": self.data["made2"]}
+        )
+        service.validate()
+        return service.record()
+
+    def published(self, record):
+        with mock.patch("games.live.get_broadcaster") as broadcaster:
+            with self.captureOnCommitCallbacks(execute=True):
+                record()
+        return [call.args for call in broadcaster.return_value.publish.call_args_list]
+
+    def test_broadcast_carries_the_stored_score(self):
+        # Another scorer's delta lands after this request loaded the game
+        Game.objects.filter(pk=self.game.pk).update(home_team_score=10)
+        [(game_id, event)] = self.published(lambda: self.record(self.game))
+        self.assertEqual(game_id, self.game.pk)
+        self.assertEqual(event["type"], "stat")
+        self.assertEqual(event["score"], {"home_team_score": 12, "away_team_score": 0})
+
+    def test_recording_uses_the_locked_game(self):
+        Game.objects.filter(pk=self.game.pk).update(current_period=3)
+        self.assertEqual(self.record(self.game).period, 3)
+
+        Game.objects.filter(pk=self.game.pk).update(status=Game.Status.COMPLETED)
+        with self.assertRaises(ValidationError):
+            self.record(self.game)
+
+    def test_nothing_is_broadcast_before_commit(self):
+        with mock.patch("games.live.get_broadcaster") as broadcaster:
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.record(self.game)
+            broadcaster.return_value.publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+            broadcaster.return_value.publish.assert_called_once()
+
+    def test_in_process_broadcaster_delivers_to_subscribers(self):
+        async def follow():
+            broadcaster = InProcessBroadcaster()
+            events = broadcaster.subscribe(self.game.pk, heartbeat=1)
+            self.assertIsNone(await anext(events))
+            broadcaster.publish(self.game.pk, {"seq": 1})
+            broadcaster.publish(self.game.pk + 1, {"seq": 2})
+            received = await anext(events)
+            await events.aclose()
+            return received
+
+        self.assertEqual(asyncio.run(follow()), {"seq": 1})
+
+    def test_stream_requires_game_permissions(self):
+        url = f"/api/games/{self.game.pk}/live/"
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.scorer.user))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_stream_starts_with_a_snapshot(self):
+        async def first_chunk():
+            self.async_client.cookies["access_token"] = str(AccessToken.for_user(self.coach))
+            response = await self.async_client.get(f"/api/games/{self.game.pk}/live/")
+            content = aiter(response.streaming_content)
+            try:
+                return response, await anext(content)
+            finally:
+                await content.aclose()
+
+        response, chunk = async_to_sync(first_chunk)()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(chunk.startswith(b"event: snapshot\n"))
+
+
+class GameEventTests(TestCase):
+    def setUp(self):
+        self.data = create_season(players=3)
+        self.home = self.data["teams"][0]
+        self.starter, self.other_starter, self.bench = self.home.players.order_by("pk")
+        self.game = create_game(self.data, status=Game.Status.SCHEDULED)
+        for player in (self.starter, self.other_starter):
+            StartingLineup.objects.create(game=self.game, player=player, team=self.home)
+        Game.objects.filter(pk=self.game.pk).update(status=Game.Status.IN_PROGRESS)
+        self.game.refresh_from_db()
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.token = str(AccessToken.for_user(coach))
+        self.client.cookies["access_token"] = self.token
+
+    def write_stat_and_substitution(self):
+        stat = PlayerStat.objects.create(
+            game=self.game, player=self.starter, stat_type=self.data["made2"], period=1
+        )
+        stat.player = self.other_starter
+        stat.save()
+        stat.delete()
+        Substitution.objects.create(
+            game=self.game, substitute_in=self.bench, substitute_out=self.starter, period=1
+        ).delete()
+
+    def test_plain_writes_log_events(self):
+        with mock.patch("games.live.get_broadcaster") as broadcaster:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.write_stat_and_substitution()
+        events = list(GameEvent.objects.filter(game=self.game).values_list("seq", "kind"))
+        self.assertEqual(
+            events,
+            [
+                (1, "stat"),
+                (2, "stat_changed"),
+                (3, "stat_removed"),
+                (4, "substitution"),
+                (5, "substitution_undone"),
+            ],
+        )
+        published = [call.args[1] for call in broadcaster.return_value.publish.call_args_list]
+        self.assertEqual([event["seq"] for event in published], [1, 2, 3, 4, 5])
+        self.assertEqual(published[0]["score"], {"home_team_score": 2, "away_team_score": 0})
+        self.assertEqual(published[2]["score"], {"home_team_score": 0, "away_team_score": 0})
+
+    def test_events_endpoint_replays_since(self):
+        self.write_stat_and_substitution()
+        page = self.client.get(f"/api/games/{self.game.pk}/events/?since=3").json()
+        self.assertEqual([event["seq"] for event in page["events"]], [4, 5])
+        self.assertEqual(page["last_seq"], 5)
+
+    def test_stream_replays_after_last_event_id(self):
+        self.write_stat_and_substitution()
+
+        async def first_chunk():
+            self.async_client.cookies["access_token"] = self.token
+            response = await self.async_client.get(
+                f"/api/games/{self.game.pk}/live/", headers={"Last-Event-ID": "4"}
+            )
+            content = aiter(response.streaming_content)
+            try:
+                return await anext(content)
+            finally:
+                await content.aclose()
+
+        chunk = async_to_sync(first_chunk)()
+        self.assertTrue(chunk.startswith(b"id: 5\nevent: substitution_undone\n"))
+
+    def test_deleting_a_game_logs_no_events(self):
+        PlayerStat.objects.create(
+            game=self.game, player=self.starter, stat_type=self.data["made2"], period=1
+        )
+        Substitution.objects.create(
+            game=self.game, substitute_in=self.bench, substitute_out=self.starter, period=1
+        )
+        Game.objects.get(pk=self.game.pk).delete()
+        self.assertFalse(GameEvent.objects.exists())
+
+
+class PeriodCheckpointTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.home, self.away = self.data["teams"]
+        self.scorer = self.home.players.first()
+        self.rebounder = self.away.players.first()
+
+    def stat(self, player, stat_type, period):
+        PlayerStat.objects.create(game=self.game, player=player, stat_type=stat_type, period=period)
+
+    def play_two_periods(self):
+        self.stat(self.scorer, self.data["made2"], 1)
+        self.stat(self.rebounder, self.data["rebound"], 1)
+        self.game.next_period()
+        self.stat(self.scorer, self.data["made2"], 2)
+        self.game.next_period()
+
+    def summaries(self):
+        return (
+            TeamStatsSummaryService(self.game.pk).get_summary(),
+            PlayerStatsSummaryService(self.game.pk).get_summary(),
+        )
+
+    def test_next_period_freezes_the_closed_periods(self):
+        self.play_two_periods()
+        checkpoints = PeriodCheckpoint.objects.closed(self.game)
+        self.assertEqual(sorted(checkpoints), [1, 2])
+        self.assertEqual(
+            sorted(checkpoints[1].teams),
+            sorted(
+                [
+                    [self.home.pk, self.data["made2"].pk, 1],
+                    [self.away.pk, self.data["rebound"].pk, 1],
+                ]
+            ),
+        )
+
+    def test_back_dated_stats_drop_the_period_checkpoint(self):
+        self.play_two_periods()
+        self.stat(self.scorer, self.data["made2"], 1)
+        self.assertEqual(sorted(PeriodCheckpoint.objects.closed(self.game)), [2])
+
+        self.game.next_period()
+        checkpoint = PeriodCheckpoint.objects.get(game=self.game, period=1)
+        self.assertIn([self.home.pk, self.data["made2"].pk, 2], checkpoint.teams)
+
+    def test_summaries_match_the_stat_lines(self):
+        self.play_two_periods()
+        self.stat(self.rebounder, self.data["rebound"], 3)
+        frozen = self.summaries()
+        PeriodCheckpoint.objects.invalidate(self.game.pk)
+        self.assertEqual(frozen, self.summaries())
+        self.assertEqual(frozen[0]["home_team"]["total_points"], 4)
+
+
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        SummaryCache().cache.clear()
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.scorer = self.data["teams"][0].players.first()
+
+    def summary(self):
+        return TeamStatsSummaryService(self.game.pk).get_cached_summary()
+
+    def test_summaries_are_computed_once_per_event_version(self):
+        with mock.patch.object(
+            TeamStatsSummaryService,
+            "get_summary",
+            autospec=True,
+            side_effect=TeamStatsSummaryService.get_summary,
+        ) as compute:
+            self.summary()
+            self.summary()
+            self.assertEqual(compute.call_count, 1)
+
+            PlayerStat.objects.create(
+                game=self.game, player=self.scorer, stat_type=self.data["rebound"], period=1
+            )
+            summary = self.summary()
+            self.assertEqual(compute.call_count, 2)
+        self.assertEqual(summary["home_team"]["total_stats"]["base_stats"]["REB"], 1)
+
+    def test_a_new_period_is_a_new_summary(self):
+        self.assertEqual(len(self.summary()["home_team"]["periods"]), 1)
+        Game.objects.get(pk=self.game.pk).next_period()
+        self.assertEqual(len(self.summary()["home_team"]["periods"]), 2)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.scorer = self.data["teams"][0].players.first()
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(coach))
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        tag = response["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=tag).status_code, 304)
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=tag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], tag)
+
+    def record(self):
+        PlayerStat.objects.create(
+            game=self.game, player=self.scorer, stat_type=self.data["made2"], period=1
+        )
+
+    def test_game_follows_its_stats(self):
+        self.assertRevalidates(f"/api/games/{self.game.pk}/", self.record)
+
+    def test_game_follows_its_teams(self):
+        def rename():
+            team = self.data["teams"][1]
+            team.name = "Renamed"
+            team.save()
+
+        self.assertRevalidates(f"/api/games/{self.game.pk}/", rename)
+
+    def test_summary_follows_its_stats(self):
+        url = f"/api/player-stats/team_stats_summary/?game_id={self.game.pk}"
+        self.assertRevalidates(url, self.record)
+
+
+class OnCourtSlotTests(TestCase):
+    def setUp(self):
+        self.data = create_season(players=3)
+        self.home = self.data["teams"][0]
+        self.starter, self.other_starter, self.bench = self.home.players.order_by("pk")
+        self.game = create_game(self.data, status=Game.Status.SCHEDULED)
+        for player in (self.starter, self.other_starter):
+            StartingLineup.objects.create(game=self.game, player=player, team=self.home)
+        Game.objects.filter(pk=self.game.pk).update(status=Game.Status.IN_PROGRESS)
+        self.game.refresh_from_db()
+
+    def on_court(self):
+        return set(
+            OnCourtSlot.objects.filter(game=self.game).values_list("player_id", flat=True)
+        )
+
+    def substitute(self):
+        return Substitution.objects.create(
+            game=self.game, substitute_in=self.bench, substitute_out=self.starter, period=1
+        )
+
+    def assertMatchesRebuild(self):
+        on_court = self.on_court()
+        OnCourtSlot.objects.rebuild(self.game)
+        self.assertEqual(on_court, self.on_court())
+
+    def test_starters_take_the_slots(self):
+        self.assertEqual(self.on_court(), {self.starter.pk, self.other_starter.pk})
+        self.assertMatchesRebuild()
+
+    def test_substitutions_hand_over_the_slot(self):
+        substitution = self.substitute()
+        self.assertEqual(self.on_court(), {self.bench.pk, self.other_starter.pk})
+        self.assertMatchesRebuild()
+
+        substitution.delete()
+        self.assertEqual(self.on_court(), {self.starter.pk, self.other_starter.pk})
+
+    def test_current_players_read_the_slots(self):
+        self.substitute()
+        with self.assertNumQueries(1):
+            players = [slot.player_id for slot in self.game.get_current_players(self.home)]
+        self.assertEqual(set(players), {self.bench.pk, self.other_starter.pk})
+
+    def test_deleting_what_owns_the_game_leaves_no_slots(self):
+        self.substitute()
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.data["season"].delete()
+        connection.check_constraints()
+        self.assertFalse(
+            any('INSERT INTO "games_oncourtslot"' in query["sql"] for query in queries)
+        )
+        self.assertFalse(OnCourtSlot.objects.exists())
+
+
+class SubstitutionValidationTests(TestCase):
+    def setUp(self):
+        self.data = create_season(players=3)
+        self.home, self.away = self.data["teams"]
+        self.starter, self.other_starter, self.bench = self.home.players.order_by("pk")
+        self.game = create_game(self.data, status=Game.Status.SCHEDULED)
+        for player in (self.starter, self.other_starter):
+            StartingLineup.objects.create(game=self.game, player=player, team=self.home)
+        Game.objects.filter(pk=self.game.pk).update(status=Game.Status.IN_PROGRESS)
+
+    def serializer(self, sub_in, sub_out, period=1):
+        return SubstitutionSerializer(
+            data={
+                "game": self.game.pk,
+                "substitute_in": sub_in.pk,
+                "substitute_out": sub_out.pk,
+                "period": period,
+            }
+        )
+
+    def errors(self, *args):
+        serializer = self.serializer(*args)
+        self.assertFalse(serializer.is_valid())
+        return serializer.errors["non_field_errors"]
+
+    def test_bench_player_replaces_a_starter(self):
+        self.assertTrue(self.serializer(self.bench, self.starter).is_valid())
+
+    def test_invalid_substitutions(self):
+        self.assertEqual(
+            self.errors(self.starter, self.bench), ["Substitute out player is not active"]
+        )
+        self.assertEqual(
+            self.errors(self.other_starter, self.starter), ["Substitute in player is already active"]
+        )
+        self.assertEqual(
+            self.errors(self.away.players.first(), self.starter),
+            ["Players must be from the same team"],
+        )
+        self.assertEqual(
+            self.errors(self.bench, self.starter, 2), ["Cannot substitute in future period"]
+        )
+
+    def test_validation_does_not_replay_substitutions(self):
+        def queries():
+            with CaptureQueriesContext(connection) as captured:
+                self.assertTrue(self.serializer(self.bench, self.starter).is_valid())
+            return len(captured)
+
+        before = queries()
+        for sub_in, sub_out in [(self.bench, self.starter), (self.starter, self.bench)] * 3:
+            Substitution.objects.create(
+                game=self.game, substitute_in=sub_in, substitute_out=sub_out, period=1
+            )
+        self.assertEqual(queries(), before)
+
+    def test_active_players_leave_out_those_subbed_out(self):
+        Substitution.objects.create(
+            game=self.game, substitute_in=self.bench, substitute_out=self.starter, period=1
+        )
+        game = Game.objects.get(pk=self.game.pk)
+        active = set(Player.objects.active_in_game(game).filter(team=self.home))
+        self.assertEqual(active, {self.other_starter, self.bench})
+        self.assertEqual(set(Player.objects.on_court(game)), {self.other_starter, self.bench})
+
+
+class RecordableStatsTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data, current_period=3)
+        self.url = f"/api/player-stats/recordable_stats/?game_id={self.game.pk}"
+
+    def test_buttons_carry_their_pairs(self):
+        buttons = {row["abbreviation"]: row for row in self.client.get(self.url).json()}
+        self.assertEqual(set(buttons), {"2PTMA", "2PTMS", "3PTMA", "3PTMS", "REB"})
+        self.assertEqual(buttons["2PTMS"]["button_type"], "miss")
+        self.assertEqual(buttons["2PTMS"]["paired_stat_abbrev"], "2PTMA")
+        self.assertEqual(buttons["2PTMA"]["button_type"], "made")
+        self.assertEqual(buttons["2PTMA"]["paired_stat_abbrev"], "2PTMS")
+        self.assertEqual(buttons["REB"]["button_type"], "info")
+        self.assertIsNone(buttons["REB"]["paired_stat_id"])
+        self.assertEqual({row["current_period"] for row in buttons.values()}, {3})
+
+    def test_compiled_plan_leaves_one_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class GameListTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        Sport.objects.filter(pk=self.data["sport"].pk).update(max_players_on_field=2)
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(coach))
+
+    def add_game(self, starters=()):
+        game = create_game(self.data, status=Game.Status.SCHEDULED)
+        for player in starters:
+            StartingLineup.objects.create(game=game, player=player, team=player.team)
+        return game
+
+    def games(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/games/")
+        return {game["id"]: game for game in response.json()["results"]}, len(queries)
+
+    def test_lineup_status_comes_from_annotations(self):
+        ready = self.add_game(self.home.players.all())
+        empty = self.add_game()
+        games, _ = self.games()
+        self.assertEqual(
+            games[ready.pk]["lineup_status"], {"home_ready": True, "away_ready": False}
+        )
+        self.assertEqual(
+            games[empty.pk]["lineup_status"], {"home_ready": False, "away_ready": False}
+        )
+
+    def test_queries_do_not_grow_with_the_page(self):
+        self.add_game(self.home.players.all())
+        _, few = self.games()
+        for _ in range(4):
+            self.add_game(self.away.players.all())
+        games, many = self.games()
+        self.assertEqual(len(games), 5)
+        self.assertEqual(many, few)
+
+
+class TeamRecordTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        self.season = self.data["season"]
+
+    def completed(self, home_score=3, away_score=1):
+        return create_game(
+            self.data,
+            status=Game.Status.COMPLETED,
+            home_team_score=home_score,
+            away_team_score=away_score,
+        )
+
+    def test_completing_a_game_records_the_result(self):
+        game = create_game(self.data)
+        scorer = self.home.players.first()
+        for _ in range(2):
+            PlayerStat.objects.create(
+                game=game, player=scorer, stat_type=self.data["made2"], period=1
+            )
+        Game.objects.get(pk=game.pk).complete_game()
+
+        self.assertEqual(record_of(self.home), (1, 0, 0))
+        self.assertEqual(record_of(self.home, self.season), (1, 0, 0))
+        self.assertEqual(record_of(self.away), (0, 1, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_saving_a_completed_game_again_does_not_double_count(self):
+        game = self.completed()
+        game.save()
+        Game.objects.get(pk=game.pk).save(update_fields=["status"])
+
+        self.assertEqual(record_of(self.home), (1, 0, 0))
+        self.assertEqual(record_of(self.away, self.season), (0, 1, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_score_correction_moves_the_result(self):
+        game = self.completed()
+        game.home_team_score, game.away_team_score = 2, 2
+        game.save()
+
+        self.assertEqual(record_of(self.home), (0, 0, 1))
+        self.assertEqual(record_of(self.away, self.season), (0, 0, 1))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_recompleting_a_reopened_game(self):
+        game = self.completed()
+        game.status = Game.Status.IN_PROGRESS
+        game.save()
+        self.assertEqual(record_of(self.home), (0, 0, 0))
+
+        game.away_team_score = 5
+        game.save(update_fields=["away_team_score"])
+        game.complete_game()
+        self.assertEqual(record_of(self.home), (0, 1, 0))
+        self.assertEqual(record_of(self.away, self.season), (1, 0, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_moving_a_game_to_another_season(self):
+        game = self.completed()
+        other = Season.objects.create(
+            league=self.data["league"], year=2026, start_date="2026-01-01", end_date="2026-12-31"
+        )
+        game.season = other
+        game.save()
+
+        self.assertEqual(record_of(self.home, self.season), (0, 0, 0))
+        self.assertEqual(record_of(self.home, other), (1, 0, 0))
+        self.assertEqual(record_of(self.home), (1, 0, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_deleting_a_game_removes_the_result(self):
+        game = self.completed()
+        self.completed(0, 2)
+        Game.objects.get(pk=game.pk).delete()
+
+        self.assertEqual(record_of(self.home), (0, 1, 0))
+        self.assertEqual(record_of(self.away), (1, 0, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_team_records_read_the_table(self):
+        self.completed()
+        team = Team.objects.get(pk=self.home.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(team.get_record(), {"win": 1, "loss": 0, "win_percentage": 1.0})
+
+    def test_rebuild_repairs_drifted_records(self):
+        self.completed()
+        TeamRecord.objects.filter(team=self.home).update(wins=5)
+        self.assertEqual(len(ResultLedger.check()[0]), 2)
+
+        call_command("rebuild_results", stdout=io.StringIO())
+        self.assertEqual(record_of(self.home), (1, 0, 0))
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+
+class SeasonStandingTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.home, self.away = self.data["teams"]
+        self.season = self.data["season"]
+
+    def completed(self, home_score=3, away_score=1):
+        return create_game(
+            self.data,
+            status=Game.Status.COMPLETED,
+            home_team_score=home_score,
+            away_team_score=away_score,
+        )
+
+    def assertMatchesRecompute(self):
+        season = Season.objects.get(pk=self.season.pk)
+        self.assertEqual(season.standings(), season.compute_standings())
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_completed_games_update_the_rows(self):
+        self.completed()
+        self.completed(0, 2)
+        self.assertEqual(standing_of(self.home, self.season), (2, 1, 1, 0, 3, 3))
+        self.assertEqual(standing_of(self.away, self.season), (2, 1, 1, 0, 3, 3))
+        self.assertMatchesRecompute()
+
+    def test_corrections_reopening_and_deletes_move_the_rows(self):
+        game = self.completed()
+        game.home_team_score, game.away_team_score = 2, 2
+        game.save()
+        self.assertEqual(standing_of(self.home, self.season), (1, 0, 0, 1, 2, 2))
+
+        game.status = Game.Status.IN_PROGRESS
+        game.save()
+        self.assertEqual(standing_of(self.home, self.season), (0,) * 6)
+
+        other = self.completed(1, 4)
+        Game.objects.get(pk=other.pk).delete()
+        self.assertEqual(standing_of(self.away, self.season), (0,) * 6)
+        self.assertMatchesRecompute()
+
+    def test_result_changes_bump_the_standings_version(self):
+        version = self.season.standings_version
+        game = self.completed()
+        self.season.refresh_from_db()
+        self.assertGreater(self.season.standings_version, version)
+
+        version = self.season.standings_version
+        game.location = "Elsewhere"
+        game.save()
+        self.season.refresh_from_db()
+        self.assertEqual(self.season.standings_version, version)
+
+    def test_standings_read_the_rows(self):
+        self.completed()
+        season = Season.objects.get(pk=self.season.pk)
+        with self.assertNumQueries(3):
+            season.standings()
+
+
+class ListPaginationTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data, current_period=2)
+        self.scorer = self.data["teams"][0].players.first()
+        for period in (1, 1, 2, 2, 2):
+            PlayerStat.objects.create(
+                game=self.game, player=self.scorer, stat_type=self.data["made2"], period=period
+            )
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(coach))
+
+    def pages(self, url):
+        ids = []
+        while url:
+            page = self.client.get(url).json()
+            ids.extend(row["id"] for row in page["results"])
+            url = page["next"]
+        return ids
+
+    def test_stats_page_newest_first(self):
+        ids = self.pages("/api/player-stats/?page_size=2")
+        newest_first = PlayerStat.objects.order_by("-timestamp", "-id")
+        self.assertEqual(ids, list(newest_first.values_list("id", flat=True)))
+
+    def test_stats_filters(self):
+        ids = self.pages(f"/api/player-stats/?game_id={self.game.pk}&period=2")
+        self.assertEqual(len(ids), 3)
+        response = self.client.get("/api/player-stats/?period=first")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("period", response.json())
+
+    def test_games_filter_by_status_and_date(self):
+        dated = create_game(self.data, status=Game.Status.COMPLETED, date="2025-03-01T12:00:00Z")
+        create_game(self.data, status=Game.Status.COMPLETED, date="2025-05-01T12:00:00Z")
+        self.assertEqual(
+            self.pages("/api/games/?status=completed&date_to=2025-04-01T00:00:00Z"), [dated.pk]
+        )
+        # Undated games page by their creation time
+        self.assertEqual(len(self.pages("/api/games/?page_size=1")), 3)
+
+    def test_only_the_targeted_lists_are_paginated(self):
+        self.assertEqual(len(self.pages("/api/teams/?page_size=1")), 2)
+        self.assertIsInstance(self.client.get("/api/sports/").json(), list)
+
+
+class PlayerSeasonStatTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.season = self.data["season"]
+        self.scorer, self.teammate = self.data["teams"][0].players.all()
+
+    def play(self, *stats):
+        """Complete a game with (player, stat type) stats"""
+        game = create_game(self.data)
+        for player, stat_type in stats:
+            PlayerStat.objects.create(game=game, player=player, stat_type=stat_type, period=1)
+        game.complete_game()
+        return game
+
+    def totals(self):
+        return {
+            (season_id, player_id, stat_type_id): (total, games)
+            for season_id, player_id, stat_type_id, total, games in (
+                PlayerSeasonStat.objects.values_list(
+                    "season_id", "player_id", "stat_type_id", "total", "games"
+                )
+            )
+            if total or games
+        }
+
+    def test_completed_games_roll_up(self):
+        made2, rebound = self.data["made2"], self.data["rebound"]
+        self.play((self.scorer, made2), (self.scorer, made2))
+        self.play((self.scorer, made2), (self.scorer, rebound))
+        self.assertEqual(self.totals()[(self.season.pk, self.scorer.pk, made2.pk)], (3, 2))
+        self.assertEqual(self.totals(), PlayerSeasonStat.objects.expected())
+
+    def test_edits_to_completed_games_apply_a_delta(self):
+        made2, rebound = self.data["made2"], self.data["rebound"]
+        for _ in range(3):
+            self.play((self.scorer, made2))
+        game = self.play((self.scorer, made2), (self.teammate, rebound))
+
+        def edit(change):
+            with CaptureQueriesContext(connection) as captured:
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+            self.assertEqual(self.totals(), PlayerSeasonStat.objects.expected())
+            # No season-wide recompute
+            rebuilds = [
+                query["sql"]
+                for query in captured.captured_queries
+                if query["sql"].startswith("DELETE") and "playerseasonstat" in query["sql"]
+            ]
+            self.assertEqual(rebuilds, [])
+
+        edit(
+            lambda: PlayerStat.objects.create(
+                game=game, player=self.teammate, stat_type=made2, period=2
+            )
+        )
+        stat = PlayerStat.objects.get(game=game, period=2)
+
+        def move():
+            stat.player = self.scorer
+            stat.save()
+
+        edit(move)
+        self.assertEqual(self.totals()[(self.season.pk, self.scorer.pk, made2.pk)], (5, 4))
+        edit(lambda: PlayerStat.objects.get(game=game, stat_type=rebound).delete())
+        self.assertNotIn((self.season.pk, self.teammate.pk, rebound.pk), self.totals())
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_leaders_count_games_played(self):
+        made2, rebound = self.data["made2"], self.data["rebound"]
+        self.play((self.scorer, made2), (self.scorer, made2))
+        self.play((self.scorer, rebound))
+        leaders = SeasonLeaders(Season.objects.get(pk=self.season.pk))
+        [leader] = leaders.leaders("2PTMA")
+        self.assertEqual((leader["value"], leader["games"]), (2, 2))
+        [leader] = leaders.leaders("points")
+        self.assertEqual((leader["value"], leader["games"]), (4, 2))
+
+
+class GameArchiveTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.scorer = self.data["teams"][0].players.first()
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(coach))
+
+    def play(self, points=1):
+        game = create_game(self.data)
+        for _ in range(points):
+            PlayerStat.objects.create(
+                game=game, player=self.scorer, stat_type=self.data["made2"], period=1
+            )
+        game.complete_game()
+        return game
+
+    def test_completing_a_game_takes_the_snapshot(self):
+        game = self.play(2)
+        payload = GameArchive.stored(game.pk)
+        self.assertEqual(payload["game"]["home_team_score"], 4)
+        self.assertEqual(payload["team_stats"]["home_team"]["total_points"], 4)
+        live = TeamStatsSummaryService(game.pk).get_summary()
+        self.assertEqual(
+            payload["team_stats"]["home_team"]["total_stats"], live["home_team"]["total_stats"]
+        )
+        response = self.client.get(f"/api/games/{game.pk}/snapshot/")
+        self.assertEqual(response.json()["game"]["home_team_score"], 4)
+
+    def test_reopening_a_game_drops_the_snapshot(self):
+        game = self.play()
+        game.status = Game.Status.IN_PROGRESS
+        game.save()
+        self.assertFalse(GameSnapshot.objects.filter(game=game).exists())
+
+    def test_outdated_snapshots_are_retaken_on_read(self):
+        game = self.play()
+        GameSnapshot.objects.filter(game=game).update(version=0)
+        self.assertIsNone(GameArchive.stored(game.pk))
+        self.client.get(f"/api/games/{game.pk}/snapshot/")
+        self.assertEqual(GameSnapshot.objects.get(game=game).version, GameSnapshot.VERSION)
+
+    def test_archive_reads_one_row_per_game(self):
+        def queries():
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get("/api/games/archive/")
+            self.assertEqual(response.status_code, 200)
+            return len(captured)
+
+        self.play()
+        one = queries()
+        for _ in range(3):
+            self.play()
+        self.assertEqual(queries(), one)
+        self.assertEqual(len(self.client.get("/api/games/archive/").json()["results"]), 4)
+
+
+class CompletedGameStatTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.game = create_game(self.data)
+        self.scorer = self.data["teams"][0].players.first()
+        for _ in range(3):
+            PlayerStat.objects.create(
+                game=self.game, player=self.scorer, stat_type=self.data["made2"], period=1
+            )
+        self.game.complete_game()
+
+    def test_deleting_a_stat_recomputes_score_and_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerStat.objects.filter(game=self.game).first().delete()
+
+        game = Game.objects.get(pk=self.game.pk)
+        payload = GameArchive.stored(game.pk)
+        self.assertEqual(game.home_team_score, 4)
+        self.assertEqual(payload["game"]["home_team_score"], 4)
+        self.assertEqual(payload["team_stats"]["home_team"]["total_points"], 4)
+        self.assertEqual(standing_of(self.data["teams"][0], self.data["season"])[4], 4)
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_bulk_delete_retakes_the_snapshot_once(self):
+        with mock.patch.object(GameArchive, "take", wraps=GameArchive.take) as take:
+            with self.captureOnCommitCallbacks(execute=True):
+                PlayerStat.objects.filter(game=self.game).delete()
+            self.assertEqual(take.call_count, 1)
+
+        self.assertEqual(GameArchive.stored(self.game.pk)["game"]["home_team_score"], 0)
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+
+class CascadeDeleteTests(TestCase):
+    """Deleting what owns a completed game takes its derived rows along"""
+
+    def setUp(self):
+        self.data = create_season()
+        game = create_game(self.data)
+        for player in Player.objects.filter(team__in=self.data["teams"]):
+            for stat_type in (self.data["made2"], self.data["rebound"]):
+                PlayerStat.objects.create(game=game, player=player, stat_type=stat_type, period=1)
+        game.complete_game()
+        self.assertTrue(GameSnapshot.objects.filter(game=game).exists())
+
+    def assertDeleted(self, obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.delete()
+        connection.check_constraints()
+        self.assertFalse(Game.objects.exists())
+        self.assertFalse(GameSnapshot.objects.exists())
+        self.assertEqual(ResultLedger.check(), CLEAN)
+
+    def test_delete_season(self):
+        self.assertDeleted(self.data["season"])
+
+    def test_delete_team(self):
+        self.assertDeleted(self.data["teams"][0])
+
+    def test_delete_league(self):
+        self.assertDeleted(self.data["league"])
+
+    def test_delete_sport(self):
+        self.assertDeleted(self.data["sport"])
@@ -1,6 +1,6 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import PlayerStatViewSet, GameViewSet, SubstitutionViewSet
+from .views import PlayerStatViewSet, GameViewSet, SubstitutionViewSet, game_live_updates
 
 router = DefaultRouter()
 router.register(r'player-stats', PlayerStatViewSet, basename='stats')
@@ -8,5 +8,6 @@ router.register(r'games', GameViewSet, basename='game')
 router.register(r'substitutions', SubstitutionViewSet, basename='substitution')
 
 urlpatterns = [
+    path('games/<int:pk>/live/', game_live_updates, name='game-live'),
     path('', include(router.urls)),
 ] 
\ No newline at end of file
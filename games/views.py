@@ -1,16 +1,20 @@
+import json
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.request import Request
 from rest_framework.response import Response
 from django.db import transaction
-from rest_framework.exceptions import ValidationError
-from django.db.models import Value, IntegerField
-from .models import Game, PlayerStat, Substitution
-from teams.models import Player
-from sports.models import SportStatType
+from django.db.models import FilteredRelation, Q
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from .models import Game, GameEvent, PlayerStat, Substitution
+from teams.models import Player, TeamRecord
 from .serializers import (
     GameSerializer,
     GameActionSerializer,
     PlayerStatRecordSerializer,
+    PlayerStatBatchSerializer,
     RecordableStatSerializer,
     PlayerStatSerializer,
     GamePlayerSerializer,
@@ -19,12 +23,24 @@ from .serializers import (
     GameCurrentPlayersSerializer,
 )
 from sports_management.permissions import IsAdminOrCoachUser
-from .services import PlayerStatsSummaryService, RecordingService, TeamStatsSummaryService
+from sports_management.conditional import etag
+from sports_management.pagination import GamePagination, RecentFirstPagination
+from .live import get_broadcaster
+from .services import (
+    BatchRecordingService,
+    GameArchive,
+    PlayerStatsSummaryService,
+    RecordingService,
+    StatPlan,
+    TeamStatsSummaryService,
+)
 
 
 class PlayerStatViewSet(viewsets.ModelViewSet):
     queryset = PlayerStat.objects.select_related("player__team", "game", "stat_type")
     serializer_class = PlayerStatSerializer
+    pagination_class = RecentFirstPagination
+    query_filters = {"game_id": "game_id", "player_id": "player_id", "period": "period"}
 
     @action(detail=False, methods=["get"])
     def recordable_stats(self, request):
@@ -33,17 +49,18 @@ class PlayerStatViewSet(viewsets.ModelViewSet):
             return Response({"error": "game_id parameter required"}, status=400)
 
         try:
-            game = Game.objects.get(pk=game_id)
-            stats = SportStatType.objects.filter(
-                sport=game.sport, composite_stats__isnull=True
-            ).annotate(
-                current_period=Value(game.current_period, output_field=IntegerField())
-            )
-            serializer = RecordableStatSerializer(stats, many=True)
-            return Response(serializer.data)
+            game = Game.objects.only("sport_id", "current_period").get(pk=game_id)
         except Game.DoesNotExist:
             return Response({"error": "Game not found"}, status=404)
 
+        plan = StatPlan.for_sport(game.sport_id)
+        serializer = RecordableStatSerializer(
+            plan.base,
+            many=True,
+            context={"plan": plan, "current_period": game.current_period},
+        )
+        return Response(serializer.data)
+
     @action(detail=False, methods=["post"])
     def record(self, request):
         serializer = PlayerStatRecordSerializer(data=request.data)
@@ -53,43 +70,131 @@ class PlayerStatViewSet(viewsets.ModelViewSet):
         stat = service.record()
         return Response(PlayerStatSerializer(stat).data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"])
+    def record_batch(self, request):
+        serializer = PlayerStatBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        service = BatchRecordingService(serializer.validated_data)
+        service.validate()
+        stats = service.record()
+        return Response(
+            PlayerStatSerializer(stats, many=True).data, status=status.HTTP_201_CREATED
+        )
+
+    def _summary_etag(self, request):
+        game_id = request.query_params.get("game_id")
+        if not game_id or not game_id.isdigit():
+            return None
+        version = Game.event_version_of(game_id)
+        if version is None:
+            return None
+        team = request.query_params.get("team") or "all"
+        return f"{request.path}:{game_id}:{team}:{version}"
+
     @action(detail=False, methods=["get"])
+    @etag(_summary_etag)
     def player_stats_summary(self, request):
         game_id = request.query_params.get("game_id")
         team   = request.query_params.get("team")
         if not game_id:
             return Response({"error": "game_id parameter required"}, status=400)
+        snapshot = GameArchive.stored(game_id) if game_id.isdigit() else None
+        if snapshot is not None:
+            return Response(GameArchive.player_stats(snapshot, team))
         try:
             service = PlayerStatsSummaryService(game_id=game_id, team_filter=team)
         except Game.DoesNotExist:
             return Response({"error": "Game not found"}, status=404)
-        data = service.get_summary()
+        data = service.get_cached_summary()
         return Response(data)
     
     @action(detail=False, methods=["get"])
+    @etag(_summary_etag)
     def team_stats_summary(self, request):
         game_id = request.query_params.get("game_id")
         if not game_id:
             return Response({"error": "game_id parameter required"}, status=400)
+        snapshot = GameArchive.stored(game_id) if game_id.isdigit() else None
+        if snapshot is not None:
+            return Response(snapshot["team_stats"])
         try:
             service = TeamStatsSummaryService(game_id=game_id)
         except Game.DoesNotExist:
             return Response({"error": "Game not found"}, status=404)
-        data = service.get_summary()
+        data = service.get_cached_summary()
         return Response(data)
 
 
 class GameViewSet(viewsets.ModelViewSet):
-    queryset = Game.objects.select_related(
-        "sport", "home_team", "away_team"
-    ).prefetch_related(
-        "starting_lineup__player__user",
-        "starting_lineup__position",
-        "substitutions__substitute_in__user",
-        "substitutions__substitute_out__user",
+    queryset = (
+        Game.objects.select_related("sport", "home_team", "away_team")
+        .prefetch_related(
+            "home_team__coach",
+            "away_team__coach",
+            TeamRecord.objects.prefetch_overall("home_team__records"),
+            TeamRecord.objects.prefetch_overall("away_team__records"),
+        )
+        .with_lineup_counts()
+        .with_sort_date()
     )
     serializer_class = GameSerializer
     permission_classes = [IsAdminOrCoachUser]
+    pagination_class = GamePagination
+    query_filters = {
+        "sport_id": "sport_id",
+        "season_id": "season_id",
+        "status": "status",
+        "date_from": "date__gte",
+        "date_to": "date__lte",
+    }
+
+    def get_queryset(self):
+        if self.action == "current_players":
+            return Game.objects.all()  # slots carry everything the panel needs
+        if self.action in ("snapshot", "archive"):
+            # One row per game; the snapshot carries the box score
+            return (
+                Game.objects.filter(status=Game.Status.COMPLETED)
+                .select_related("snapshot")
+                .with_sort_date()
+            )
+        return super().get_queryset()
+
+    def _game_etag(self, request, pk=None):
+        """Covers the game and the nested teams with their overall records"""
+        overall = {
+            f"{side}_overall": FilteredRelation(
+                f"{side}_team__records",
+                condition=Q(**{f"{side}_team__records__season__isnull": True}),
+            )
+            for side in ("home", "away")
+        }
+        state = (
+            Game.objects.filter(pk=pk)
+            .annotate(**overall)
+            .values_list(
+                "event_version",
+                "updated_at",
+                "home_team__updated_at",
+                "away_team__updated_at",
+                "home_overall__wins",
+                "home_overall__losses",
+                "away_overall__wins",
+                "away_overall__losses",
+            )
+            .first()
+        )
+        if state is None:
+            return None
+        version, updated_at, home_updated_at, away_updated_at, *records = state
+        timestamps = ":".join(
+            str(value.timestamp()) for value in (updated_at, home_updated_at, away_updated_at)
+        )
+        return f"game:{pk}:{version}:{timestamps}:{'-'.join(str(n or 0) for n in records)}"
+
+    @etag(_game_etag)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=True, methods=["post"])
     def manage(self, request, pk=None):
@@ -110,6 +215,39 @@ class GameViewSet(viewsets.ModelViewSet):
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=["get"])
+    def events(self, request, pk=None):
+        """Play-by-play events after the ``since`` sequence number, oldest first"""
+        if Game.event_version_of(pk) is None:
+            raise Http404("Game not found")
+        try:
+            since = int(request.query_params.get("since") or 0)
+            limit = min(int(request.query_params.get("limit") or 200), 500)
+        except ValueError:
+            return Response({"error": "since and limit must be integers"}, status=400)
+        if since < 0 or limit < 1:
+            return Response({"error": "since and limit must be positive"}, status=400)
+
+        events = [event.as_payload() for event in GameEvent.objects.since(pk, since)[:limit]]
+        return Response(
+            {
+                "events": events,
+                "last_seq": events[-1]["seq"] if events else since,
+                "has_more": len(events) == limit,
+            }
+        )
+
+    @action(detail=True, methods=["get"])
+    def snapshot(self, request, pk=None):
+        """Final box score of a completed game"""
+        return Response(GameArchive.payload(self.get_object()))
+
+    @action(detail=False, methods=["get"])
+    def archive(self, request):
+        """Box scores of completed games, latest first"""
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response([GameArchive.payload(game) for game in page])
+
     @action(detail=True, methods=["post"])
     def update_scores(self, request, pk=None):
         game = self.get_object()
@@ -213,6 +351,7 @@ class GameViewSet(viewsets.ModelViewSet):
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            game.bump_event_version()
 
             try:
                 self._validate_lineup_completeness(game)
@@ -274,6 +413,7 @@ class GameViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         count, _ = game.starting_lineup.all().delete()
+        game.bump_event_version()
         return Response({"deleted": count}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -283,15 +423,88 @@ class SubstitutionViewSet(viewsets.ModelViewSet):
     )
     serializer_class = SubstitutionSerializer
     permission_classes = [IsAdminOrCoachUser]
-
-    def get_queryset(self):
-        game_id = self.request.query_params.get("game_id")
-        if game_id:
-            return self.queryset.filter(game_id=game_id)
-        return self.queryset
+    pagination_class = RecentFirstPagination
+    query_filters = {"game_id": "game_id", "period": "period"}
 
     @action(detail=True, methods=["post"])
     def undo(self, request, pk=None):
         substitution = self.get_object()
-        substitution.delete()
+        self.perform_destroy(substitution)
         return Response({"status": "Substitution undone"}, status=status.HTTP_200_OK)
+
+
+def _live_access_denied(request):
+    """Apply GameViewSet's authentication and permissions to a plain request.
+
+    Returns an error response, or None when the request may follow the game.
+    """
+    view = GameViewSet(action="retrieve", format_kwarg=None)
+    request = Request(request, authenticators=view.get_authenticators())
+    view.request = request
+    try:
+        if all(permission.has_permission(request, view) for permission in view.get_permissions()):
+            return None
+    except AuthenticationFailed as exc:
+        detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+    if not request.user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    return JsonResponse(
+        {"detail": "You do not have permission to perform this action."},
+        status=status.HTTP_403_FORBIDDEN,
+    )
+
+
+def _sse(event):
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def game_live_updates(request, pk):
+    """Server-Sent Events stream of score, period, substitution and stat deltas.
+
+    Events carry their seq as the SSE id; a reconnecting client that sends
+    Last-Event-ID gets the events it missed instead of a fresh snapshot.
+    Access is checked like the other game endpoints.
+    """
+    denied = await sync_to_async(_live_access_denied)(request)
+    if denied is not None:
+        return denied
+    snapshot = Game.objects.filter(pk=pk).values(
+        "id",
+        "status",
+        "current_period",
+        "home_team_score",
+        "away_team_score",
+        "event_version",
+        "event_seq",
+    )
+    if not await snapshot.aexists():
+        raise Http404("Game not found")
+    last_event_id = request.headers.get("Last-Event-ID", "")
+
+    async def stream():
+        events = get_broadcaster().subscribe(pk)
+        try:
+            await anext(events)  # subscribed; nothing published from here is lost
+            seen = int(last_event_id) if last_event_id.isdigit() else 0
+            if seen:
+                async for event in GameEvent.objects.since(pk, seen):
+                    seen = event.seq
+                    yield _sse(event.as_payload())
+            else:
+                yield f"event: snapshot\ndata: {json.dumps(await snapshot.afirst())}\n\n"
+            async for event in events:
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif event["seq"] > seen:  # not already replayed
+                    yield _sse(event)
+        finally:
+            await events.aclose()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
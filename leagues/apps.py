@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class LeaguesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'leagues'
\ No newline at end of file
+    name = 'leagues'
+
+    def ready(self):
+        import leagues.signals
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0012_alter_league_options_remove_league_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='standings_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
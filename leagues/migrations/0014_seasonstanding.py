@@ -0,0 +1,60 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_season_standings(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    SeasonStanding = apps.get_model("leagues", "SeasonStanding")
+
+    rows = {}
+    games = Game.objects.filter(status="completed", season__isnull=False).values_list(
+        "season_id", "home_team_id", "away_team_id", "home_team_score", "away_team_score"
+    )
+    for season_id, home_id, away_id, home_score, away_score in games.iterator():
+        for team_id, scored, conceded in (
+            (home_id, home_score, away_score),
+            (away_id, away_score, home_score),
+        ):
+            row = rows.setdefault(
+                (season_id, team_id), SeasonStanding(season_id=season_id, team_id=team_id)
+            )
+            row.played += 1
+            row.wins += scored > conceded
+            row.losses += scored < conceded
+            row.ties += scored == conceded
+            row.scored += scored
+            row.conceded += conceded
+
+    SeasonStanding.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0023_oncourtslot'),
+        ('leagues', '0013_season_standings_version'),
+        ('teams', '0021_teamrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('ties', models.PositiveIntegerField(default=0)),
+                ('scored', models.PositiveIntegerField(default=0)),
+                ('conceded', models.PositiveIntegerField(default=0)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standing_rows', to='leagues.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='teams.team')),
+            ],
+            options={
+                'unique_together': {('season', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_season_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0014_seasonstanding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='tiebreakers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
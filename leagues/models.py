@@ -1,11 +1,14 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-from django.db.models import Sum, F, Q
+from django.db.models import F
+from leagues.standings import TIEBREAKERS, StandingsEngine
 
 class League(models.Model):
     name = models.CharField(max_length=255)
     sport = models.ForeignKey("sports.Sport", on_delete=models.CASCADE)
     teams = models.ManyToManyField("teams.Team", related_name="leagues")
+    # Ordered TIEBREAKERS keys; empty means the sport's default ordering
+    tiebreakers = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -16,9 +19,18 @@ class League(models.Model):
     def __str__(self):
         return f"{self.name} ({self.sport})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_tiebreakers = instance.__dict__.get("tiebreakers")
+        return instance
+
     def clean(self):
         if self.start_date >= self.end_date:
             raise ValidationError("End date must be after start date")
+        unknown = set(self.tiebreakers) - set(TIEBREAKERS)
+        if unknown:
+            raise ValidationError(f"Unknown tiebreakers: {', '.join(sorted(unknown))}")
 
 class Season(models.Model):
     class Status(models.TextChoices):
@@ -33,6 +45,8 @@ class Season(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.UPCOMING)
     start_date = models.DateField()
     end_date = models.DateField()
+    # Bumped whenever a completed game or the league's teams change
+    standings_version = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-year"]
@@ -49,103 +63,90 @@ class Season(models.Model):
         if self.end_date > self.league.end_date:
             raise ValidationError("Season cannot end after league end date")
     
+    @classmethod
+    def bump_standings_version(cls, **filters):
+        cls.objects.filter(**filters).update(
+            standings_version=F("standings_version") + 1
+        )
+
     @property
     def has_bracket(self):
         """Check if any bracket exists for this season"""
         return self.brackets.exists()
 
+    def completed_results(self):
+        return self.games.filter(status="completed").values_list(
+            "home_team_id", "away_team_id", "home_team_score", "away_team_score"
+        )
+
+    def _standings_engine(self, results=None):
+        league = League.objects.select_related("sport").get(pk=self.league_id)
+        return StandingsEngine(
+            league.sport,
+            league.teams.values_list("id", "name"),
+            tiebreakers=league.tiebreakers,
+            results=results,
+        )
+
     def standings(self):
-        sport = self.league.sport
-        scoring_type = sport.scoring_type  # "points", "sets", or "goals"
-        games = self.games.filter(status="completed", season=self.id)
-        standings = []
-
-        for team in self.league.teams.all():
-            team_games = games.filter(Q(home_team=team) | Q(away_team=team))
-            matches_played = team_games.count()
-
-            wins = team_games.filter(
-                Q(home_team=team, home_team_score__gt=F("away_team_score")) |
-                Q(away_team=team, away_team_score__gt=F("home_team_score"))
-            ).count()
-
-            losses = team_games.filter(
-                Q(home_team=team, home_team_score__lt=F("away_team_score")) |
-                Q(away_team=team, away_team_score__lt=F("home_team_score"))
-            ).count()
-
-            ties = 0
-            if sport.has_tie:
-                ties = team_games.filter(
-                    Q(home_team=team, home_team_score=F("away_team_score")) |
-                    Q(away_team=team, away_team_score=F("home_team_score"))
-                ).count()
-
-            # Scoring values
-            home = games.filter(home_team=team).aggregate(
-                scored=Sum('home_team_score'),
-                conceded=Sum('away_team_score')
-            )
-            away = games.filter(away_team=team).aggregate(
-                scored=Sum('away_team_score'),
-                conceded=Sum('home_team_score')
-            )
-            scored = (home['scored'] or 0) + (away['scored'] or 0)
-            conceded = (home['conceded'] or 0) + (away['conceded'] or 0)
-            goal_difference = scored - conceded
-
-            team_data = {
-                "team_id": team.id,
-                "team_name": team.name,
-                "matches_played": matches_played,
-                "wins": wins,
-                "losses": losses,
-            }
-
-            if sport.has_tie:
-                team_data["ties"] = ties
-
-            if scoring_type == "points":
-                points = wins * 3
-                win_percentage = round(wins / matches_played, 3) if matches_played else 0
-                team_data.update({
-                    "points": points,
-                    "win_percentage": win_percentage,
-                })
-
-            elif scoring_type == "sets":
-                set_ratio = round(scored / conceded, 2) if conceded else scored
-                team_data.update({
-                    "sets_won": scored,
-                    "sets_lost": conceded,
-                    "set_ratio": set_ratio,
-                })
-
-            elif scoring_type == "goals":
-                point_ratio = round(scored / conceded, 2) if conceded else scored
-                team_data.update({
-                    "points_won": scored,
-                    "points_lost": conceded,
-                    "point_ratio": point_ratio,
-                    "goal_difference": goal_difference,
-                })
-
-            standings.append(team_data)
-
-        # Custom sorting based on scoring type
-        def sort_key(team):
-            if scoring_type == "points":
-                return (-team["points"], -team.get("win_percentage", 0))
-            elif scoring_type == "sets":
-                return (-team.get("set_ratio", 0), -team.get("sets_won", 0))
-            elif scoring_type == "goals":
-                return (-team.get("point_ratio", 0), -team.get("goal_difference", 0))
-            return (-team.get("wins", 0),)
-
-        sorted_standings = sorted(standings, key=sort_key)
-
-        # Add rankings to the standings
-        for rank, team in enumerate(sorted_standings, start=1):
-            team["rank"] = rank
-            
-        return sorted_standings
\ No newline at end of file
+        """Ranked standings, read from the maintained SeasonStanding rows"""
+        # Games are only read if a head-to-head tiebreak has to be resolved
+        engine = self._standings_engine(results=self.completed_results())
+        for row in self.standing_rows.values("team_id", *SeasonStanding.objects.FIELDS):
+            engine.load(row.pop("team_id"), row)
+        return engine.table()
+
+    def compute_standings(self):
+        """Ranked standings recomputed from the season's completed games"""
+        return self._standings_engine().add_games(self.completed_results()).table()
+
+
+class SeasonStandingManager(models.Manager):
+    FIELDS = ("played", "wins", "losses", "ties", "scored", "conceded")
+
+    def apply(self, deltas):
+        """Add signed deltas, in FIELDS order, keyed by (season_id, team_id)"""
+        missing = {}
+        for key, delta in deltas.items():
+            if any(delta) and not self._row(key).update(**self._increments(delta)):
+                if any(count > 0 for count in delta):
+                    missing[key] = delta
+        if not missing:
+            return
+
+        # First result for these keys; create the rows, then apply the deltas
+        # so a concurrent writer creating the same row is not lost
+        self.bulk_create(
+            [self.model(season_id=season_id, team_id=team_id) for season_id, team_id in missing],
+            ignore_conflicts=True,
+        )
+        for key, delta in missing.items():
+            self._row(key).update(**self._increments(delta))
+
+    def _row(self, key):
+        season_id, team_id = key
+        return self.filter(season_id=season_id, team_id=team_id)
+
+    def _increments(self, delta):
+        return {field: F(field) + count for field, count in zip(self.FIELDS, delta)}
+
+
+class SeasonStanding(models.Model):
+    """Running standings totals of one team in one season"""
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="standing_rows")
+    team = models.ForeignKey("teams.Team", on_delete=models.CASCADE)
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    ties = models.PositiveIntegerField(default=0)
+    scored = models.PositiveIntegerField(default=0)
+    conceded = models.PositiveIntegerField(default=0)
+
+    objects = SeasonStandingManager()
+
+    class Meta:
+        unique_together = ("season", "team")
+
+    def __str__(self):
+        return f"{self.team} in {self.season}: {self.wins}-{self.losses}-{self.ties}"
@@ -3,19 +3,25 @@ from .models import League, Season
 from teams.serializers import TeamSerializer
 from sports.serializers import SportSerializer
 from teams.models import Team
+from .standings import TIEBREAKERS
 
 class LeagueSerializer(serializers.ModelSerializer):
     teams = TeamSerializer(many=True)
     sport = SportSerializer(read_only=True)
     class Meta:
         model = League
-        fields = ["id", "name", "sport", "teams"]
+        fields = ["id", "name", "sport", "teams", "tiebreakers"]
         read_only_fields = ['created_at']
 
 class LeagueWriteSerializer(serializers.ModelSerializer):
+    tiebreakers = serializers.ListField(
+        child=serializers.ChoiceField(choices=list(TIEBREAKERS.items())),
+        required=False,
+    )
+
     class Meta:
         model = League
-        fields = ['name', 'sport', 'teams']
+        fields = ['name', 'sport', 'teams', 'tiebreakers']
 
 class SeasonSerializer(serializers.ModelSerializer):
     has_bracket = serializers.SerializerMethodField()
@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from .models import League, Season
+
+
+@receiver(m2m_changed, sender=League.teams.through)
+def bump_league_standings(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # instance is a team; pk_set holds the leagues it joined or left
+        if pk_set:
+            Season.bump_standings_version(league_id__in=pk_set)
+        else:
+            Season.bump_standings_version()
+    else:
+        Season.bump_standings_version(league=instance)
+
+
+@receiver(post_save, sender=League)
+def bump_tiebreaker_standings(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "tiebreakers" not in update_fields):
+        return
+    if instance.tiebreakers != getattr(instance, "_loaded_tiebreakers", None):
+        Season.bump_standings_version(league=instance)
+    instance._loaded_tiebreakers = instance.tiebreakers
@@ -0,0 +1,209 @@
+from collections import defaultdict
+from itertools import groupby
+
+# Tiebreakers a league can chain, applied in order to teams still level
+TIEBREAKERS = {
+    "head_to_head": "Head-to-head record among the tied teams",
+    "head_to_head_difference": "Head-to-head score difference among the tied teams",
+    "head_to_head_scored": "Head-to-head points scored among the tied teams",
+    "difference": "Overall score difference",
+    "scored": "Overall points scored",
+    "wins": "Overall wins",
+    "win_percentage": "Overall win percentage",
+}
+
+# Used when a league configures no chain; matches the historic sort keys
+DEFAULT_TIEBREAKERS = {
+    "points": ["win_percentage"],
+    "sets": ["scored"],
+    "goals": ["difference"],
+}
+
+PRIMARY_KEYS = {
+    "points": "points",
+    "sets": "set_ratio",
+    "goals": "point_ratio",
+}
+
+
+class StandingsEngine:
+    """Season standings computed in one pass over completed results.
+
+    Feed it (home_id, away_id, home_score, away_score) tuples, or load
+    stored totals, and it keeps played/won/lost/tied/scored/conceded per
+    team; ``table`` then derives the per-``scoring_type`` columns, sorts
+    and ranks.
+
+    Teams level on the sport's primary key are separated by the league's
+    tiebreaker chain. Head-to-head criteria read a team x team results
+    matrix built from the same results; when totals are loaded instead,
+    ``results`` is only iterated if a head-to-head tiebreak is needed.
+    """
+
+    def __init__(self, sport, teams, tiebreakers=None, results=None):
+        self.scoring_type = sport.scoring_type
+        self.has_tie = sport.has_tie
+        self.tiebreakers = list(
+            tiebreakers or DEFAULT_TIEBREAKERS.get(self.scoring_type, [])
+        )
+        self.teams = list(teams)  # (team_id, team_name), in display order
+        self.totals = {
+            team_id: {
+                "played": 0,
+                "wins": 0,
+                "losses": 0,
+                "ties": 0,
+                "scored": 0,
+                "conceded": 0,
+            }
+            for team_id, _name in self.teams
+        }
+        # (team_id, opponent_id) -> [wins, losses, ties, scored, conceded]
+        self.matrix = defaultdict(lambda: [0, 0, 0, 0, 0])
+        self._pending_results = results
+
+    def add(self, home_id, away_id, home_score, away_score):
+        self._add_pair(home_id, away_id, home_score, away_score)
+        for team_id, scored, conceded in (
+            (home_id, home_score, away_score),
+            (away_id, away_score, home_score),
+        ):
+            totals = self.totals.get(team_id)
+            if totals is None:
+                continue  # not one of the league's teams
+            totals["played"] += 1
+            totals["scored"] += scored
+            totals["conceded"] += conceded
+            if scored > conceded:
+                totals["wins"] += 1
+            elif scored < conceded:
+                totals["losses"] += 1
+            else:
+                totals["ties"] += 1
+
+    def _add_pair(self, home_id, away_id, home_score, away_score):
+        for team_id, opponent_id, scored, conceded in (
+            (home_id, away_id, home_score, away_score),
+            (away_id, home_id, away_score, home_score),
+        ):
+            cell = self.matrix[(team_id, opponent_id)]
+            cell[0] += scored > conceded
+            cell[1] += scored < conceded
+            cell[2] += scored == conceded
+            cell[3] += scored
+            cell[4] += conceded
+
+    def load(self, team_id, totals):
+        """Use precomputed totals for a team, e.g. a SeasonStanding row"""
+        if team_id in self.totals:
+            self.totals[team_id].update(totals)
+
+    def add_games(self, results):
+        self._pending_results = None
+        for result in results:
+            self.add(*result)
+        return self
+
+    def _head_to_head(self, team_id, group):
+        if self._pending_results is not None:
+            results, self._pending_results = self._pending_results, None
+            for result in results:
+                self._add_pair(*result)
+        wins = losses = ties = scored = conceded = 0
+        for opponent_id in group:
+            if opponent_id != team_id:
+                w, l, t, s, c = self.matrix.get((team_id, opponent_id), (0, 0, 0, 0, 0))
+                wins, losses, ties = wins + w, losses + l, ties + t
+                scored, conceded = scored + s, conceded + c
+        return wins, losses, ties, scored, conceded
+
+    def row(self, team_id, team_name):
+        totals = self.totals[team_id]
+        wins, played = totals["wins"], totals["played"]
+        scored, conceded = totals["scored"], totals["conceded"]
+        team_data = {
+            "team_id": team_id,
+            "team_name": team_name,
+            "matches_played": played,
+            "wins": wins,
+            "losses": totals["losses"],
+        }
+
+        if self.has_tie:
+            team_data["ties"] = totals["ties"]
+
+        if self.scoring_type == "points":
+            team_data.update({
+                "points": wins * 3,
+                "win_percentage": round(wins / played, 3) if played else 0,
+            })
+
+        elif self.scoring_type == "sets":
+            team_data.update({
+                "sets_won": scored,
+                "sets_lost": conceded,
+                "set_ratio": round(scored / conceded, 2) if conceded else scored,
+            })
+
+        elif self.scoring_type == "goals":
+            team_data.update({
+                "points_won": scored,
+                "points_lost": conceded,
+                "point_ratio": round(scored / conceded, 2) if conceded else scored,
+                "goal_difference": scored - conceded,
+            })
+
+        return team_data
+
+    def primary(self, team):
+        return team.get(PRIMARY_KEYS.get(self.scoring_type, "wins"), 0)
+
+    def criterion(self, name, group):
+        """Return a team row -> value function; higher values rank first"""
+        if name.startswith("head_to_head"):
+            group_ids = [team["team_id"] for team in group]
+            records = {
+                team_id: self._head_to_head(team_id, group_ids) for team_id in group_ids
+            }
+            if name == "head_to_head":
+                return lambda team: 2 * records[team["team_id"]][0] + records[team["team_id"]][2]
+            if name == "head_to_head_difference":
+                return lambda team: records[team["team_id"]][3] - records[team["team_id"]][4]
+            return lambda team: records[team["team_id"]][3]
+
+        totals = self.totals
+        if name == "difference":
+            return lambda team: totals[team["team_id"]]["scored"] - totals[team["team_id"]]["conceded"]
+        if name == "scored":
+            return lambda team: totals[team["team_id"]]["scored"]
+        if name == "wins":
+            return lambda team: totals[team["team_id"]]["wins"]
+        if name == "win_percentage":
+            return lambda team: (
+                totals[team["team_id"]]["wins"] / totals[team["team_id"]]["played"]
+                if totals[team["team_id"]]["played"]
+                else 0
+            )
+        raise ValueError(f"Unknown tiebreaker {name!r}")
+
+    def _break_ties(self, group, chain):
+        """Order a level group by the first criterion that separates it"""
+        if len(group) < 2 or not chain:
+            return group
+        value = self.criterion(chain[0], group)
+        ordered = []
+        for _, tied in groupby(sorted(group, key=lambda team: -value(team)), key=value):
+            ordered.extend(self._break_ties(list(tied), chain[1:]))
+        return ordered
+
+    def table(self):
+        standings = sorted(
+            (self.row(team_id, name) for team_id, name in self.teams),
+            key=lambda team: -self.primary(team),
+        )
+        ranked = []
+        for _, level in groupby(standings, key=self.primary):
+            ranked.extend(self._break_ties(list(level), self.tiebreakers))
+        for rank, team in enumerate(ranked, start=1):
+            team["rank"] = rank
+        return ranked
@@ -1,3 +1,180 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
-# Create your tests here.
+from games.models import Game
+from games.tests import create_game, create_season
+from leagues.models import League, Season
+from leagues.standings import StandingsEngine
+from sports.models import Sport
+
+A, B, C, D = 1, 2, 3, 4
+# A and B finish 2-1, C and D 1-2; A beat B and C beat D head to head,
+# while B and D have the better score difference
+RESULTS = [
+    (A, B, 1, 0),
+    (A, C, 1, 0),
+    (D, A, 5, 0),
+    (B, C, 10, 0),
+    (B, D, 10, 0),
+    (C, D, 1, 0),
+]
+
+
+def table(results, scoring_type="points", has_tie=False, teams=(A, B, C, D)):
+    sport = Sport(scoring_type=scoring_type, has_tie=has_tie)
+    engine = StandingsEngine(sport, [(team, str(team)) for team in teams])
+    return {row["team_id"]: row for row in engine.add_games(results).table()}
+
+
+def ranking(results, tiebreakers=None, teams=(A, B, C, D)):
+    sport = Sport(scoring_type="points", has_tie=False)
+    engine = StandingsEngine(sport, [(team, str(team)) for team in teams], tiebreakers)
+    return [row["team_id"] for row in engine.add_games(results).table()]
+
+
+class StandingsEngineTests(SimpleTestCase):
+    def test_points_columns(self):
+        rows = table(RESULTS)
+        self.assertEqual(rows[A]["matches_played"], 3)
+        self.assertEqual((rows[A]["wins"], rows[A]["losses"]), (2, 1))
+        self.assertEqual(rows[A]["points"], 6)
+        self.assertEqual(rows[C]["win_percentage"], 0.333)
+        self.assertNotIn("ties", rows[A])
+
+    def test_goals_columns_with_ties(self):
+        rows = table(RESULTS + [(A, B, 2, 2)], "goals", has_tie=True)
+        self.assertEqual(rows[A]["ties"], 1)
+        self.assertEqual((rows[A]["points_won"], rows[A]["points_lost"]), (4, 7))
+        self.assertEqual(rows[A]["goal_difference"], -3)
+        self.assertEqual(rows[B]["point_ratio"], 7.33)
+
+    def test_sets_columns(self):
+        rows = table([(A, B, 3, 1), (B, A, 3, 2)], "sets", teams=(A, B))
+        self.assertEqual((rows[A]["sets_won"], rows[A]["sets_lost"]), (5, 4))
+        self.assertEqual(rows[A]["set_ratio"], 1.25)
+        self.assertEqual([row["rank"] for row in rows.values()], [1, 2])
+
+    def test_results_against_other_teams_only_count_for_league_teams(self):
+        rows = table([(A, 99, 1, 0)], teams=(A, B))
+        self.assertEqual(rows[A]["wins"], 1)
+        self.assertEqual(set(rows), {A, B})
+
+
+class TiebreakerTests(SimpleTestCase):
+    def test_head_to_head(self):
+        self.assertEqual(ranking(RESULTS, ["head_to_head"]), [A, B, C, D])
+
+    def test_score_difference(self):
+        self.assertEqual(ranking(RESULTS, ["difference"]), [B, A, D, C])
+
+    def test_points_scored(self):
+        self.assertEqual(ranking(RESULTS, ["scored"]), [B, A, D, C])
+
+    def test_default_chain_keeps_level_teams_in_display_order(self):
+        self.assertEqual(ranking(RESULTS), [A, B, C, D])
+        self.assertEqual(ranking(RESULTS, teams=(B, A, D, C)), [B, A, D, C])
+
+    def test_level_head_to_head_falls_through_to_the_next_criterion(self):
+        # Each team won once in the cycle, so only points scored separates them
+        cycle = [(A, B, 1, 0), (B, C, 3, 0), (C, A, 2, 0)]
+        self.assertEqual(ranking(cycle, ["head_to_head", "scored"], teams=(A, B, C)), [B, C, A])
+
+    def test_ranks_follow_the_order(self):
+        sport = Sport(scoring_type="points", has_tie=False)
+        teams = [(team, str(team)) for team in (A, B, C, D)]
+        rows = StandingsEngine(sport, teams, ["difference"]).add_games(RESULTS).table()
+        self.assertEqual([row["rank"] for row in rows], [1, 2, 3, 4])
+        self.assertEqual(rows[0]["points"], 6)
+
+
+class SeasonComputeStandingsTests(TestCase):
+    def test_one_pass_over_the_games(self):
+        data = create_season(teams=4, players=0)
+        teams = dict(zip((A, B, C, D), data["teams"]))
+        for home, away, home_score, away_score in RESULTS * 3:
+            create_game(
+                data,
+                home_team=teams[home],
+                away_team=teams[away],
+                home_team_score=home_score,
+                away_team_score=away_score,
+                status=Game.Status.COMPLETED,
+            )
+        with self.assertNumQueries(3):
+            standings = data["season"].compute_standings()
+        self.assertEqual(standings[0]["matches_played"], 9)
+
+
+class StandingsConditionalGetTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.season = self.data["season"]
+        self.url = f"/api/leagues/{self.data['league'].pk}/seasons/{self.season.pk}/standings/"
+
+    def assertRevalidates(self, change):
+        tag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=tag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=tag).status_code, 200)
+
+    def test_standings_follow_results(self):
+        self.assertRevalidates(
+            lambda: create_game(
+                self.data, status=Game.Status.COMPLETED, home_team_score=3, away_team_score=1
+            )
+        )
+
+    def test_standings_follow_team_edits(self):
+        def rename():
+            team = self.data["teams"][0]
+            team.name = "Renamed"
+            team.save()
+
+        self.assertRevalidates(rename)
+
+
+class SeasonTiebreakerTests(TestCase):
+    def setUp(self):
+        self.data = create_season(teams=4, players=0)
+        self.season = self.data["season"]
+        self.league = self.data["league"]
+        teams = {team_id: team for team_id, team in zip((A, B, C, D), self.data["teams"])}
+        for home, away, home_score, away_score in RESULTS:
+            create_game(
+                self.data,
+                home_team=teams[home],
+                away_team=teams[away],
+                home_team_score=home_score,
+                away_team_score=away_score,
+                status=Game.Status.COMPLETED,
+            )
+        self.ids = {team.pk: team_id for team_id, team in teams.items()}
+
+    def ranking(self, standings):
+        return [self.ids[row["team_id"]] for row in standings]
+
+    def test_stored_standings_apply_the_league_tiebreakers(self):
+        for tiebreakers, expected in (
+            (["head_to_head"], [A, B, C, D]),
+            (["difference"], [B, A, D, C]),
+            (["head_to_head_scored", "wins"], [A, B, C, D]),
+        ):
+            self.league.tiebreakers = tiebreakers
+            self.league.save()
+            season = Season.objects.get(pk=self.season.pk)
+            self.assertEqual(self.ranking(season.standings()), expected)
+            self.assertEqual(season.standings(), season.compute_standings())
+
+    def test_changing_tiebreakers_bumps_the_standings_version(self):
+        league = League.objects.get(pk=self.league.pk)
+        version = Season.objects.get(pk=self.season.pk).standings_version
+
+        league.tiebreakers = ["difference"]
+        league.save()
+        self.season.refresh_from_db()
+        self.assertEqual(self.season.standings_version, version + 1)
+
+        league.save()
+        league.name = "Renamed"
+        league.save(update_fields=["name"])
+        self.season.refresh_from_db()
+        self.assertEqual(self.season.standings_version, version + 1)
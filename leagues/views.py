@@ -2,12 +2,21 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import League, Season
+from teams.models import Team, TeamRecord
 from .serializers import LeagueSerializer, LeagueWriteSerializer, SeasonSerializer, TeamStandingsSerializer
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
+from sports_management.conditional import etag
+from sports_management.pagination import KeysetPagination
+from games.services import SeasonLeaders
 
 class LeagueViewSet(viewsets.ModelViewSet):
-    queryset = League.objects.all()
+    queryset = League.objects.select_related('sport').prefetch_related(
+        'teams__coach', TeamRecord.objects.prefetch_overall('teams__records')
+    )
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    query_filters = {"sport_id": "sport_id"}
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -54,7 +63,25 @@ class SeasonViewSet(viewsets.ModelViewSet):
         league = get_object_or_404(League, pk=self.kwargs['league_pk'])
         serializer.save(league=league)
     
+    def _standings_etag(self, request, league_pk=None, pk=None):
+        """Covers the standings rows and the league's teams, names and logos included"""
+        state = (
+            Season.objects.filter(pk=pk, league_id=league_pk)
+            .annotate(
+                team_count=Count('league__teams'),
+                teams_updated_at=Max('league__teams__updated_at'),
+            )
+            .values_list('standings_version', 'team_count', 'teams_updated_at')
+            .first()
+        )
+        if state is None:
+            return None
+        version, team_count, teams_updated_at = state
+        updated = teams_updated_at.timestamp() if teams_updated_at else 0
+        return f"standings:{pk}:{version}:{team_count}:{updated}"
+
     @action(detail=True, methods=['get'])
+    @etag(_standings_etag)
     def standings(self, request, league_pk=None, pk=None):
         season = self.get_object()
         raw_standings = season.standings()
@@ -72,13 +99,24 @@ class SeasonViewSet(viewsets.ModelViewSet):
             }
         )
         
-        # Sort by standings criteria
+        # Keep the engine's ranking, tiebreakers included
         sorted_data = sorted(
             serializer.data,
-            key=lambda x: (
-                -x['standings'].get('points', 0),
-                -x['standings'].get('win_percentage', 0)
-            )
+            key=lambda x: x['standings'].get('rank', len(standings_data) + 1)
         )
         
-        return Response(sorted_data)
\ No newline at end of file
+        return Response(sorted_data)
+
+    @action(detail=True, methods=['get'])
+    def leaders(self, request, league_pk=None, pk=None):
+        """Top players of the season for one stat, or for every stat"""
+        season = self.get_object()
+        leaders = SeasonLeaders(
+            season,
+            limit=request.query_params.get('limit'),
+            min_attempts=request.query_params.get('min_attempts'),
+        )
+        stat = request.query_params.get('stat')
+        if stat:
+            return Response({'stat': stat, 'leaders': leaders.leaders(stat)})
+        return Response(leaders.all())
@@ -0,0 +1,39 @@
+from functools import wraps
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def etag(etag_func):
+    """Conditional GET for a viewset method.
+
+    ``etag_func(view, request, *args, **kwargs)`` returns a cheap version
+    string, or None to skip the check. A matching If-None-Match is answered
+    with 304 before the wrapped method (and its serializers) runs.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return method(self, request, *args, **kwargs)
+
+            value = etag_func(self, request, *args, **kwargs)
+            if value is None:
+                return method(self, request, *args, **kwargs)
+
+            tag = quote_etag(value)
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match and (
+                if_none_match.strip() == "*" or tag in parse_etags(if_none_match)
+            ):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+
+            response = method(self, request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                response["ETag"] = tag
+            return response
+
+        return wrapper
+
+    return decorator
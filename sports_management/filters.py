@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """Filter a view's queryset by its ``query_filters`` {param: lookup}.
+
+    Only parameters present in the request are applied, and each maps to
+    an indexed lookup, e.g. ``{"game_id": "game_id", "date_from": "date__gte"}``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup in getattr(view, "query_filters", {}).items():
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (ValueError, TypeError, DjangoValidationError):
+                raise ValidationError({param: f"Invalid value {value!r}"})
+        return queryset
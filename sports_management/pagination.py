@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination over an indexed ordering.
+
+    Pages are fetched with ``WHERE key < cursor LIMIT n`` instead of an
+    OFFSET, so deep pages cost the same as the first one. The first
+    ordering field should be backed by an index; later fields only make
+    the order deterministic. Views opt in through ``pagination_class``.
+    """
+
+    ordering = "pk"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class RecentFirstPagination(KeysetPagination):
+    """Newest events first, for stats and substitutions"""
+
+    ordering = ("-timestamp", "-id")
+
+
+class GamePagination(KeysetPagination):
+    """Latest games first; needs GameQuerySet.with_sort_date()"""
+
+    ordering = ("-sort_date", "-id")
+
+
+class GameLogPagination(KeysetPagination):
+    """A player's games, latest first"""
+
+    ordering = ("-date", "-id")
@@ -93,6 +93,48 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "users.authentication.CookieJWTAuthentication",
     ],
+    "DEFAULT_FILTER_BACKENDS": [
+        "sports_management.filters.QueryParamFilter",
+    ],
+}
+
+# Caches; LocMemCache evicts least-recently-used entries past MAX_ENTRIES
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "game-summaries": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "game-summaries",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
+
+# Cache alias and timeout (seconds) for live game summaries; completed
+# games are cached without expiry
+GAMES_SUMMARY_CACHE = "game-summaries"
+GAMES_SUMMARY_CACHE_TIMEOUT = 300
+
+# Cache alias holding StatPlan version tokens; must be shared by every
+# worker (e.g. Redis or Memcached) for plan changes to reach all of them
+GAMES_STAT_PLAN_CACHE = "default"
+
+# Cache alias and timeout (seconds) for bracket trees; keys carry the
+# bracket version, so stale trees are only left to expire
+BRACKETS_CACHE = "default"
+BRACKETS_CACHE_TIMEOUT = 86400
+
+# Attempts a player needs to rank on a percentage leaderboard by default
+GAMES_LEADERS_MIN_ATTEMPTS = 10
+
+# Box-score engine used by the game summary services; "numpy" opts into the
+# vectorized engine and needs numpy installed
+GAMES_SUMMARY_ENGINE = env("GAMES_SUMMARY_ENGINE", default="python")
+
+# Live game updates; switch to games.live.RedisBroadcaster (with a "url"
+# option) when serving from more than one ASGI worker
+GAMES_LIVE_BACKEND = {
+    "BACKEND": "games.live.InProcessBroadcaster",
 }
 
 # Jwt Config
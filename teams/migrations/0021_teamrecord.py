@@ -0,0 +1,61 @@
+# Generated by Django 5.1.6 on 2026-10-17 20:04
+
+import django.db.models.deletion
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def backfill_team_records(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    TeamRecord = apps.get_model("teams", "TeamRecord")
+
+    records = defaultdict(lambda: [0, 0, 0])
+    games = Game.objects.filter(status="completed").values_list(
+        "season_id", "home_team_id", "away_team_id", "home_team_score", "away_team_score"
+    )
+    for season_id, home_id, away_id, home_score, away_score in games.iterator():
+        if home_score > away_score:
+            outcomes = ((home_id, 0), (away_id, 1))
+        elif home_score < away_score:
+            outcomes = ((home_id, 1), (away_id, 0))
+        else:
+            outcomes = ((home_id, 2), (away_id, 2))
+        for team_id, column in outcomes:
+            records[(team_id, None)][column] += 1
+            if season_id is not None:
+                records[(team_id, season_id)][column] += 1
+
+    TeamRecord.objects.bulk_create(
+        (
+            TeamRecord(team_id=team_id, season_id=season_id, wins=wins, losses=losses, ties=ties)
+            for (team_id, season_id), (wins, losses, ties) in records.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0023_oncourtslot'),
+        ('leagues', '0013_season_standings_version'),
+        ('teams', '0020_player_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('ties', models.PositiveIntegerField(default=0)),
+                ('season', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='leagues.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records', to='teams.team')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('team', 'season'), name='unique_team_season_record'), models.UniqueConstraint(condition=models.Q(('season__isnull', True)), fields=('team',), name='unique_team_overall_record')],
+            },
+        ),
+        migrations.RunPython(backfill_team_records, migrations.RunPython.noop),
+    ]
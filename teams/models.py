@@ -2,10 +2,8 @@ from django.db import models
 import cloudinary.models
 from sports.models import Sport, Position
 from django.conf import settings
-from django.db.models import Q, F, Max, Exists, OuterRef
-from games.models import Game 
+from django.db.models import F, Prefetch, Q
 from django.utils.text import slugify
-from games.models import Substitution
 
 class Team(models.Model):
     name = models.CharField(max_length=100)
@@ -14,6 +12,8 @@ class Team(models.Model):
     logo = models.ImageField(upload_to="team_logos/", null=True, blank=True)
     slug = models.SlugField(unique=True, blank=True)  
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also touched when coaches change, see teams.signals
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.name} ({self.sport}) "
@@ -23,20 +23,18 @@ class Team(models.Model):
             self.slug = slugify(self.name)  # Auto-generate slug from name
         super().save(*args, **kwargs)
         
+    def overall_record(self):
+        """The team's all-time TeamRecord, from a prefetch when available"""
+        records = getattr(self, "overall_records", None)
+        if records is None:
+            records = list(self.records.filter(season__isnull=True))
+        return records[0] if records else None
+
     def win_loss_record(self):
-        wins = Game.objects.filter(
-            Q(home_team=self, home_team_score__gt=F('away_team_score')) |
-            Q(away_team=self, away_team_score__gt=F('home_team_score')),
-            status="completed"
-        ).count()
-        
-        losses = Game.objects.filter(
-            Q(home_team=self, home_team_score__lt=F('away_team_score')) |
-            Q(away_team=self, away_team_score__lt=F('home_team_score')),
-            status="completed"
-        ).count()
-        
-        return wins, losses
+        record = self.overall_record()
+        if record is None:
+            return 0, 0
+        return record.wins, record.losses
     
     def get_record(self):
         wins, losses = self.win_loss_record()
@@ -45,7 +43,79 @@ class Team(models.Model):
             'loss': losses,
             'win_percentage': wins / (wins + losses) if (wins + losses) > 0 else 0
         }
-     
+
+
+class TeamRecordManager(models.Manager):
+    def overall(self):
+        return self.filter(season__isnull=True)
+
+    def prefetch_overall(self, lookup="records"):
+        """Prefetch for a team relation, read back by Team.overall_record"""
+        return Prefetch(lookup, queryset=self.overall(), to_attr="overall_records")
+
+    def apply(self, deltas):
+        """Add signed (wins, losses, ties) deltas keyed by (team_id, season_id)"""
+        missing = {}
+        for key, delta in deltas.items():
+            if any(delta) and not self._record(key).update(**self._increments(delta)):
+                if any(count > 0 for count in delta):
+                    missing[key] = delta
+        if not missing:
+            return
+
+        # First result for these keys; create the rows, then apply the deltas
+        # so a concurrent writer creating the same row is not lost
+        self.bulk_create(
+            [self.model(team_id=team_id, season_id=season_id) for team_id, season_id in missing],
+            ignore_conflicts=True,
+        )
+        for key, delta in missing.items():
+            self._record(key).update(**self._increments(delta))
+
+    def _record(self, key):
+        team_id, season_id = key
+        if season_id is None:
+            return self.filter(team_id=team_id, season__isnull=True)
+        return self.filter(team_id=team_id, season_id=season_id)
+
+    @staticmethod
+    def _increments(delta):
+        wins, losses, ties = delta
+        return {
+            "wins": F("wins") + wins,
+            "losses": F("losses") + losses,
+            "ties": F("ties") + ties,
+        }
+
+
+class TeamRecord(models.Model):
+    """Win/loss/tie totals per team, overall (no season) and per season"""
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="records")
+    season = models.ForeignKey(
+        "leagues.Season", on_delete=models.CASCADE, null=True, blank=True
+    )
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    ties = models.PositiveIntegerField(default=0)
+
+    objects = TeamRecordManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "season"], name="unique_team_season_record"
+            ),
+            models.UniqueConstraint(
+                fields=["team"],
+                condition=models.Q(season__isnull=True),
+                name="unique_team_overall_record",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.team.name}: {self.wins}-{self.losses}-{self.ties}"
+
 
 class Coach(models.Model):
     user = models.OneToOneField(
@@ -60,23 +130,20 @@ class Coach(models.Model):
 
 class PlayerManager(models.Manager):
     def active_in_game(self, game):
-        """Return currently active players in the game"""
-        subs = Substitution.objects.filter(game=game)
-        all_players = Player.objects.filter(
-            Q(team=game.home_team) | Q(team=game.away_team)
-        )
-        
-        # Players who were subbed out without being subbed back in
-        subbed_out = subs.values('substitute_out').annotate(
-            last_action=Max('timestamp')
-        ).filter(
-            ~Exists(subs.filter(substitute_in=OuterRef('substitute_out')))
-        )
-        
-        return all_players.exclude(
-            pk__in=subbed_out.values('substitute_out')
+        """Roster players of both teams who haven't been subbed out, bench included"""
+        from games.models import Substitution
+
+        subbed_out = Substitution.objects.filter(game=game).values("substitute_out")
+        return self.filter(team_id__in=[game.home_team_id, game.away_team_id]).exclude(
+            Q(pk__in=subbed_out) & ~Q(pk__in=self.on_court(game).values("pk"))
         )
 
+    def on_court(self, game):
+        """Players currently on court in the game"""
+        from games.services import RosterState
+
+        return self.filter(pk__in=RosterState.slots(game).values("player_id"))
+
 class Player(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
@@ -109,24 +176,7 @@ class Player(models.Model):
     
     def is_active_in_game(self, game):
         """Determine if player is currently on the field considering their status and substitutions"""
-        # Check if player is part of the game's teams
-        if self.team not in [game.home_team, game.away_team]:
-            return False
-
-        # Check if player is a starter
-        is_starter = game.starting_lineup.filter(
-            player=self, 
-            is_starting=True
-        ).exists()
-
-        # Get substitution counts
-        subs_out = self.substitutions_out.filter(game=game).count()
-        subs_in = self.substitutions_in.filter(game=game).count()
-
-        # Determine active status
-        if is_starter:
-            # Starter is active if not subbed out more than subbed back in
-            return subs_out <= subs_in
-        else:
-            # Substitute is active if subbed in more than subbed out
-            return subs_in > subs_out
\ No newline at end of file
+        from games.services import RosterState
+
+        roster = RosterState(game)
+        return roster.in_game(self) and roster.is_active(self)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Team
+
+
+@receiver(m2m_changed, sender=Team.coach.through)
+def touch_coached_teams(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # instance is a coach; pk_set holds the teams it joined or left
+        teams = Team.objects.filter(pk__in=pk_set) if pk_set else Team.objects.all()
+    else:
+        teams = Team.objects.filter(pk=instance.pk)
+    teams.update(updated_at=timezone.now())
@@ -1,3 +1,60 @@
+import importlib
+
+from django.apps import apps
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from games.models import Game, PlayerGameLog, PlayerStat
+from games.services import ResultLedger
+from games.tests import CLEAN, create_game, create_season
+from users.models import User
+
+backfill = importlib.import_module("games.migrations.0031_backfill_playergamelog")
+
+
+class PlayerGameLogTests(TestCase):
+    def setUp(self):
+        self.data = create_season()
+        self.player = self.data["teams"][0].players.first()
+        self.first = self.play("2025-03-01T12:00:00Z", self.data["made2"], self.data["made2"])
+        self.second = self.play("2025-04-01T12:00:00Z", self.data["made2"], self.data["rebound"])
+        self.play("2025-05-01T12:00:00Z", self.data["made2"], complete=False)
+        coach = User.objects.create_coach(email="coach@example.com", password="x")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(coach))
+
+    def play(self, date, *stat_types, complete=True):
+        game = create_game(self.data, date=date)
+        for stat_type in stat_types:
+            PlayerStat.objects.create(game=game, player=self.player, stat_type=stat_type, period=1)
+        if complete:
+            game.complete_game()
+        return game
+
+    def test_game_log_lists_completed_games_latest_first(self):
+        page = self.client.get(f"/api/players/{self.player.slug}/game_log/").json()
+        rows = [(row["game"], row["points"], row["result"]) for row in page["results"]]
+        self.assertEqual(rows, [(self.second.pk, 2, "W"), (self.first.pk, 4, "W")])
+        self.assertEqual(page["results"][0]["base_stats"]["REB"], 1)
+
+    def test_career_totals_and_averages(self):
+        summary = self.client.get(f"/api/players/{self.player.slug}/career/").json()
+        [season] = summary["seasons"]
+        self.assertEqual((season["games"], season["points"]), (2, 6))
+        self.assertEqual(season["per_game"]["2PTMA"], 1.5)
+        self.assertEqual(summary["career"]["points_per_game"], 3.0)
+        self.assertEqual(summary["career"]["base_stats"]["2PTMA"], 3)
+
+    def test_migration_backfills_existing_games(self):
+        PlayerGameLog.objects.all().delete()
+        backfill.backfill_player_game_logs(apps, None)
+        self.assertEqual(PlayerGameLog.objects.filter(player=self.player).count(), 2)
+        self.assertEqual(ResultLedger.check(), CLEAN)
 
-# Create your tests here.
+    def test_reopened_games_leave_the_log(self):
+        game = Game.objects.get(pk=self.first.pk)
+        game.status = Game.Status.IN_PROGRESS
+        game.save()
+        self.assertEqual(
+            list(PlayerGameLog.objects.filter(player=self.player).values_list("game", flat=True)),
+            [self.second.pk],
+        )
@@ -1,17 +1,26 @@
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from .serializers import PlayerInfoSerializer, CoachInfoSerializer, TeamSerializer
-from .models import Player, Coach, Team
+from .models import Player, Coach, Team, TeamRecord
 from sports.models import Sport
 from rest_framework.permissions import IsAuthenticated
 from sports_management.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.decorators import action
 from rest_framework import status
+from games.models import PlayerGameLog
+from games.serializers import PlayerGameLogSerializer
+from games.services import PlayerCareerService
+from sports_management.pagination import GameLogPagination, KeysetPagination
 
 
 class TeamViewSet(ModelViewSet):
-    queryset = Team.objects.all()
+    queryset = Team.objects.prefetch_related(
+        "coach", TeamRecord.objects.prefetch_overall()
+    )
     lookup_field = "slug"
     serializer_class = TeamSerializer
+    pagination_class = KeysetPagination
+    query_filters = {"sport_id": "sport_id"}
     
 class SportTeamsViewSet(ReadOnlyModelViewSet):
     serializer_class = TeamSerializer
@@ -21,16 +30,44 @@ class SportTeamsViewSet(ReadOnlyModelViewSet):
         sport_slug = self.kwargs['sport_slug']
         try:
             sport = Sport.objects.get(slug=sport_slug)
-            return Team.objects.filter(sport=sport)
+            return Team.objects.filter(sport=sport).prefetch_related(
+                "coach", TeamRecord.objects.prefetch_overall()
+            )
         except Sport.DoesNotExist:
             return Response({"error":"Sport does not exist"}, status=status.HTTP_404_NOT_FOUND)
 
 class PlayerViews(ModelViewSet):
-    queryset = Player.objects.all()
+    queryset = Player.objects.select_related("team").prefetch_related(
+        "team__coach", TeamRecord.objects.prefetch_overall("team__records")
+    )
     serializer_class = PlayerInfoSerializer
     lookup_field = "slug"
+    pagination_class = KeysetPagination
+    query_filters = {"team_id": "team_id"}
+
+    @action(detail=True, methods=["get"])
+    def game_log(self, request, slug=None):
+        """The player's completed games, latest first"""
+        player = self.get_object()
+        logs = PlayerGameLog.objects.filter(player=player).select_related(
+            "game__home_team", "game__away_team"
+        )
+        season_id = request.query_params.get("season_id")
+        if season_id:
+            logs = logs.filter(season_id=season_id)
+        paginator = GameLogPagination()
+        page = paginator.paginate_queryset(logs, request, view=self)
+        serializer = PlayerGameLogSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def career(self, request, slug=None):
+        """Season-by-season and career totals and averages"""
+        return Response(PlayerCareerService(self.get_object()).get_summary())
 
 class CoachViews(ModelViewSet):
-    queryset = Coach.objects.all().prefetch_related('team_set')
+    queryset = Coach.objects.all().prefetch_related(
+        'team_set__coach', TeamRecord.objects.prefetch_overall('team_set__records')
+    )
     serializer_class = CoachInfoSerializer
 